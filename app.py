@@ -10,7 +10,11 @@ except (AttributeError, ImportError):
     collections.Deque = Deque
 
 import os
+import sys
 import glob
+import json
+import threading
+import time
 import hashlib
 import warnings
 import sqlite3
@@ -18,21 +22,26 @@ import random
 from datetime import datetime, timedelta
 from flask_mail import Mail, Message
 from werkzeug.security import generate_password_hash, check_password_hash
-from flask import Flask, render_template, request, redirect, url_for, session, flash, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, session, flash, send_from_directory, jsonify, Response
+from flask import before_render_template, template_rendered
 from flask import g
 
 # --- Processing imports ---
-import docx2txt
-try:
-    import PyPDF2
-except Exception:
-    PyPDF2 = None
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+# The scoring/extraction stack (screen, resume_index -> sklearn/scipy, PyPDF2,
+# docx2txt) is imported inside the functions that use it, so a worker is
+# serving (and answering /healthz) before any of it is loaded.
 from werkzeug.utils import secure_filename
 
-from screen import res as screen_res  # your screening function
-from search import res as search_res    # keep as is if you have search.py
+from text_cache import cached_text
+from config import CACHE_DIR, DB_PATH, WATCH_LOCK, RANKING_METHODS as SCREEN_METHODS
+from catalog import get_catalog, init_catalog
+from db import get_database
+from extract_pool import extract_many
+from jobs import JobQueue
+from metrics import (BYTES_UPLOADED, FILES_UPLOADED, REQUEST_SECONDS, SCORED_PAIRS, SPAN_SECONDS, Profile,
+                     profile_wanted, registry, span)
+from upload_stream import Prefetcher, iter_uploads, UPLOAD_MAX_REQUEST_BYTES
+from werkzeug.exceptions import RequestEntityTooLarge
 
 warnings.filterwarnings("ignore")
 
@@ -51,21 +60,22 @@ app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret')
 #mail = Mail(app)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, 'users.db')
 
 def get_db():
+    """This request's connection: the worker thread's pooled one (see db.Database)."""
     if 'db' not in g:
-        g.db = sqlite3.connect(DB_PATH, timeout=10, check_same_thread=False)
+        g.db = get_database(DB_PATH).connection()
     return g.db
 
 @app.teardown_appcontext
 def close_db(e=None):
+    # The connection goes back to the pool; only drop a transaction the request left open
     db = g.pop('db', None)
-    if db is not None:
-        db.close()
+    if db is not None and db.in_transaction:
+        db.rollback()
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_database(DB_PATH).connection()
     cur = conn.cursor()
     cur.execute("""
     CREATE TABLE IF NOT EXISTS users (
@@ -76,15 +86,15 @@ def init_db():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
     """)
-    #cur.execute("""
-    #CREATE TABLE IF NOT EXISTS otps (
-     #   email TEXT,
-      #  otp TEXT,
-       # expires_at TIMESTAMP
-    #)
-    #""")
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS otps (
+        email TEXT,
+        otp TEXT,
+        expires_at TIMESTAMP
+    )
+    """)
+    init_catalog(conn)
     conn.commit()
-    conn.close()
 
 init_db()
 
@@ -94,12 +104,104 @@ JOB_FOLDER = os.path.join(os.getcwd(), "Job_Description")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(JOB_FOLDER, exist_ok=True)
 
+RESULTS_PER_PAGE = int(os.environ.get("RESULTS_PER_PAGE", 50))
+MAX_PER_PAGE = 500
+
+# Progressive results (see run_process_job and /jobs/<id>/stream)
+STREAM_CHUNK = int(os.environ.get("STREAM_CHUNK", 16))  # fewest resumes indexed and scored per update
+STREAM_UPDATES = 20  # bigger batches use bigger chunks, so about this many updates per job
+STREAM_TOP_K = 10  # size of the provisional ranking sent with each update
+SSE_POLL_INTERVAL = 0.25  # seconds between checks for new job events
+SSE_HEARTBEAT = 15.0  # seconds of silence before a keep-alive comment
+
 app.config.update(
     UPLOAD_FOLDER=UPLOAD_FOLDER,
+    MAX_CONTENT_LENGTH=UPLOAD_MAX_REQUEST_BYTES,
     USERNAME="testuser",
     PASSWORD=hashlib.md5("pass".encode("utf-8")).hexdigest(),
 )
 
+# Full-text TF-IDF index of every resume uploaded through /process (loaded on first use)
+_upload_index = None
+
+def get_upload_index():
+    global _upload_index
+    if _upload_index is None:
+        from resume_index import ResumeIndex
+        _upload_index = ResumeIndex(os.path.join(CACHE_DIR, "upload_index")).load()
+    return _upload_index
+
+def preload():
+    """Import the scoring stack now instead of on first request.
+
+    Set PRELOAD_SCORING=1 together with `gunicorn --preload` to load it once
+    in the master, so forked workers share those pages instead of each
+    importing it again.
+    """
+    import screen, search, resume_index  # noqa: F401
+
+if os.environ.get("PRELOAD_SCORING", "") in ("1", "true", "True"):
+    preload()
+
+# Keep the resume index and preprocessed JDs current in the background
+# (see screen.watch_resumes / screen.watch_jobs). Never started at import:
+# gunicorn.conf.py starts them from post_fork, and watcher.claim_watch
+# lets only one process per server own them; the rest read the saved index.
+WATCH_RESUMES = os.environ.get("WATCH_RESUMES", "1") in ("1", "true", "True")
+
+def start_watchers():
+    """Start the background resume indexer and JD preprocessor, if enabled and no other process runs them."""
+    if not WATCH_RESUMES:
+        return False
+    from watcher import claim_watch
+    if not claim_watch(WATCH_LOCK):
+        return False
+
+    def run():
+        from screen import watch_jobs, watch_resumes
+        watch_jobs()
+        watch_resumes()
+
+    threading.Thread(target=run, name="watchers-start", daemon=True).start()
+    return True
+
+# --- Metrics and profiling (see metrics.py) ---
+def profile_requested():
+    """Whether this request asked for a cProfile dump (?profile=1; honoured when PROFILE_REQUESTS=param)."""
+    return request.args.get("profile") == "1"
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if profile_wanted(profile_requested()):
+        g.request_profile = Profile(f"request-{request.endpoint or 'unknown'}").start()
+
+@app.after_request
+def record_request(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=request.endpoint or "unknown",
+                                method=request.method, status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request(e=None):
+    profile = g.pop("request_profile", None)
+    if profile is not None:
+        app.logger.info("profile written to %s", profile.stop())
+    registry.flush()
+
+def _template_started(sender, template, context, **extra):
+    g.template_started = time.perf_counter()
+
+def _template_finished(sender, template, context, **extra):
+    started = g.pop("template_started", None)
+    if started is not None:
+        SPAN_SECONDS.observe(time.perf_counter() - started, span="render", template=template.name)
+
+before_render_template.connect(_template_started, app)
+template_rendered.connect(_template_finished, app)
+
 # --- Helper class for job descriptions ---
 class JD:
     def __init__(self, name):
@@ -123,11 +225,8 @@ def register():
             return render_template('register.html')
         password_hash = generate_password_hash(password)
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cur = conn.cursor()
-            cur.execute('INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)', (name, email, password_hash))
-            conn.commit()
-            conn.close()
+            with get_database(DB_PATH).transaction() as conn:
+                conn.execute('INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)', (name, email, password_hash))
             flash('Registration successful. Please login.', 'success')
             return redirect(url_for('login'))
         except sqlite3.IntegrityError:
@@ -139,11 +238,7 @@ def login():
     if request.method == 'POST':
         email = request.form.get('email')
         password = request.form.get('password')
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute('SELECT password_hash FROM users WHERE email = ?', (email,))
-        row = cur.fetchone()
-        conn.close()
+        row = get_database(DB_PATH).query_one('SELECT password_hash FROM users WHERE email = ?', (email,))
         if row is None or not check_password_hash(row[0], password):
             flash('Invalid email or password.', 'danger')
             return render_template('login.html')
@@ -222,12 +317,30 @@ def logout():
     #flash("You have been logged out.", "info")
     return redirect(url_for("home"))
 
+def job_paths():
+    """
+    Every JD in JOB_FOLDER, sorted by name.
+
+    While a JD watcher keeps the documents catalog current this is one
+    indexed lookup. Without one (WATCH_RESUMES=0, or before this process's
+    watcher has finished its first pass) the folder is scanned instead.
+    """
+    from watcher import find_watcher, watched_elsewhere
+    watcher = find_watcher(JOB_FOLDER)
+    if watcher is not None and watcher.ready.is_set():
+        paths = get_catalog().paths("jd")
+    elif watcher is None and watched_elsewhere(WATCH_LOCK):
+        # The owner records every listed JD in one transaction before preprocessing any of them
+        paths = get_catalog().paths("jd") or glob.glob(os.path.join(JOB_FOLDER, "*.txt"))
+    else:
+        paths = glob.glob(os.path.join(JOB_FOLDER, "*.txt"))
+    return sorted(paths, key=os.path.basename)
+
 @app.route("/")
 def home():
     """Show job descriptions on homepage."""
-    jobs = []
-    for file in glob.glob(os.path.join(JOB_FOLDER, "*.txt")):
-        jobs.append(JD(os.path.basename(file)))
+    # Names only: listing must not wait for (or import) the scoring stack
+    jobs = [JD(os.path.basename(path)) for path in job_paths()]
     return render_template("index.html", results=jobs)
 
 @app.route('/results', methods=['POST'])
@@ -246,12 +359,33 @@ def res():
 
         # process resumes, jobfile here...
 
-        results = screen_res(jobfile)  # Example screening function
+        job_id = job_queue.submit("screen", {"jobfile": jobfile, "method": ranking_method(request.form),
+                                             "profile": profile_requested()})
     except Exception as e:
         flash(f'Error processing resumes: {e}', 'danger')
-        results = []
+        return redirect(url_for('home'))
 
-    return render_template('result.html', results=results, title=f"Screening Results for {jobfile}")
+    return redirect(url_for('job_page', job_id=job_id))
+
+def ranking_method(args):
+    """Ranking method requested via a 'method' field/query arg ("tfidf", "bm25" or "semantic")."""
+    method = args.get("method", "tfidf")
+    return method if method in SCREEN_METHODS else "tfidf"
+
+def page_args():
+    """(page, per_page) from the query string, clamped to sane values."""
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = request.args.get("per_page", RESULTS_PER_PAGE, type=int)
+    return page, min(max(per_page, 1), MAX_PER_PAGE)
+
+@app.route("/results/<jobfile>")
+def ranking(jobfile):
+    """One page of the ranking of the whole resume pool against a JD, screened as a background job."""
+    page, per_page = page_args()
+    job_id = job_queue.submit("screen", {"jobfile": secure_filename(jobfile), "method": ranking_method(request.args),
+                                         "k": per_page, "offset": (page - 1) * per_page,
+                                         "profile": profile_requested()})
+    return redirect(url_for("job_page", job_id=job_id, method=request.args.get("method")))
 
 @app.route("/Original_Resumes/<path:filename>")
 def serve_resumes(filename):
@@ -278,69 +412,287 @@ def admin_login():
 
 # --- helper to extract text from uploaded files ---
 def extract_text(file_path):
-    path = file_path.lower()
+    return cached_text(file_path)
+
+def upload_destination(field, filename):
+    """Where a streamed upload part is saved (None discards it)."""
+    name = secure_filename(filename or "")
+    if not name:
+        return None
+    if field == "jd_file":
+        return os.path.join(JOB_FOLDER, name)
+    if field == "resumes":
+        return os.path.join(UPLOAD_FOLDER, name)
+    return None
+
+# Resumes are extracted in the background as soon as each one has been received
+prefetcher = Prefetcher(extract_text)
+
+def precompute_job(path):
+    from screen import job_description, job_key
     try:
-        if path.endswith(".pdf") and PyPDF2 is not None:
-            text = []
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    pg = page.extract_text()
-                    if pg:
-                        text.append(pg)
-            return " ".join(text)
-        elif path.endswith(".docx"):
-            return docx2txt.process(file_path) or ""
-        else:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                return f.read()
-    except Exception:
-        return ""
+        job_description(job_key(path))
+    except OSError:
+        pass
 
 @app.route("/process", methods=["POST"])
 def process():
+    # Stream the multipart body: each file is spooled to disk as it arrives and
+    # resumes start extracting before the rest of the batch has been uploaded.
+    jd_path = None
+    jd_filename = None
+    resume_paths = []
+    resume_names = []
+    fields = {}
+    try:
+        with span("upload_save"):
+            for event in iter_uploads(request.stream, request.content_type, upload_destination):
+                if event[0] == "field":
+                    fields[event[1]] = event[2]
+                    continue
+                _, field, filename, path = event
+                FILES_UPLOADED.inc(field=field)
+                BYTES_UPLOADED.inc(os.path.getsize(path), field=field)
+                if field == "jd_file":
+                    jd_path, jd_filename = path, os.path.basename(path)
+                else:
+                    resume_paths.append(path)
+                    resume_names.append(os.path.basename(path))
+                    prefetcher.submit(path)
+    except RequestEntityTooLarge as e:
+        flash(f"Upload too large: {e.description}", "danger")
+        return redirect(url_for("home"))
+    except ValueError as e:
+        flash(f"Error reading upload: {e}", "danger")
+        return redirect(url_for("home"))
+
     # Handle JD upload
-    jd_file = request.files.get("jd_file")
-    if not jd_file or jd_file.filename == "":
+    if not jd_path:
         flash("Please upload a Job Description file.", "warning")
         return redirect(url_for("home"))
-    jd_filename = secure_filename(jd_file.filename)
-    jd_path = os.path.join(JOB_FOLDER, jd_filename)
-    jd_file.save(jd_path)
 
     # Handle resumes upload (multiple)
-    resumes = request.files.getlist("resumes")
-    if not resumes or len([r for r in resumes if r.filename]) == 0:
+    if not resume_paths:
         flash("Please upload at least one resume.", "warning")
         return redirect(url_for("home"))
 
-    resume_texts = []
-    resume_names = []
-    for r in resumes:
-        if r and r.filename:
-            name = secure_filename(r.filename)
-            save_path = os.path.join(UPLOAD_FOLDER, name)
-            r.save(save_path)
-            resume_names.append(name)
-            txt = extract_text(save_path)
-            resume_texts.append(txt)
-
-    jd_text = extract_text(jd_path)
-
-    # Vectorize and compute cosine similarity
-    corpus = [jd_text] + resume_texts
-    vectorizer = TfidfVectorizer(stop_words="english")
-    try:
-        matrix = vectorizer.fit_transform(corpus)
-        scores = cosine_similarity(matrix[0:1], matrix[1:]).flatten().tolist()
-    except Exception as e:
-        flash(f"Error during vectorization/similarity: {e}", "danger")
+    # Preprocess the new JD now, so later screenings and the JD listing reuse it
+    threading.Thread(target=precompute_job, args=(jd_path,), daemon=True).start()
+
+    job_id = job_queue.submit("process", {
+        "jd_path": jd_path,
+        "jd_filename": jd_filename,
+        "resume_paths": resume_paths,
+        "resume_names": resume_names,
+        "method": ranking_method(fields),
+        "profile": profile_requested(),
+    })
+    return redirect(url_for("job_page", job_id=job_id))
+
+# --- Background screening jobs ---
+def run_screen_job(params, progress):
+    from screen import res as screen_res, get_index as screen_index
+    k, offset = params.get("k"), params.get("offset", 0)
+    results = screen_res(params["jobfile"], progress=progress, k=k, offset=offset,
+                         method=params.get("method", "tfidf"))
+    result = {
+        "title": f"Screening Results for {params['jobfile']}",
+        "jobfile": params["jobfile"],
+        "results": [[r.filename, float(r.score) / 100] for r in results],
+    }
+    if k is not None:  # one page of the ranking (see /results/<jobfile>)
+        result.update(offset=offset, per_page=k, total=len(screen_index()))
+    return result
+
+def run_process_job(params, progress):
+    resume_paths = params["resume_paths"]
+    names = dict(zip(resume_paths, params["resume_names"]))
+    progress(files_total=len(resume_paths))
+    # Full-text JD terms, from the JD cache under the key screen.py and the watcher use
+    from screen import job_description, job_key
+    query = job_description(job_key(params["jd_path"])).text_terms
+
+    # Index only the new/changed uploads, chunk by chunk in upload order, and
+    # publish each chunk's TF-IDF scores (and the best so far) as soon as it
+    # is indexed; those are provisional, since idf shifts as the batch grows.
+    from resume_index import file_fingerprint
+    fingerprints = {p: file_fingerprint(p) for p in resume_paths}
+    upload_index = get_upload_index()
+    upload_index.refresh()  # pick up uploads another worker has indexed
+    paths = list(fingerprints)
+    chunk_size = max(STREAM_CHUNK, -(-len(paths) // STREAM_UPDATES))
+    provisional = {}
+    added = 0
+    for start in range(0, len(paths), chunk_size):
+        chunk = paths[start:start + chunk_size]
+        prefetcher.wait(chunk)
+        added += upload_index.update({p: fingerprints[p] for p in chunk}, extract_many)
+        readable = [p for p in chunk if p in upload_index]  # an unreadable upload scores 0
+        chunk_scores = dict(zip(readable, upload_index.scores(query, keys=readable).tolist()))
+        chunk_scores = [chunk_scores.get(p, 0.0) for p in chunk]
+        provisional.update(zip(chunk, chunk_scores))
+        best = sorted(provisional.items(), key=lambda x: x[1], reverse=True)[:STREAM_TOP_K]
+        progress(files_extracted=start + len(chunk), files_scored=len(provisional),
+                 scores=[[names[p], s] for p, s in zip(chunk, chunk_scores)],
+                 top=[[names[p], s] for p, s in best])
+    if added:
+        upload_index.save()
+
+    # Final scores over the complete batch
+    method = params.get("method") or "tfidf"
+    readable = [p for p in resume_paths if p in upload_index]
+    with span("similarity", method=method):
+        if method == "bm25":
+            scores = upload_index.bm25_scores(query, keys=readable).astype(float)
+            scores = (scores / scores.max() if len(scores) and scores.max() > 0 else scores).tolist()
+        elif method == "semantic":
+            scores = upload_index.semantic_scores(query, keys=readable).clip(min=0).astype(float).tolist()
+        else:
+            scores = upload_index.scores(query, keys=readable).tolist()
+    SCORED_PAIRS.inc(len(scores), method=method)
+    scores = dict(zip(readable, scores))
+    scores = [scores.get(p, 0.0) for p in resume_paths]
+    progress(files_scored=len(scores))
+
+    results = list(zip(params["resume_names"], scores))
+    with span("sort"):
+        results.sort(key=lambda x: x[1], reverse=True)
+    return {"jobfile": params["jd_filename"], "results": results}
+
+def run_batch_job(params, progress):
+    from screen import res_many as screen_res_many
+    scores, resume_names, rankings = screen_res_many(params.get("jobfiles"), progress=progress,
+                                                     method=params.get("method", "tfidf"))
+    return {
+        "jobfiles": list(rankings),
+        "resumes": resume_names,
+        "scores": scores.tolist(),
+        "rankings": {
+            jobfile: [[r.filename, float(r.score) / 100] for r in ranked]
+            for jobfile, ranked in rankings.items()
+        },
+    }
+
+job_queue = JobQueue()
+job_queue.register("screen", run_screen_job)
+job_queue.register("process", run_process_job)
+job_queue.register("batch", run_batch_job)
+
+@app.route("/batch", methods=["POST"])
+def batch():
+    """Score every resume against many JDs (all of Job_Description by default) in one pass."""
+    payload = request.get_json(silent=True) or {}
+    jobfiles = payload.get("jobfiles") or request.form.getlist("des") or None
+    if jobfiles is not None:
+        jobfiles = [secure_filename(j) for j in jobfiles]
+    method = payload.get("method") or ranking_method(request.form)
+    if method not in SCREEN_METHODS:
+        return jsonify({"error": f"unknown method {method}"}), 400
+    job_id = job_queue.submit("batch", {"jobfiles": jobfiles, "method": method, "profile": profile_requested()})
+    return jsonify({"job_id": job_id, "status_url": url_for("job_status", job_id=job_id)}), 202
+
+@app.route("/jobs/<job_id>")
+def job_page(job_id):
+    """Progress page for a screening job; shows the ranking once it is done."""
+    job = job_queue.get(job_id)
+    if job is None:
+        flash("Unknown screening job.", "warning")
         return redirect(url_for("home"))
-
-    results = list(zip(resume_names, scores))
-    results.sort(key=lambda x: x[1], reverse=True)
-
-    return render_template("result.html", results=results, jobfile=jd_filename)
+    if job["status"] == "failed":
+        flash(f"Error processing resumes: {job['error']}", "danger")
+        return redirect(url_for("home"))
+    if job["status"] == "done":
+        result = job["result"]
+        if "results" not in result:  # batch jobs only have a JSON view
+            return jsonify(result)
+        if "offset" in result:  # a single page; its neighbours are screened by /results/<jobfile>
+            return render_template("result.html", results=result["results"], jobfile=result["jobfile"],
+                                   title=result.get("title"), page=result["offset"] // result["per_page"] + 1,
+                                   per_page=result["per_page"], total=result["total"],
+                                   pager_endpoint="ranking", pager_args={"jobfile": result["jobfile"]})
+        page, per_page = page_args()
+        start = (page - 1) * per_page
+        return render_template("result.html", results=result["results"][start:start + per_page],
+                               jobfile=result.get("jobfile"), title=result.get("title"),
+                               page=page, per_page=per_page, total=len(result["results"]))
+    return render_template("job.html", job=job)
+
+@app.route("/jobs/<job_id>/status")
+def job_status(job_id):
+    """JSON progress (files extracted/scored) and, when done, the ranking."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job)
+
+@app.route("/jobs/<job_id>/stream")
+def job_stream(job_id):
+    """
+    Server-sent events for a job: "progress" counts, "scores" for resumes
+    as they are scored, "top" provisional rankings, then "done" or "failed".
+
+    Events carry ids, so a reconnecting EventSource (Last-Event-ID) or
+    ?after=<id> resumes where it left off instead of replaying everything.
+    """
+    if job_queue.get(job_id) is None:
+        return jsonify({"error": "unknown job"}), 404
+    after = request.headers.get("Last-Event-ID", type=int) or request.args.get("after", 0, type=int)
+    page_url = url_for("job_page", job_id=job_id)
+
+    def sse(event, data, event_id=None):
+        head = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{head}event: {event}\ndata: {data}\n\n"
+
+    def stream():
+        last_id = after
+        counts = None
+        quiet_since = time.monotonic()
+        while True:
+            job = job_queue.get(job_id)
+            for event_id, event, data in job_queue.events(job_id, last_id):
+                last_id = event_id
+                quiet_since = time.monotonic()
+                yield sse(event, data, event_id)
+            now = {k: job[k] for k in ("status", "files_total", "files_extracted", "files_scored")}
+            if now != counts:
+                counts = now
+                quiet_since = time.monotonic()
+                yield sse("progress", json.dumps(now))
+            if job["status"] == "done":
+                yield sse("done", json.dumps({"url": page_url}))
+                return
+            if job["status"] == "failed":
+                yield sse("failed", json.dumps({"error": job["error"]}))
+                return
+            if time.monotonic() - quiet_since > SSE_HEARTBEAT:
+                quiet_since = time.monotonic()
+                yield ": keep-alive\n\n"
+            time.sleep(SSE_POLL_INTERVAL)
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route("/documents")
+def documents():
+    """JSON page of the documents catalog; filter with kind, status and format, page with page/per_page."""
+    page, per_page = page_args()
+    catalog = get_catalog()
+    rows = catalog.listing(kind=request.args.get("kind"), status=request.args.get("status"),
+                           fmt=request.args.get("format"), limit=per_page, offset=(page - 1) * per_page)
+    return jsonify({"counts": catalog.counts(), "page": page, "per_page": per_page, "documents": rows})
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus text format: request latencies, stage timings, file/byte and cache counters of all workers."""
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/healthz")
+def healthz():
+    """Liveness check; answers without loading the scoring stack."""
+    return jsonify({"status": "ok", "scoring_loaded": "screen" in sys.modules})
 
 if __name__ == "__main__":
-    app.run(debug=True, threaded=True)
\ No newline at end of file
+    # With the reloader only the child process serves; the parent just restarts it
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_watchers()
+    app.run(debug=True, threaded=True)
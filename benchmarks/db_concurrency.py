@@ -0,0 +1,189 @@
+"""
+Login/register throughput of the app database under parallel load.
+
+Each thread runs a mix of register (INSERT into users) and login (SELECT
+of the password hash by email) operations against a scratch database,
+once with the old access pattern (a new sqlite3 connection per request,
+default rollback journal) and once through the pooled db.Database
+(per-thread connections, WAL). Password hashing is left out here so the
+numbers show the database; --routes also drives the real /register and
+/login views through Flask's test client, hashing included.
+
+    python benchmarks/db_concurrency.py [--threads 1 4 16] [--ops 500] [--write-ratio 0.2] [--routes]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USERS = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    email TEXT UNIQUE,
+    password_hash TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+PASSWORD_HASH = "scrypt:32768:8:1$salt$" + "0" * 128  # stored value only; never checked here
+SEED_USERS = 1000
+
+
+class PerRequest:
+    """The old pattern: sqlite3.connect() for every request, closed afterwards."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def register(self, name, email):
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)", (name, email, PASSWORD_HASH))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def login(self, email):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT password_hash FROM users WHERE email = ?", (email,)).fetchone()
+        finally:
+            conn.close()
+
+
+class Pooled:
+    """The app's current pattern (see app.register / app.login)."""
+
+    def __init__(self, path):
+        from db import Database
+        self.db = Database(path)
+
+    def register(self, name, email):
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)", (name, email, PASSWORD_HASH))
+
+    def login(self, email):
+        return self.db.query_one("SELECT password_hash FROM users WHERE email = ?", (email,))
+
+
+def _seed(path):
+    conn = sqlite3.connect(path)
+    conn.execute(USERS)
+    conn.executemany("INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)",
+                     [(f"user{i}", f"user{i}@example.com", PASSWORD_HASH) for i in range(SEED_USERS)])
+    conn.commit()
+    conn.close()
+
+
+def _percentile(ms, q):
+    return ms[min(len(ms) - 1, int(round(q * (len(ms) - 1))))] if ms else 0.0
+
+
+def run(store, threads, ops, write_ratio):
+    """(ops/s, {op: [latencies ms]}, errors) for threads x ops operations."""
+    latencies = {"register": [], "login": []}
+    errors = []
+    lock = threading.Lock()
+    start = threading.Barrier(threads + 1)
+
+    def worker(n):
+        rng = random.Random(n)
+        mine = {"register": [], "login": []}
+        start.wait()
+        for i in range(ops):
+            op = "register" if rng.random() < write_ratio else "login"
+            t0 = time.perf_counter()
+            try:
+                if op == "register":
+                    store.register(f"new{n}-{i}", f"new{n}-{i}@example.com")
+                else:
+                    store.login(f"user{rng.randrange(SEED_USERS)}@example.com")
+            except sqlite3.Error as e:
+                errors.append(repr(e))
+                continue
+            mine[op].append((time.perf_counter() - t0) * 1000)
+        with lock:
+            for op, values in mine.items():
+                latencies[op].extend(values)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    done = sum(len(v) for v in latencies.values())
+    return done / elapsed, latencies, errors
+
+
+def run_routes(threads, ops, write_ratio):
+    """Same mix through the Flask views (password hashing included), on the PRISM_DB_PATH database."""
+    import app
+    app.init_db()
+
+    class Routes:
+        def __init__(self):
+            self._local = threading.local()
+
+        def client(self):
+            if not hasattr(self._local, "client"):
+                self._local.client = app.app.test_client()
+            return self._local.client
+
+        def register(self, name, email):
+            self.client().post("/register", data={"name": name, "email": email, "password": "pw"})
+
+        def login(self, email):
+            self.client().post("/login", data={"email": email, "password": "pw"})
+
+    routes = Routes()
+    for i in range(50):  # a few real accounts, hashed by the app
+        routes.register(f"user{i}", f"user{i}@example.com")
+    global SEED_USERS
+    SEED_USERS = 50
+    return run(routes, threads, ops, write_ratio)
+
+
+def report(label, threads, result):
+    throughput, latencies, errors = result
+    cols = []
+    for op in ("login", "register"):
+        ms = sorted(latencies[op])
+        cols.append(f"{statistics.median(ms) if ms else 0:7.3f} {_percentile(ms, 0.95):7.3f}")
+    print(f"{label:<12} {threads:>7} {throughput:>10.0f}   {cols[0]}   {cols[1]} {len(errors):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ops", type=int, default=500, help="operations per thread")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="share of registrations")
+    parser.add_argument("--routes", action="store_true", help="also run through the Flask views")
+    args = parser.parse_args()
+
+    print(f"{'':<12} {'threads':>7} {'ops/s':>10}   {'login p50/p95 ms':>15}   {'register p50/p95':>15} {'errors':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Before anything imports config, so the app never touches the real users.db
+        os.environ["PRISM_DB_PATH"] = os.path.join(tmp, "routes.db")
+        os.environ["WATCH_RESUMES"] = "0"
+        for threads in args.threads:
+            for label, store_class in (("per-request", PerRequest), ("pooled", Pooled)):
+                path = os.path.join(tmp, f"{label}-{threads}.db")
+                _seed(path)
+                report(label, threads, run(store_class(path), threads, args.ops, args.write_ratio))
+        if args.routes:
+            for threads in args.threads:
+                report("routes", threads, run_routes(threads, max(1, args.ops // 10), args.write_ratio))
+
+
+if __name__ == "__main__":
+    main()
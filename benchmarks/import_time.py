@@ -0,0 +1,80 @@
+"""
+Cold-start check for the Flask app.
+
+Runs each measurement in a fresh interpreter so nothing is already
+imported: the -X importtime breakdown of `import app` (slowest modules by
+cumulative time), the wall time until a first /healthz answer, and what
+the lazily loaded scoring stack costs on first use.
+
+    python benchmarks/import_time.py [--top 15] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEALTHZ = """
+import time
+t0 = time.perf_counter()
+import app
+client = app.app.test_client()
+assert client.get("/healthz").status_code == 200
+print(time.perf_counter() - t0)
+"""
+
+SCORING = """
+import time
+import app
+t0 = time.perf_counter()
+app.preload()
+print(time.perf_counter() - t0)
+"""
+
+
+def _python(code, *flags):
+    proc = subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return proc
+
+
+def import_breakdown(top):
+    """(module, self_us, cumulative_us) of the top slowest imports under `import app`."""
+    stderr = _python("import app", "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    rows.sort(key=lambda row: -row[2])
+    return rows[:top]
+
+
+def timed(code, runs):
+    return [float(_python(code).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per timing")
+    args = parser.parse_args()
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in import_breakdown(args.top):
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+    healthz = timed(HEALTHZ, args.runs)
+    scoring = timed(SCORING, args.runs)
+    print()
+    print(f"import app + first /healthz: median {statistics.median(healthz) * 1000:.0f} ms")
+    print(f"scoring stack on first use:   median {statistics.median(scoring) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
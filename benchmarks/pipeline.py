@@ -0,0 +1,361 @@
+"""
+Stage-by-stage benchmark of the screening pipeline on synthetic corpora.
+
+For each corpus size a workspace is generated under a temporary directory
+(Original_Resumes/ with a PDF/DOCX/TXT mix, Job_Description/ with a few
+JDs, its own .cache and app database), and a fresh interpreter times every stage
+separately against it:
+
+    extract.*      text_cache.extract_document per document, by format (uncached)
+    tokenize.*     search.tokenize_and_count per document
+    vectorize.*    TfidfVectorizer.fit_transform and a ResumeIndex build over the corpus
+    rank.*         full argsort vs partial top-k selection over one score vector
+    screen.res     end to end, cold (empty caches) and then warm
+    search.res     end to end, cold and then warm
+    app.process    run_process_job over every resume, cold and then warm
+
+Each stage reports its samples, p50/p95/mean latency, throughput in
+documents per second and the process's peak RSS once the stage has run
+(a high-water mark, so it only grows from stage to stage). Results are
+written as JSON; pass --compare with an earlier file to print p50 ratios.
+
+    python benchmarks/pipeline.py [--sizes 100 1000] [--mix pdf=0.4,docx=0.3,txt=0.3]
+                                  [--repeat 5] [--out results.json] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# --- Synthetic corpus ---
+
+def _vocabulary(rng, size=5000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = {"".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)}
+    with open(os.path.join(ROOT, "skills.txt"), "r", encoding="utf-8") as f:
+        skills = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return sorted(words), skills
+
+
+def _text(rng, words, skills, n_words):
+    """Sentences of Zipf-ish distributed words with a few skills mixed in."""
+    sentences = []
+    count = 0
+    while count < n_words:
+        length = rng.randint(8, 20)
+        sentence = [words[min(int(rng.paretovariate(1.1)) - 1, len(words) - 1)] for _ in range(length)]
+        if rng.random() < 0.5:
+            sentence[rng.randrange(length)] = rng.choice(skills)
+        sentences.append(" ".join(sentence).capitalize())
+        count += length
+    return ". ".join(sentences) + "."
+
+
+def write_txt(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_pdf(path, text, width=90):
+    """Single-page PDF with text in Helvetica, enough for PyPDF2's extractor."""
+    lines, line = [], ""
+    for word in text.split():
+        if len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    lines.append(line)
+    body = "".join(f"({l.replace(chr(92), '').replace('(', '').replace(')', '')}) Tj T* " for l in lines)
+    stream = f"BT /F1 9 Tf 11 TL 36 760 Td {body}ET".encode("latin-1", "replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+_DOCX_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_docx(path, text):
+    """Minimal WordprocessingML package: one paragraph per sentence."""
+    paragraphs = "".join(f"<w:p><w:r><w:t>{s.strip()}.</w:t></w:r></w:p>" for s in text.split(".") if s.strip())
+    document = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _DOCX_TYPES)
+        z.writestr("_rels/.rels", _DOCX_RELS)
+        z.writestr("word/document.xml", document)
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt}
+
+
+def make_corpus(workdir, n_docs, mix, n_jobs=3, words_per_resume=400, seed=0):
+    """Generate Original_Resumes/ (n_docs files, formats drawn from mix) and Job_Description/ under workdir."""
+    rng = random.Random(seed)
+    words, skills = _vocabulary(rng)
+    resumes = os.path.join(workdir, "Original_Resumes")
+    jobs = os.path.join(workdir, "Job_Description")
+    os.makedirs(resumes)
+    os.makedirs(jobs)
+    formats, weights = zip(*mix.items())
+    for i in range(n_docs):
+        fmt = rng.choices(formats, weights)[0]
+        WRITERS[fmt](os.path.join(resumes, f"resume_{i:06d}.{fmt}"), _text(rng, words, skills, words_per_resume))
+    for i in range(n_jobs):
+        write_txt(os.path.join(jobs, f"job_{i}.txt"), _text(rng, words, skills, 200))
+
+
+# --- Measurement (runs in a fresh interpreter inside the workspace) ---
+
+def _peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _summary(samples, docs):
+    ms = sorted(s * 1000 for s in samples)
+    total = sum(samples)
+    return {
+        "samples": len(ms),
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))], 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "docs": docs,
+        "throughput_docs_s": round(docs / total, 1) if total > 0 else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def measure(repeat):
+    """Time every stage against the corpus in the current directory; returns {stage: summary}."""
+    sys.path.insert(0, ROOT)
+    import numpy as np
+    import app
+    import screen
+    import search
+    from resume_index import ResumeIndex
+    from scoring import top_k
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from text_cache import extract_document
+
+    stages = {}
+    paths = sorted(
+        os.path.join(screen.RESUMES_DIR, name) for name in os.listdir(screen.RESUMES_DIR)
+    )
+    jobfile = sorted(os.listdir(screen.JOB_DIR))[0]
+    n = len(paths)
+
+    def per_doc(name, fn, items):
+        samples, results = [], []
+        for item in items:
+            elapsed, result = _time(fn, item)
+            samples.append(elapsed)
+            results.append(result)
+        stages[name] = _summary(samples, len(items))
+        return results
+
+    def per_corpus(name, fn, runs, docs=n):
+        samples = [_time(fn)[0] for _ in range(runs)]
+        stages[name] = _summary(samples, docs * runs)
+
+    # --- extraction (parser called directly, so nothing comes from the text cache) ---
+    texts = []
+    for fmt in ("pdf", "docx", "txt"):
+        docs = [p for p in paths if p.endswith("." + fmt)]
+        if docs:
+            texts += per_doc(f"extract.{fmt}", extract_document, docs)
+
+    # --- tokenization and vectorization ---
+    per_doc("tokenize.tokenize_and_count", lambda text: search.tokenize_and_count(text, search.STOP_WORDS), texts)
+    summaries = [screen.summarize_text(text) for text in texts]
+    per_corpus("vectorize.tfidf_fit_transform",
+               lambda: TfidfVectorizer(stop_words="english").fit_transform(summaries), repeat)
+
+    def build_index():
+        with tempfile.TemporaryDirectory() as path:
+            index = ResumeIndex(path)
+            index.add_many((p, s, None) for p, s in zip(paths, summaries))
+            index.norms()
+    per_corpus("vectorize.resume_index", build_index, repeat)
+
+    # --- ranking: a full sort vs partial selection of one page ---
+    scores = np.random.default_rng(0).random(n)
+    per_corpus("rank.full_sort", lambda: np.argsort(-scores, kind="stable"), repeat * 10)
+    per_corpus("rank.top_k_50", lambda: top_k(scores, 50), repeat * 10)
+
+    # --- end to end: first call on empty caches, then warm calls ---
+    quiet = open(os.devnull, "w")
+
+    def end_to_end(name, fn):
+        stdout, sys.stdout = sys.stdout, quiet  # the pipelines print every ranked file
+        try:
+            per_corpus(f"{name}.cold", fn, 1)
+            per_corpus(f"{name}.warm", fn, repeat)
+        finally:
+            sys.stdout = stdout
+
+    end_to_end("screen.res", lambda: screen.res(jobfile))
+    end_to_end("search.res", lambda: search.res(jobfile))
+    process_params = {
+        "jd_path": os.path.join(screen.JOB_DIR, jobfile),
+        "jd_filename": jobfile,
+        "resume_paths": paths,
+        "resume_names": [os.path.basename(p) for p in paths],
+        "method": "tfidf",
+    }
+    end_to_end("app.process", lambda: app.run_process_job(process_params, lambda **counts: None))
+    return stages
+
+
+# --- Driver ---
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(n_docs, mix, repeat, keep=False):
+    workdir = tempfile.mkdtemp(prefix=f"pipeline-{n_docs}-")
+    try:
+        t0 = time.perf_counter()
+        make_corpus(workdir, n_docs, mix)
+        print(f"{n_docs} docs: corpus generated in {time.perf_counter() - t0:.1f} s ({workdir})", flush=True)
+        env = dict(os.environ, PRISM_CACHE_DIR=os.path.join(workdir, ".cache"),
+                   PRISM_DB_PATH=os.path.join(workdir, "app.db"), WATCH_RESUMES="0")
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", "--repeat", str(repeat)],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            raise SystemExit(f"measurement failed for {n_docs} docs")
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    finally:
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        fmt, _, weight = part.partition("=")
+        if fmt not in WRITERS:
+            raise argparse.ArgumentTypeError(f"unknown format {fmt!r} (expected pdf, docx or txt)")
+        mix[fmt] = float(weight or 1)
+    return mix
+
+
+def print_report(results, baseline=None):
+    for size, stages in results["sizes"].items():
+        old = (baseline or {}).get("sizes", {}).get(size, {})
+        print(f"\n{size} docs")
+        print(f"{'stage':<32} {'p50 ms':>10} {'p95 ms':>10} {'docs/s':>10} {'RSS MB':>8}" + ("  vs base" if old else ""))
+        for name, s in stages.items():
+            line = (f"{name:<32} {s['p50_ms']:>10.3f} {s['p95_ms']:>10.3f} "
+                    f"{s['throughput_docs_s'] or 0:>10.1f} {s['peak_rss_mb']:>8.1f}")
+            if name in old and old[name]["p50_ms"] > 0:
+                line += f"  x{s['p50_ms'] / old[name]['p50_ms']:.2f}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="corpus sizes to run (100 .. 100000)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("pdf=0.4,docx=0.3,txt=0.3"),
+                        help="format weights, e.g. pdf=0.4,docx=0.3,txt=0.3")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each whole-corpus stage")
+    parser.add_argument("--out", help="JSON results path (default benchmarks/results/pipeline-<time>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare p50 latencies against")
+    parser.add_argument("--keep", action="store_true", help="keep the generated workspaces")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.repeat)))
+        return
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {"mix": args.mix, "repeat": args.repeat},
+        "sizes": {},
+    }
+    for n_docs in args.sizes:
+        results["sizes"][str(n_docs)] = run_size(n_docs, args.mix, args.repeat, args.keep)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    print(f"\nwrote {out}")
+
+
+if __name__ == "__main__":
+    main()
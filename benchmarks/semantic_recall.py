@@ -0,0 +1,99 @@
+"""
+Recall and latency of the semantic (LSA + IVF) index against exact search.
+
+Builds a synthetic corpus in which every document mixes a few latent
+topics, each topic drawing words from its own slice of the vocabulary,
+fits a SemanticIndex on its TF-IDF matrix and, for a set of held-out
+queries, compares the approximate top-k (per nprobe) with the exact top-k
+over the same embeddings: recall@k is the overlap between the two.
+
+    python benchmarks/semantic_recall.py [--docs 50000] [--k 10] [--nprobe 1 4 8 16]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy import sparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import top_k  # noqa: E402
+from semantic import SEMANTIC_DIMS, SemanticIndex  # noqa: E402
+
+
+def synthetic_counts(n_docs, n_terms, n_topics, words, rng):
+    """documents x terms count matrix; each document mixes three topics plus background noise."""
+    topic_terms = np.array_split(rng.permutation(n_terms), n_topics)
+    rows, cols = [], []
+    for doc in range(n_docs):
+        topics = rng.choice(n_topics, size=3, replace=False)
+        picks = [rng.choice(topic_terms[t], size=words // 4) for t in topics]
+        picks.append(rng.integers(0, n_terms, size=words - 3 * (words // 4)))
+        terms = np.concatenate(picks)
+        rows.append(np.full(len(terms), doc))
+        cols.append(terms)
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    counts = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(n_docs, n_terms))
+    counts.sum_duplicates()
+    return counts
+
+
+def tfidf(counts, df, n_docs):
+    """l2-normalised TF-IDF rows, with the smoothed idf the resume index uses."""
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    weights = counts.multiply(idf).tocsr()
+    norms = np.sqrt(weights.multiply(weights).sum(axis=1)).A1
+    return sparse.diags(1 / np.where(norms > 0, norms, 1)) @ weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=50000, help="corpus size")
+    parser.add_argument("--terms", type=int, default=20000, help="vocabulary size")
+    parser.add_argument("--topics", type=int, default=200, help="latent topics")
+    parser.add_argument("--words", type=int, default=200, help="tokens per document")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dims", type=int, default=SEMANTIC_DIMS)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    counts = synthetic_counts(args.docs + args.queries, args.terms, args.topics, args.words, rng)
+    docs, queries = counts[:args.docs], counts[args.docs:]
+    df = np.bincount(docs.indices, minlength=args.terms)
+    weights = tfidf(docs, df, args.docs)
+    query_weights = tfidf(queries, df, args.docs)
+
+    with tempfile.TemporaryDirectory() as path:
+        t0 = time.perf_counter()
+        index = SemanticIndex.build(weights, path, "bench", dims=args.dims)
+        print(f"build: {time.perf_counter() - t0:.1f} s for {args.docs} docs, "
+              f"{index.dims} dims, {len(index.centroids)} lists")
+
+        embeddings = [index.embed(query_weights[i]) for i in range(args.queries)]
+        exact, exact_ms = [], []
+        for embedding in embeddings:
+            t0 = time.perf_counter()
+            exact.append(set(top_k(index.scores(embedding), args.k).tolist()))
+            exact_ms.append((time.perf_counter() - t0) * 1000)
+        print(f"exact: p50 {statistics.median(exact_ms):.2f} ms")
+        print(f"{'nprobe':>7} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for nprobe in args.nprobe:
+            hits, times = 0, []
+            for embedding, truth in zip(embeddings, exact):
+                t0 = time.perf_counter()
+                rows, _ = index.top_k(embedding, args.k, nprobe=nprobe)
+                times.append((time.perf_counter() - t0) * 1000)
+                hits += len(truth.intersection(rows.tolist()))
+            recall = hits / (args.k * len(embeddings))
+            p95 = float(np.percentile(times, 95))
+            print(f"{nprobe:>7} {recall:>10.3f} {statistics.median(times):>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
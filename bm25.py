@@ -0,0 +1,56 @@
+import numpy as np
+
+# --- Config ---
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class BM25:
+    """
+    Okapi BM25 over an inverted index.
+
+    Built from a documents x terms count matrix: the CSC form of that matrix
+    is exactly a set of postings lists (doc ids and term frequencies per
+    term), stored as int32 ids and uint16 frequencies alongside float32
+    document lengths. Scoring a query only walks the postings of its own
+    terms, so cost grows with how common the query terms are rather than
+    with the size of the corpus.
+    """
+
+    def __init__(self, counts, k1=BM25_K1, b=BM25_B):
+        csc = counts.tocsc()
+        csc.sort_indices()
+        self.k1 = k1
+        self.b = b
+        self.n_docs = counts.shape[0]
+        self.indptr = csc.indptr.astype(np.int64)
+        self.doc_ids = csc.indices.astype(np.int32)
+        self.tfs = np.minimum(csc.data, np.iinfo(np.uint16).max).astype(np.uint16)
+        self.doc_len = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+        avgdl = float(self.doc_len.mean()) if self.n_docs else 0.0
+        # Per-document length normalisation, k1 * (1 - b + b * dl / avgdl)
+        self.norm = (k1 * (1 - b + b * self.doc_len / avgdl)).astype(np.float32) if avgdl else \
+            np.full(self.n_docs, k1, dtype=np.float32)
+        df = np.diff(self.indptr)
+        self.idf = np.log(1 + (self.n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def postings(self, term_id):
+        """(doc ids, term frequencies) for one term."""
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.doc_ids[start:end], self.tfs[start:end]
+
+    def term_scores(self, term_id):
+        """(doc ids, BM25 contribution of term_id to each of those docs)."""
+        docs, tfs = self.postings(term_id)
+        tfs = tfs.astype(np.float32)
+        return docs, self.idf[term_id] * tfs * (self.k1 + 1) / (tfs + self.norm[docs])
+
+    def scores(self, query_terms):
+        """BM25 score of every document for query_terms, a dict of term id -> query count."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term_id, qtf in query_terms.items():
+            if term_id >= len(self.idf):
+                continue
+            docs, contrib = self.term_scores(term_id)
+            scores[docs] += qtf * contrib
+        return scores
@@ -0,0 +1,147 @@
+import os
+
+from config import DB_PATH
+from db import get_database
+
+# Lifecycle of a catalogued document
+PENDING = "pending"  # new or changed on disk, not processed yet
+INDEXED = "indexed"  # text extracted and in the index
+EMPTY = "empty"  # processed, but no text could be extracted (scanned PDF, parse error)
+DUPLICATE = "duplicate"  # a copy or near-copy of another document, which is indexed instead
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    format TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    content_hash TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    token_count INTEGER,
+    index_version INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS documents_kind_format ON documents (kind, format, path);
+CREATE INDEX IF NOT EXISTS documents_kind_status ON documents (kind, status, path);
+CREATE INDEX IF NOT EXISTS documents_hash ON documents (content_hash);
+"""
+
+COLUMNS = ("path", "kind", "format", "size", "mtime_ns", "content_hash", "status",
+           "token_count", "index_version", "updated_at")
+
+
+def init_catalog(conn):
+    """Create the documents table and its indexes on an open connection (see app.init_db)."""
+    conn.executescript(SCHEMA)
+
+
+def file_format(path):
+    return os.path.splitext(path)[1].lstrip(".").lower()
+
+
+class Catalog:
+    """
+    Every known resume and JD (kind "resume" / "jd") with its size, mtime,
+    content hash, format, processing status, token count and the index
+    version that last processed it, in the app database.
+
+    sync() records what discovery (the directory watchers or a fallback
+    scan) found, so a changed file goes back to PENDING in one transaction;
+    record() stores the outcome once it has been processed. Listings and
+    change checks are then indexed queries instead of directory walks.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.db = get_database(path)
+        init_catalog(self.db.connection())
+
+    def sync(self, kind, fingerprints):
+        """
+        Make the catalog's documents of kind exactly fingerprints (path -> [size, mtime_ns]).
+
+        New and changed files are (re)set to PENDING, missing ones dropped.
+        Returns the list of new or changed paths.
+        """
+        with self.db.transaction() as conn:
+            known = {
+                path: [size, mtime_ns]
+                for path, size, mtime_ns in conn.execute(
+                    "SELECT path, size, mtime_ns FROM documents WHERE kind = ?", (kind,)
+                )
+            }
+            gone = [(path,) for path in known if path not in fingerprints]
+            changed = [path for path, fp in fingerprints.items() if known.get(path) != list(fp)]
+            conn.executemany("DELETE FROM documents WHERE path = ?", gone)
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents (path, kind, format, size, mtime_ns, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, kind, file_format(path), *fingerprints[path], PENDING) for path in changed],
+            )
+        return changed
+
+    def record(self, rows):
+        """Store processing outcomes: (path, content_hash, status, token_count, index_version) tuples."""
+        rows = list(rows)
+        if not rows:
+            return
+        self.db.executemany(
+            "UPDATE documents SET content_hash = ?, status = ?, token_count = ?, index_version = ?, "
+            "updated_at = CURRENT_TIMESTAMP WHERE path = ?",
+            [(content_hash, status, tokens, version, path) for path, content_hash, status, tokens, version in rows],
+        )
+
+    def statuses(self, kind):
+        """path -> status for every document of kind."""
+        return dict(self.db.query("SELECT path, status FROM documents WHERE kind = ?", (kind,)))
+
+    def fingerprints(self, kind):
+        """path -> [size, mtime_ns] for every document of kind."""
+        rows = self.db.query("SELECT path, size, mtime_ns FROM documents WHERE kind = ?", (kind,))
+        return {path: [size, mtime_ns] for path, size, mtime_ns in rows}
+
+    def paths(self, kind, fmt=None, status=None):
+        """Sorted paths of kind, optionally only one format and/or status."""
+        sql = "SELECT path FROM documents WHERE kind = ?"
+        args = [kind]
+        if fmt is not None:
+            sql += " AND format = ?"
+            args.append(fmt)
+        if status is not None:
+            sql += " AND status = ?"
+            args.append(status)
+        return [path for (path,) in self.db.query(sql + " ORDER BY path", args)]
+
+    def listing(self, kind=None, status=None, fmt=None, limit=100, offset=0):
+        """One page of catalog rows (dicts), ordered by path."""
+        clauses, args = [], []
+        for column, value in (("kind", kind), ("status", status), ("format", fmt)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.query(
+            f"SELECT {', '.join(COLUMNS)} FROM documents{where} ORDER BY path LIMIT ? OFFSET ?",
+            args + [limit, offset],
+        )
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def counts(self, kind=None):
+        """{kind: {status: count}}, or {status: count} for one kind."""
+        rows = self.db.query("SELECT kind, status, COUNT(*) FROM documents GROUP BY kind, status")
+        counts = {}
+        for row_kind, status, n in rows:
+            counts.setdefault(row_kind, {})[status] = n
+        return counts.get(kind, {}) if kind is not None else counts
+
+
+_catalog = None
+
+
+def get_catalog():
+    """Process-wide Catalog over the app database."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
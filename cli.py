@@ -0,0 +1,295 @@
+"""
+Headless batch screening: rank a resume directory against one or many JDs.
+
+    python cli.py [JD.txt ...] --resumes Original_Resumes --out ranking.jsonl
+    python cli.py --jobs-dir Job_Description --method bm25 --top-k 100 --format csv --out nightly.csv --resume
+
+Resumes are extracted on every core (through the shared text cache) and
+indexed once into an on-disk index per resume directory; JDs are then
+scored in a process pool, each worker memory-mapping that index. Rows
+(job, rank, resume, score) are written to JSONL or CSV as each JD is
+finished. With --out, a checkpoint beside the output records the JDs
+written so far, so --resume continues an interrupted run where it left
+off. Throughput is reported on stderr.
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from config import CACHE_DIR, RANKING_METHODS
+
+# --- Config ---
+CLI_WORKERS = int(os.environ.get("CLI_WORKERS", os.cpu_count() or 1))
+CLI_MIN_SHARD = 20000  # fewest resumes a TF-IDF scoring task is given
+
+
+def log(message):
+    print(f"[cli] {message}", file=sys.stderr, flush=True)
+
+
+class Rate:
+    """Throttled "done/total (n per second)" progress lines on stderr."""
+
+    def __init__(self, label, total, unit, every=1.0):
+        self.label = label
+        self.total = total
+        self.unit = unit
+        self.every = every
+        self.start = self._last = time.perf_counter()
+
+    def per_second(self, done):
+        elapsed = time.perf_counter() - self.start
+        return done / elapsed if elapsed > 0 else 0.0
+
+    def __call__(self, done, force=False):
+        now = time.perf_counter()
+        if force or now - self._last >= self.every:
+            self._last = now
+            log(f"{self.label}: {done}/{self.total} {self.unit} ({self.per_second(done):.0f} {self.unit}/s)")
+
+
+# --- Corpus ---
+
+def find_resumes(directory):
+    """Every resume under directory, sorted."""
+    from screen import RESUME_SUFFIXES
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        paths.extend(os.path.join(dirpath, name) for name in filenames
+                     if not name.startswith(".") and name.lower().endswith(RESUME_SUFFIXES))
+    return sorted(paths)
+
+
+def default_index_path(resumes_dir):
+    key = hashlib.sha1(os.path.abspath(resumes_dir).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, "cli", key)
+
+
+def build_index(resumes_dir, index_path, workers):
+    """The saved index of resumes_dir, (re)extracting only new or changed files."""
+    from extract_pool import extract_many
+    from resume_index import ResumeIndex, file_fingerprint
+    from screen import summarize_text
+
+    paths = find_resumes(resumes_dir)
+    fingerprints = {path: file_fingerprint(path) for path in paths}
+    index = ResumeIndex(index_path).load()
+    stale = index.stale(fingerprints)
+    log(f"{len(paths)} resumes in {resumes_dir}, {len(stale)} to extract")
+    rate = Rate("extract", len(stale), "files")
+
+    def loader(keys):
+        texts = extract_many(keys, workers=workers, progress=rate)
+        rate(len(keys), force=True)
+        return [summarize_text(text) if text is not None else None for text in texts]
+
+    if index.sync(fingerprints, loader):
+        index.save()
+    return index
+
+
+def read_jobs(paths, index):
+    """(path, term counts of the summarized JD) per JD file, as screen.res preprocesses them."""
+    from screen import read_resume, summarize_text
+    return [(path, dict(index.term_counts(summarize_text(read_resume(path))))) for path in paths]
+
+
+# --- Scoring (pool workers) ---
+
+_worker_index = None
+
+
+def _init_worker(index_path):
+    global _worker_index
+    from resume_index import ResumeIndex
+    _worker_index = ResumeIndex(index_path).load()
+
+
+def _score_task(task):
+    """(rows, scores) of one JD against rows lo:hi, cut to the shard's best `depth` if given."""
+    terms, method, lo, hi, depth = task
+    from scoring import top_k
+    index = _worker_index
+    if method == "bm25":
+        scores = index.bm25_scores(terms)[lo:hi]
+    elif method == "semantic":
+        scores = index.semantic_scores(terms)[lo:hi]
+    else:
+        scores = index.scores(terms, keys=index.keys[lo:hi])
+    rows = top_k(scores, depth)
+    return rows + lo, scores[rows]
+
+
+def score_jobs(index, jobs, method, top_k, workers):
+    """Yields (JD path, [(key, score), ...] best first) per JD, in order, scoring in a process pool."""
+    import numpy as np
+    from scoring import top_k as select
+
+    n = len(index)
+    # BM25 and semantic score the whole corpus in one pass, so only TF-IDF is split across rows
+    shards = 1 if method != "tfidf" else max(1, min(workers // max(len(jobs), 1), n // CLI_MIN_SHARD))
+    bounds = np.linspace(0, n, shards + 1).astype(int)
+    tasks = [(terms, method, int(lo), int(hi), top_k) for _, terms in jobs for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    if workers <= 1 or len(tasks) == 1:
+        _init_worker(index.path)
+        results = map(_score_task, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(min(workers, len(tasks)), initializer=_init_worker, initargs=(index.path,))
+        results = pool.imap(_score_task, tasks)
+    try:
+        for path, _ in jobs:
+            parts = [next(results) for _ in range(shards)]
+            rows = np.concatenate([r for r, _ in parts])
+            scores = np.concatenate([s for _, s in parts]).astype(np.float64)
+            if method == "bm25" and len(scores) and scores.max() > 0:
+                scores = scores / scores.max()  # best resume = 1.0, as in screen.res
+            elif method == "semantic":
+                scores = np.maximum(scores, 0)
+            order = select(scores, top_k)
+            yield path, [(index.keys[rows[i]], float(scores[i])) for i in order]
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+# --- Output and checkpoints ---
+
+class Writer:
+    """Ranked rows to a JSONL or CSV stream."""
+
+    def __init__(self, stream, fmt, header):
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = csv.writer(stream) if fmt == "csv" else None
+        if self._csv is not None and header:
+            self._csv.writerow(["job", "rank", "resume", "score"])
+
+    def write(self, job, ranking, resumes_dir):
+        for rank, (key, score) in enumerate(ranking, 1):
+            resume = os.path.relpath(key, resumes_dir)
+            if self._csv is not None:
+                self._csv.writerow([job, rank, resume, f"{score:.6f}"])
+            else:
+                self.stream.write(json.dumps({"job": job, "rank": rank, "resume": resume, "score": round(score, 6)}) + "\n")
+        self.stream.flush()
+
+
+def load_checkpoint(path, settings):
+    """Checkpoint state for these settings, or raise SystemExit if it belongs to a different run."""
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state["settings"] != settings:
+        raise SystemExit(f"{path} is for a different run (settings or resumes changed); rerun without --resume")
+    return state
+
+
+def save_checkpoint(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+# --- Entry point ---
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("jobs", nargs="*", help="JD files (default: every .txt in --jobs-dir)")
+    parser.add_argument("--jobs-dir", default="Job_Description")
+    parser.add_argument("--resumes", default="Original_Resumes", help="resume directory (searched recursively)")
+    parser.add_argument("--method", choices=RANKING_METHODS, default="tfidf")
+    parser.add_argument("--top-k", type=int, help="rows per JD (default: every resume)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="default: from --out's suffix, else jsonl")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <out>.checkpoint.json)")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted run from its checkpoint")
+    parser.add_argument("--workers", type=int, default=CLI_WORKERS, help="processes for extraction and scoring")
+    parser.add_argument("--index", help="index directory (default: one per resume directory under the cache)")
+    args = parser.parse_args(argv)
+    if args.format is None:
+        args.format = "csv" if args.out and args.out.lower().endswith(".csv") else "jsonl"
+    if args.checkpoint is None and args.out:
+        args.checkpoint = args.out + ".checkpoint.json"
+    if args.resume and not args.out:
+        parser.error("--resume needs --out")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    job_paths = args.jobs or sorted(glob.glob(os.path.join(args.jobs_dir, "*.txt")))
+    if not job_paths:
+        raise SystemExit("no job descriptions given or found")
+
+    index = build_index(args.resumes, args.index or default_index_path(args.resumes), args.workers)
+    if not len(index):
+        raise SystemExit(f"no resumes found under {args.resumes}")
+    if args.method == "bm25":
+        index.impacts()  # built once here, then only memory-mapped by the workers
+    elif args.method == "semantic":
+        index.semantic()
+    jobs = read_jobs(job_paths, index)
+
+    # --- checkpoint: which JDs are already in the output, by absolute path ---
+    settings = {
+        "checkpoint": 2,  # 1 recorded basenames, which collide across directories
+        "jobs": [os.path.abspath(p) for p in job_paths],
+        "resumes": os.path.abspath(args.resumes),
+        "corpus": index.fingerprint(),
+        "method": args.method,
+        "top_k": args.top_k,
+        "format": args.format,
+    }
+    state = {"settings": settings, "done": [], "offset": 0}
+    if args.resume and os.path.exists(args.checkpoint):
+        state = load_checkpoint(args.checkpoint, settings)
+        log(f"resuming: {len(state['done'])}/{len(jobs)} JDs already written")
+    done = set(state["done"])
+    todo = [job for job in jobs if os.path.abspath(job[0]) not in done]
+
+    if args.out:
+        stream = open(args.out, "r+" if state["offset"] else "w", newline="", encoding="utf-8")
+        stream.seek(state["offset"])
+        stream.truncate()  # drop rows of a JD that was cut off mid-write
+    else:
+        stream = sys.stdout
+    writer = Writer(stream, args.format, header=state["offset"] == 0)
+
+    rate = Rate("score", len(todo), "JDs")
+    rows = 0
+    scoring_started = time.perf_counter()
+    try:
+        for n, (path, ranking) in enumerate(score_jobs(index, todo, args.method, args.top_k, args.workers), 1):
+            writer.write(os.path.basename(path), ranking, args.resumes)
+            rows += len(ranking)
+            if args.out:
+                state["done"].append(os.path.abspath(path))
+                state["offset"] = stream.tell()
+                save_checkpoint(args.checkpoint, state)
+            rate(n)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    elapsed = time.perf_counter() - scoring_started
+    pairs = len(todo) * len(index)
+    log(f"scored {len(todo)} JDs x {len(index)} resumes in {elapsed:.2f}s "
+        f"({pairs / elapsed if elapsed > 0 else 0:.0f} pairs/s), wrote {rows} rows; "
+        f"total {time.perf_counter() - started:.2f}s")
+    if args.out and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)  # finished: nothing to resume
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+import os
+
+# --- Shared paths ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Everything derived from the resumes (extracted text, indexes, ...) lives here
+# so it can be wiped without touching the originals.
+CACHE_DIR = os.environ.get("PRISM_CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+
+# Held by the one process that runs the directory watchers (see watcher.claim_watch)
+WATCH_LOCK = os.path.join(CACHE_DIR, "watchers.lock")
+
+# App database: users and the documents catalog (see catalog.py)
+DB_PATH = os.environ.get("PRISM_DB_PATH", os.path.join(BASE_DIR, "users.db"))
+
+# Ranking methods for screening: TF-IDF cosine (default), BM25 over the inverted
+# index, or semantic (cosine between LSA embeddings, approximate for a single page).
+RANKING_METHODS = ("tfidf", "bm25", "semantic")
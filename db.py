@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+from config import DB_PATH
+
+# --- Config ---
+DB_BUSY_TIMEOUT = float(os.environ.get("DB_BUSY_TIMEOUT", 10))  # seconds a writer waits for the lock
+DB_STATEMENT_CACHE = int(os.environ.get("DB_STATEMENT_CACHE", 256))  # prepared statements kept per connection
+DB_CACHE_KIB = int(os.environ.get("DB_CACHE_KIB", 8 * 1024))  # page cache per connection
+
+# Applied to every new connection. WAL lets readers run while a write
+# commits, and synchronous=NORMAL is durable under WAL except for the
+# last commits before a power loss.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT * 1000)}",
+    f"PRAGMA cache_size=-{DB_CACHE_KIB}",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+class _Connection(sqlite3.Connection):
+    """sqlite3.Connection that can be weakly referenced (the base class cannot)."""
+
+
+class Database:
+    """
+    Pooled access to one SQLite file: one long-lived connection per thread.
+
+    A connection is opened (and the pragmas above applied) the first time
+    a thread uses the database and then reused for every later request on
+    that thread, so Python's per-connection cache of prepared statements
+    stays warm. A thread's connection is closed when the thread exits, so
+    short-lived request threads do not pile up open files. Connections are
+    not shared across a fork: a forked worker opens its own. Writes go
+    through transaction() or executemany(), which group any number of
+    statements into a single commit.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # connection -> pid that opened it, for close(); weak, so a closed
+        # connection of a finished thread is not kept alive here
+        self._connections = weakref.WeakKeyDictionary()
+
+    def connection(self):
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=DB_BUSY_TIMEOUT, check_same_thread=False,
+                                   cached_statements=DB_STATEMENT_CACHE, factory=_Connection)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            with self._lock:
+                self._connections[conn] = os.getpid()
+            # Connections sit in reference cycles, so dropping the thread-local
+            # alone would leave them open until a GC pass: close explicitly.
+            weakref.finalize(threading.current_thread(), conn.close)
+        return conn
+
+    def execute(self, sql, args=()):
+        """Run one statement in autocommit style (committed immediately if it writes)."""
+        conn = self.connection()
+        cur = conn.execute(sql, args)
+        if conn.in_transaction:
+            conn.commit()
+        return cur
+
+    def query(self, sql, args=()):
+        return self.connection().execute(sql, args).fetchall()
+
+    def query_one(self, sql, args=()):
+        return self.connection().execute(sql, args).fetchone()
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one commit; rolled back if the block raises."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def executemany(self, sql, rows):
+        """Run sql for every row in one transaction."""
+        with self.transaction() as conn:
+            conn.executemany(sql, rows)
+
+    def executescript(self, script):
+        conn = self.connection()
+        conn.executescript(script)
+        conn.commit()
+
+    def close(self):
+        """Close every connection this process opened (threads reopen on next use)."""
+        with self._lock:
+            mine = [conn for conn, pid in list(self._connections.items()) if pid == os.getpid()]
+            for conn in mine:
+                del self._connections[conn]
+        for conn in mine:
+            conn.close()
+        self._local = threading.local()
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path=DB_PATH):
+    """The shared Database for path (the app database by default)."""
+    with _databases_lock:
+        if path not in _databases:
+            _databases[path] = Database(path)
+        return _databases[path]
@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+from text_cache import get_cache
+
+# --- Config ---
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidate pairs from roughly 0.7 Jaccard upward
+SHINGLE_SIZE = 5  # words per shingle
+MIN_SHINGLES = 10  # shorter texts (empty, error messages) only match exact copies
+NEAR_DUP_THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", 0.8))
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Stable 32-bit hashes of the word size-grams of text (lowercased)."""
+    words = re.findall(r"\w+", (text or "").lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    if len(words) < size:
+        grams = [" ".join(words)]
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64))
+
+
+def minhash(text):
+    """MinHash signature (NUM_PERM uint32s) of text, or None if text is too short to compare."""
+    x = shingles(text) % _PRIME
+    if len(x) < MIN_SHINGLES:
+        return None
+    hashed = (_A[:, None] * x[None, :] + _B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig1, sig2):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.mean(sig1 == sig2))
+
+
+class Deduplicator:
+    """
+    Groups a corpus into candidates: exact copies share a content hash,
+    near copies (the same resume as PDF and DOCX, say) have MinHash
+    signatures whose LSH bands collide and whose estimated Jaccard
+    similarity is at least threshold.
+
+    Content hashes and signatures are persisted in SQLite, so only new or
+    changed files are ever hashed and shingled. After update(),
+    self.canonical maps every key to the key that represents its group
+    (the smallest key, so the choice is stable as files come and go).
+    """
+
+    def __init__(self, path, threshold=NEAR_DUP_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.docs = {}  # key -> (fingerprint, digest)
+        self.signatures = {}  # digest -> signature or None
+        self.canonical = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.executescript("""
+        CREATE TABLE IF NOT EXISTS docs (key TEXT PRIMARY KEY, fingerprint TEXT, digest TEXT);
+        CREATE TABLE IF NOT EXISTS signatures (digest TEXT PRIMARY KEY, sig BLOB);
+        """)
+        return conn
+
+    def _load(self):
+        conn = self._connect()
+        for key, fingerprint, digest in conn.execute("SELECT key, fingerprint, digest FROM docs"):
+            self.docs[key] = (json.loads(fingerprint), digest)
+        for digest, sig in conn.execute("SELECT digest, sig FROM signatures"):
+            self.signatures[digest] = np.frombuffer(sig, dtype=np.uint32) if sig else None
+        conn.close()
+        self._regroup()
+
+    def update(self, fingerprints, loader):
+        """
+        Bring the grouping in line with fingerprints (key -> file fingerprint).
+
+        loader(keys) returns extracted texts for new/changed keys (None for a
+        file that could not be read, which is left out until it is retried on
+        a later update). Returns True if anything changed.
+        """
+        with self._lock:
+            gone = [k for k in self.docs if k not in fingerprints]
+            stale = [k for k, fp in fingerprints.items() if k not in self.docs or self.docs[k][0] != fp]
+            if not gone and not stale:
+                return False
+
+            cache = get_cache()
+            digests = {}
+            failed = set()
+            for k in stale:
+                try:
+                    digests[k] = cache.digest(k)
+                except OSError:
+                    failed.add(k)  # deleted or renamed since the scan; the next update sees it
+            unsigned = [k for k in stale if k in digests and digests[k] not in self.signatures]
+            new_sigs = {}
+            if unsigned:
+                for key, text in zip(unsigned, loader(unsigned)):
+                    if text is None:
+                        failed.add(key)
+                        continue
+                    new_sigs[digests[key]] = minhash(text)
+            self.signatures.update(new_sigs)
+            gone += [k for k in failed if k in self.docs]
+            stale = [k for k in stale if k not in failed]
+            for k in gone:
+                del self.docs[k]
+            for k in stale:
+                self.docs[k] = (fingerprints[k], digests[k])
+
+            conn = self._connect()
+            conn.executemany("DELETE FROM docs WHERE key = ?", [(k,) for k in gone])
+            conn.executemany(
+                "INSERT OR REPLACE INTO docs (key, fingerprint, digest) VALUES (?, ?, ?)",
+                [(k, json.dumps(fingerprints[k]), digests[k]) for k in stale],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO signatures (digest, sig) VALUES (?, ?)",
+                [(d, sig.tobytes() if sig is not None else None) for d, sig in new_sigs.items()],
+            )
+            conn.commit()
+            conn.close()
+            self._regroup()
+            return True
+
+    def _regroup(self):
+        keys = sorted(self.docs)
+        parent = {k: k for k in keys}
+
+        def find(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        def union(a, b):
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+
+        by_digest = {}
+        buckets = {}
+        rows = NUM_PERM // BANDS
+        for key in keys:
+            digest = self.docs[key][1]
+            if digest in by_digest:
+                union(key, by_digest[digest])
+                continue
+            by_digest[digest] = key
+            sig = self.signatures.get(digest)
+            if sig is None:
+                continue
+            for band in range(BANDS):
+                bucket = (band, sig[band * rows:(band + 1) * rows].tobytes())
+                for other in buckets.get(bucket, ()):
+                    other_sig = self.signatures[self.docs[other][1]]
+                    if find(other) != find(key) and similarity(sig, other_sig) >= self.threshold:
+                        union(key, other)
+                buckets.setdefault(bucket, []).append(key)
+
+        self.canonical = {k: find(k) for k in keys}
+
+    def unique(self, keys):
+        """The keys that represent their group (unknown keys count as unique)."""
+        return [k for k in keys if self.canonical.get(k, k) == k]
+
+    def duplicates(self):
+        """Dict of canonical key -> list of keys it stands in for."""
+        groups = {}
+        for key, canon in self.canonical.items():
+            if key != canon:
+                groups.setdefault(canon, []).append(key)
+        return groups
@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import time
+from queue import Empty
+
+from metrics import record_extraction
+from text_cache import ExtractionError, extract_document, get_cache
+
+# --- Config ---
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", os.cpu_count() or 1))
+EXTRACT_TIMEOUT = float(os.environ.get("EXTRACT_TIMEOUT", 30))  # seconds per file
+EXTRACT_MIN_BATCH = int(os.environ.get("EXTRACT_MIN_BATCH", 8))  # below this, stay in-process
+EXTRACT_POLL = 0.05  # seconds between checks for finished or overdue files
+
+
+def _extract_one(path):
+    """(text or None on failure, seconds spent), timed where it runs so pool workers report their own cost."""
+    start = time.perf_counter()
+    try:
+        text = extract_document(path)
+    except ExtractionError as e:
+        print(f"Error extracting {path}: {e}")
+        text = None
+    return text, time.perf_counter() - start
+
+
+_started = None  # pool workers: queue of (task, start time) messages for the parent
+
+
+def _init_worker(started):
+    global _started
+    _started = started
+
+
+def _extract_task(i, path):
+    _started.put((i, time.monotonic()))
+    return _extract_one(path)
+
+
+def extract_many(paths, workers=None, timeout=None, min_batch=None, cache=None,
+                 progress=None):
+    """
+    Extract text (text_cache.extract_document) for every path, returned in
+    the same order as paths.
+
+    Files already in the text cache are served from it; the rest are parsed
+    in a process pool (or in-process when fewer than min_batch need work).
+    A file that cannot be read (missing, unparseable, or still running
+    timeout seconds after a worker picked it up) yields None. It is not
+    cached, and callers leave it out of their indexes, so it is retried on
+    the next pass. progress, if given, is called with the number of files
+    finished so far.
+    """
+    workers = EXTRACT_WORKERS if workers is None else workers
+    timeout = EXTRACT_TIMEOUT if timeout is None else timeout
+    min_batch = EXTRACT_MIN_BATCH if min_batch is None else min_batch
+    cache = cache or get_cache()
+
+    texts = [None] * len(paths)
+    digests = [None] * len(paths)
+    todo = []
+    for i, path in enumerate(paths):
+        try:
+            digests[i] = cache.digest(path)
+        except OSError as e:
+            print(f"Error extracting {path}: {e}")
+            continue
+        texts[i] = cache.lookup(digests[i])
+        if texts[i] is None:
+            todo.append(i)
+
+    done = len(paths) - len(todo)
+    if progress:
+        progress(done)
+
+    def finish(i, text, seconds):
+        nonlocal done
+        texts[i] = text
+        record_extraction(paths[i], seconds)
+        if text is not None:
+            cache.store(digests[i], text)
+        done += 1
+        if progress:
+            progress(done)
+
+    if workers <= 1 or len(todo) < min_batch:
+        for i in todo:
+            finish(i, *_extract_one(paths[i]))
+        return texts
+
+    # Workers report when they pick a file up, so each file gets timeout
+    # seconds of its own however long it queued. A file past its deadline
+    # has a stuck worker: the pool is terminated (killing it) and whatever
+    # had not finished is resubmitted to a fresh pool.
+    remaining = todo
+    while remaining:
+        started_queue = multiprocessing.Queue()
+        with multiprocessing.Pool(processes=min(workers, len(remaining)), initializer=_init_worker,
+                                  initargs=(started_queue,)) as pool:
+            pending = {i: pool.apply_async(_extract_task, (i, paths[i])) for i in remaining}
+            started = {}
+            overdue = []
+            while pending and not overdue:
+                next(iter(pending.values())).wait(EXTRACT_POLL)
+                try:
+                    while True:
+                        i, at = started_queue.get_nowait()
+                        started[i] = at
+                except Empty:
+                    pass
+                now = time.monotonic()
+                for i, result in list(pending.items()):
+                    if result.ready():
+                        del pending[i]
+                        finish(i, *result.get())
+                    elif i in started and now - started[i] > timeout:
+                        overdue.append(i)
+            for i in overdue:
+                print(f"Timed out extracting {paths[i]} after {timeout}s. Skipping this file.")
+                del pending[i]
+                finish(i, None, timeout)
+            remaining = list(pending)
+        started_queue.close()
+    return texts
@@ -0,0 +1,16 @@
+# gunicorn reads this file from the working directory (`gunicorn app:app`).
+import os
+
+# /jobs/<id>/stream (server-sent events) holds a request open until its job
+# finishes. Sync workers would spend a whole worker on each stream and kill
+# it after `timeout`, so use threaded workers: a stream ties up one thread.
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+
+def post_fork(server, worker):
+    # Background watchers are threads, so they are started in a worker, never
+    # in the master; the first worker to claim the watcher lock owns them and
+    # a replacement worker takes over if that one dies.
+    from app import start_watchers
+    start_watchers()
@@ -0,0 +1,255 @@
+import json
+import os
+
+import numpy as np
+
+from mmap_store import drop_generations, locked, map_array, write_array
+from scoring import top_k
+
+# --- Config ---
+BLOCK_SIZE = 128  # postings per block; each block records its last doc id and max impact
+
+
+def _varbyte_encode(values):
+    """LEB128-style variable-byte encoding of non-negative ints (7 bits per byte, high bit = more)."""
+    values = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for shift in (7, 14, 21, 28, 35):
+        nbytes += values >= (1 << shift)
+    starts = np.cumsum(nbytes) - nbytes
+    out = np.zeros(int(nbytes.sum()), dtype=np.uint8)
+    for j in range(int(nbytes.max()) if len(values) else 0):
+        sel = nbytes > j
+        low = ((values[sel] >> np.uint64(7 * j)) & np.uint64(0x7F)).astype(np.uint8)
+        out[starts[sel] + j] = np.where(nbytes[sel] > j + 1, low | 0x80, low)
+    return out, starts
+
+
+def _varbyte_decode(buf):
+    """Inverse of _varbyte_encode over a whole byte buffer, vectorised."""
+    buf = np.asarray(buf, dtype=np.uint8)
+    if not len(buf):
+        return np.zeros(0, dtype=np.int64)
+    ends = buf < 0x80
+    group = np.cumsum(ends) - ends
+    group_start = np.concatenate(([0], np.flatnonzero(ends)[:-1] + 1))
+    pos = np.arange(len(buf)) - group_start[group]
+    parts = (buf & 0x7F).astype(np.float64) * np.power(128.0, pos)
+    return np.bincount(group, weights=parts).astype(np.int64)
+
+
+def _ranges(starts, ends):
+    """Concatenation of arange(s, e) for each (s, e) pair."""
+    lengths = ends - starts
+    if not len(lengths):
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(int(lengths.sum()))
+
+
+class ImpactIndex:
+    """
+    On-disk BM25 inverted index with precomputed impact scores.
+
+    Each term's postings are sorted by doc id and cut into blocks of
+    BLOCK_SIZE. Doc ids are stored as variable-byte encoded gaps and every
+    posting carries its BM25 contribution (its impact), so a query is a sum
+    of impacts with no per-document arithmetic. Per block the last doc id
+    and the largest impact are kept in memory; the postings themselves are
+    memory-mapped, so only the pages a query touches are ever read.
+
+    top_k() evaluates MaxScore-style, term at a time: terms are visited in
+    order of their largest possible contribution, and once the remaining
+    terms together cannot lift an unseen document past the current k-th
+    best score, only the surviving candidates are scored, and only the
+    blocks that hold them (and whose block max could still matter) are
+    decoded.
+    """
+
+    def __init__(self, path, corpus, n_docs, blocks, docids, impacts):
+        self.path = path
+        self.corpus = corpus
+        self.n_docs = n_docs
+        self.term_blocks = blocks["term_blocks"]  # term -> its blocks are term_blocks[t]:term_blocks[t+1]
+        self.block_byte = blocks["block_byte"]  # block -> byte range in docids (n_blocks + 1)
+        self.block_post = blocks["block_post"]  # block -> posting range in impacts (n_blocks + 1)
+        self.block_last = blocks["block_last"]
+        self.block_max = blocks["block_max"]
+        self.term_max = blocks["term_max"]
+        # Gap base of each block: the previous block's last doc, or 0 for a term's first block
+        self.block_base = np.zeros(len(self.block_last), dtype=np.int64)
+        self.block_base[1:] = self.block_last[:-1]
+        firsts = self.term_blocks[:-1][np.diff(self.term_blocks) > 0]
+        self.block_base[firsts] = 0
+        self.docids = docids
+        self.impacts = impacts
+
+    # --- persistence ---
+
+    @classmethod
+    def build(cls, bm25, path, corpus):
+        """Write the index for a bm25.BM25 to path, tagged with the corpus fingerprint, and load it."""
+        n_terms = len(bm25.idf)
+        df = np.diff(bm25.indptr)
+        doc_ids = bm25.doc_ids.astype(np.int64)
+        term_of = np.repeat(np.arange(n_terms), df)
+        tfs = bm25.tfs.astype(np.float32)
+        impacts = (bm25.idf[term_of] * tfs * (bm25.k1 + 1) / (tfs + bm25.norm[doc_ids])).astype(np.float32)
+
+        # --- blocks: BLOCK_SIZE postings each, never spanning two terms ---
+        n_blocks = (df + BLOCK_SIZE - 1) // BLOCK_SIZE
+        term_blocks = np.concatenate(([0], np.cumsum(n_blocks))).astype(np.int64)
+        block_term = np.repeat(np.arange(n_terms), n_blocks)
+        block_local = np.arange(term_blocks[-1]) - term_blocks[block_term]
+        block_post = bm25.indptr[block_term] + block_local * BLOCK_SIZE
+        block_end = np.minimum(block_post + BLOCK_SIZE, bm25.indptr[block_term + 1])
+
+        # --- doc ids as gaps from the previous posting of the same term ---
+        gaps = doc_ids.copy()
+        if len(gaps):
+            gaps[1:] -= doc_ids[:-1]
+            term_starts = bm25.indptr[:-1][df > 0]
+            gaps[term_starts] = doc_ids[term_starts]
+        encoded, byte_starts = _varbyte_encode(gaps)
+        byte_starts = np.append(byte_starts, len(encoded))
+
+        blocks = {
+            "term_blocks": term_blocks,
+            "block_byte": byte_starts[np.append(block_post, len(doc_ids))].astype(np.int64),
+            "block_post": np.append(block_post, len(doc_ids)).astype(np.int64),
+            "block_last": doc_ids[block_end - 1] if len(block_end) else np.zeros(0, dtype=np.int64),
+            "block_max": np.maximum.reduceat(impacts, block_post) if len(block_post) else np.zeros(0, dtype=np.float32),
+        }
+        term_max = np.zeros(n_terms, dtype=np.float32)
+        if len(block_post):
+            term_max[df > 0] = np.maximum.reduceat(blocks["block_max"], term_blocks[:-1][df > 0])
+        blocks["term_max"] = term_max
+
+        # Files carry the corpus fingerprint and meta.json is replaced last, so
+        # readers always see one complete generation.
+        with locked(path):
+            write_array(os.path.join(path, f"docids.{corpus}.bin"), encoded)
+            write_array(os.path.join(path, f"impacts.{corpus}.bin"), impacts)
+            np.savez(os.path.join(path, f"blocks.{corpus}.npz"), **blocks)
+            meta_tmp = os.path.join(path, "meta.json.tmp")
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump({"corpus": corpus, "n_docs": int(bm25.n_docs), "k1": bm25.k1, "b": bm25.b}, f)
+            os.replace(meta_tmp, os.path.join(path, "meta.json"))
+            drop_generations(path, corpus)
+            return cls._open(path)
+
+    @classmethod
+    def load(cls, path):
+        """The index stored at path, or None if there is none yet."""
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return None
+        with locked(path, shared=True):
+            return cls._open(path)
+
+    @classmethod
+    def _open(cls, path):
+        """Map the generation meta.json points at (hold locked(path) around it)."""
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        corpus = meta["corpus"]
+        with np.load(os.path.join(path, f"blocks.{corpus}.npz")) as arrays:
+            blocks = {name: arrays[name] for name in arrays.files}
+        docids = map_array(os.path.join(path, f"docids.{corpus}.bin"), np.uint8)
+        impacts = map_array(os.path.join(path, f"impacts.{corpus}.bin"), np.float32)
+        return cls(path, corpus, meta["n_docs"], blocks, docids, impacts)
+
+    # --- postings ---
+
+    def _decode(self, blocks):
+        """(doc ids, impacts) of the given blocks, in order."""
+        if not len(blocks):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        gaps = _varbyte_decode(self.docids[_ranges(self.block_byte[blocks], self.block_byte[blocks + 1])])
+        lengths = self.block_post[blocks + 1] - self.block_post[blocks]
+        # Blocks may be non-adjacent, so restart the running sum of gaps at
+        # each block's first posting from that block's base.
+        first = np.cumsum(lengths) - lengths
+        running = np.cumsum(gaps)
+        before = np.where(first > 0, running[first - 1], 0)
+        docs = running + np.repeat(self.block_base[blocks] - before, lengths)
+        impacts = np.asarray(self.impacts[_ranges(self.block_post[blocks], self.block_post[blocks + 1])])
+        return docs, impacts
+
+    def postings(self, term_id):
+        """(doc ids, impacts) for one term."""
+        return self._decode(np.arange(self.term_blocks[term_id], self.term_blocks[term_id + 1]))
+
+    # --- queries ---
+
+    def scores(self, query_terms):
+        """Exhaustive BM25 score of every document (query_terms: term id -> query count)."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term_id, qtf in query_terms.items():
+            if term_id < len(self.term_max):
+                docs, impacts = self.postings(term_id)
+                scores[docs] += qtf * impacts
+        return scores
+
+    def top_k(self, query_terms, k, offset=0):
+        """
+        (doc ids, scores) of the offset-th .. (offset+k-1)-th best documents.
+
+        Scores match scores() for every document returned; documents that
+        provably cannot reach the top offset+k are skipped or left partially
+        scored.
+        """
+        depth = offset + k
+        terms = [(t, qtf, qtf * float(self.term_max[t])) for t, qtf in query_terms.items()
+                 if t < len(self.term_max) and self.term_max[t] > 0]
+        terms.sort(key=lambda term: -term[2])
+        # acc and the masks are allocated zeroed but only ever read or
+        # written at documents a decoded posting touched, so their cost
+        # follows the postings read, not the corpus size.
+        acc = np.zeros(self.n_docs, dtype=np.float32)
+        seen = np.zeros(self.n_docs, dtype=bool)
+        touched = np.zeros(0, dtype=np.int64)  # documents with a non-zero score so far
+        remaining = sum(bound for _, _, bound in terms)
+        threshold = 0.0
+        candidates = None
+        for term_id, qtf, bound in terms:
+            blocks = np.arange(self.term_blocks[term_id], self.term_blocks[term_id + 1])
+            if candidates is None:
+                docs, impacts = self._decode(blocks)
+                acc[docs] += qtf * impacts
+                fresh = docs[~seen[docs]]
+                seen[fresh] = True
+                touched = np.concatenate([touched, fresh])
+            else:
+                # A candidate's block is only worth decoding if that block's
+                # max could still lift it to the threshold.
+                slot = np.searchsorted(self.block_last[blocks], candidates)
+                inside = slot < len(blocks)
+                candidates_in, slot = candidates[inside], slot[inside]
+                upper = acc[candidates_in] + remaining - bound + qtf * self.block_max[blocks[slot]]
+                blocks = blocks[np.unique(slot[upper >= threshold])]
+                docs, impacts = self._decode(blocks)
+                keep = is_candidate[docs]
+                acc[docs[keep]] += qtf * impacts[keep]
+            remaining -= bound
+            # The depth-th best score so far. Untouched documents score 0 and
+            # pruned ones stay below the threshold, so the pool decides it.
+            pool = touched if candidates is None else candidates
+            if len(pool) >= depth:
+                threshold = float(np.partition(acc[pool], len(pool) - depth)[len(pool) - depth])
+            if candidates is None and threshold > 0 and remaining < threshold:
+                # Nothing unseen can reach the top any more: only score survivors.
+                candidates = touched[acc[touched] + remaining >= threshold]
+                is_candidate = np.zeros(self.n_docs, dtype=bool)
+                is_candidate[candidates] = True
+            elif candidates is not None:
+                is_candidate[candidates] = False
+                candidates = candidates[acc[candidates] + remaining >= threshold]
+                is_candidate[candidates] = True
+        pool = np.sort(touched if candidates is None else candidates)  # doc order, so ties keep index order
+        if len(pool) < depth:
+            # Fewer matches than asked for: the page runs on into zero-score documents
+            order = top_k(acc, k, offset)
+        else:
+            order = pool[top_k(acc[pool], k, offset)]
+        return order, acc[order]
+
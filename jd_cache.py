@@ -0,0 +1,132 @@
+import json
+import os
+import sqlite3
+import threading
+
+from config import CACHE_DIR
+from metrics import CACHE_LOOKUPS
+from watcher import file_fingerprint
+
+JD_CACHE_PATH = os.path.join(CACHE_DIR, "jd_cache.db")
+
+
+class JobDescription:
+    """
+    A preprocessed job description: the summary that is scored, its term
+    counts, the term counts of the full text (for uploads scored against
+    whole resumes) and its skill hits.
+    """
+
+    def __init__(self, path, fingerprint, summary, terms, skills, text_terms):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.fingerprint = fingerprint
+        self.summary = summary
+        self.terms = terms
+        self.skills = skills
+        self.text_terms = text_terms
+
+
+class JDCache:
+    """
+    Preprocessed job descriptions, keyed by path and persisted in SQLite.
+
+    preprocess(path) returns (summary, terms, skills, text_terms) and runs once per
+    version of a file: an entry is reused while the file's [size, mtime_ns]
+    fingerprint is unchanged and recomputed once it changes. config names
+    the preprocessing (summary length, analyzer, skills list); entries made
+    under another config are recomputed too.
+    """
+
+    def __init__(self, preprocess, config, path=JD_CACHE_PATH):
+        self.preprocess = preprocess
+        self.config = config
+        self.path = path
+        self._jobs = None  # path -> JobDescription, loaded on first use
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jds (
+                path TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                config TEXT,
+                summary TEXT,
+                terms TEXT,
+                skills TEXT,
+                text_terms TEXT
+            );
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jds)")}
+            if "text_terms" not in columns:
+                # Older caches: their rows have no text_terms and are recomputed
+                conn.execute("ALTER TABLE jds ADD COLUMN text_terms TEXT")
+                conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _loaded(self):
+        if self._jobs is None:
+            rows = self._db().execute(
+                "SELECT path, fingerprint, summary, terms, skills, text_terms FROM jds"
+                " WHERE config = ? AND text_terms IS NOT NULL", (self.config,)
+            ).fetchall()
+            self._jobs = {
+                path: JobDescription(path, json.loads(fp), summary, json.loads(terms), json.loads(skills),
+                                     json.loads(text_terms))
+                for path, fp, summary, terms, skills, text_terms in rows
+            }
+        return self._jobs
+
+    def _compute(self, path, fingerprint):
+        summary, terms, skills, text_terms = self.preprocess(path)
+        job = JobDescription(path, fingerprint, summary, dict(terms), dict(skills), dict(text_terms))
+        conn = self._db()
+        conn.execute(
+            "INSERT OR REPLACE INTO jds (path, fingerprint, config, summary, terms, skills, text_terms)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, json.dumps(fingerprint), self.config, summary, json.dumps(job.terms), json.dumps(job.skills),
+             json.dumps(job.text_terms)),
+        )
+        conn.commit()
+        self._loaded()[path] = job
+        return job
+
+    def get(self, path):
+        """The preprocessed JD at path (FileNotFoundError if it does not exist)."""
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            job = self._loaded().get(path)
+            if job is not None and job.fingerprint == fingerprint:
+                CACHE_LOOKUPS.inc(cache="jd", result="hit")
+                return job
+            CACHE_LOOKUPS.inc(cache="jd", result="miss")
+            return self._compute(path, fingerprint)
+
+    def sync(self, fingerprints):
+        """Make the cache hold exactly the JDs in fingerprints (path -> fingerprint); returns True if anything changed."""
+        with self._lock:
+            jobs = self._loaded()
+            gone = [path for path in jobs if path not in fingerprints]
+            stale = [path for path, fp in fingerprints.items() if path not in jobs or jobs[path].fingerprint != fp]
+            for path in gone:
+                del jobs[path]
+            if gone:
+                conn = self._db()
+                conn.executemany("DELETE FROM jds WHERE path = ?", [(path,) for path in gone])
+                conn.commit()
+            for path in stale:
+                try:
+                    self._compute(path, fingerprints[path])
+                except OSError:
+                    pass  # removed since it was listed; the next sync drops it
+            return bool(gone or stale)
+
+    def listing(self):
+        """Every cached JD, by name."""
+        with self._lock:
+            return sorted(self._loaded().values(), key=lambda job: job.name)
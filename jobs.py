@@ -0,0 +1,236 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+from config import CACHE_DIR
+from metrics import JOBS, pid_alive, profile_wanted, profiled, registry, span
+
+# --- Config ---
+JOBS_DB_PATH = os.path.join(CACHE_DIR, "jobs.db")
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))  # worker threads per process; 0 = enqueue only
+JOB_POLL_INTERVAL = 1.0  # seconds between checks for jobs queued by other processes
+JOB_EVENTS_TTL = float(os.environ.get("JOB_EVENTS_TTL", 3600))  # seconds a finished job's events stay streamable
+
+# Partial results a handler can publish through progress(), streamed by /jobs/<id>/stream
+EVENT_KINDS = (
+    "scores",  # [[name, score], ...] for resumes just scored
+    "top",  # provisional best [[name, score], ...] over everything scored so far
+)
+
+
+class JobQueue:
+    """
+    Background screening jobs stored in a local SQLite table.
+
+    Routes submit() a job and return its id straight away; worker threads
+    (started lazily in every process that touches the queue) claim queued
+    jobs, run the handler registered for the job's kind and record progress
+    and the final result. Any process sharing the database file can pick up
+    work, so gunicorn workers share one queue with no external broker.
+    """
+
+    def __init__(self, path=JOBS_DB_PATH, workers=JOB_WORKERS):
+        self.path = path
+        self.workers = workers
+        self.handlers = {}
+        self._threads = []
+        self._pid = None
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT,
+            params TEXT,
+            status TEXT,
+            files_total INTEGER DEFAULT 0,
+            files_extracted INTEGER DEFAULT 0,
+            files_scored INTEGER DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            worker_pid INTEGER,
+            created_at REAL,
+            updated_at REAL
+        )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT,
+            event TEXT,
+            data TEXT
+        )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, id)")
+        conn.commit()
+        conn.close()
+
+    def register(self, kind, handler):
+        """
+        handler(params, progress) -> JSON-serialisable result.
+
+        progress accepts the files_total / files_extracted / files_scored
+        counts, and any of EVENT_KINDS as keywords to publish a partial
+        result (e.g. progress(scores=[[name, score], ...])) for streaming.
+        """
+        self.handlers[kind] = handler
+
+    # --- producer side ---
+
+    def submit(self, kind, params):
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO jobs (id, kind, params, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+            (job_id, kind, json.dumps(params), now, now),
+        )
+        conn.commit()
+        conn.close()
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """Job status as a dict (result decoded), or None if unknown."""
+        self.start()
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            "SELECT id, kind, status, files_total, files_extracted, files_scored, result, error, "
+            "created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        conn.close()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def events(self, job_id, after=0):
+        """(id, event, JSON data) of the events a job has published since event id `after`, oldest first."""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT id, event, data FROM job_events WHERE job_id = ? AND id > ? ORDER BY id", (job_id, after)
+        ).fetchall()
+        conn.close()
+        return rows
+
+    # --- worker side ---
+
+    def start(self):
+        """Start this process's worker threads (once per process, fork-safe)."""
+        if self.workers <= 0 or self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._requeue_orphans()
+            self._prune_events()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for t in self._threads:
+                t.start()
+
+    def _requeue_orphans(self):
+        """Put back jobs whose worker process died mid-run."""
+        conn = self._connect()
+        running = conn.execute("SELECT id, worker_pid FROM jobs WHERE status = 'running'").fetchall()
+        dead = [(job_id,) for job_id, pid in running if pid is None or not pid_alive(pid)]
+        conn.executemany("UPDATE jobs SET status = 'queued', worker_pid = NULL WHERE id = ?", dead)
+        conn.commit()
+        conn.close()
+
+    def _prune_events(self):
+        """Delete the partial results of jobs that finished more than JOB_EVENTS_TTL ago."""
+        conn = self._connect()
+        conn.execute(
+            "DELETE FROM job_events WHERE job_id IN "
+            "(SELECT id FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?)",
+            (time.time() - JOB_EVENTS_TTL,),
+        )
+        conn.commit()
+        conn.close()
+
+    def _claim(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, kind, params FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_pid = ?, updated_at = ? WHERE id = ?",
+                    (os.getpid(), time.time(), row[0]),
+                )
+            conn.commit()
+            return row
+        finally:
+            conn.close()
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = time.time()
+        cols = ", ".join(f"{name} = ?" for name in fields)
+        conn = self._connect()
+        conn.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+        conn.commit()
+        conn.close()
+
+    def publish(self, job_id, event, data):
+        """Record a partial result for the job's event stream."""
+        conn = self._connect()
+        conn.execute("INSERT INTO job_events (job_id, event, data) VALUES (?, ?, ?)", (job_id, event, json.dumps(data)))
+        conn.commit()
+        conn.close()
+
+    def _run(self):
+        while True:
+            job = self._claim()
+            if job is None:
+                self._wakeup.wait(JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            job_id, kind, params = job
+
+            def progress(**counts):
+                allowed = {"files_total", "files_extracted", "files_scored"}
+                for event in EVENT_KINDS:
+                    if event in counts:
+                        self.publish(job_id, event, counts[event])
+                fields = {k: v for k, v in counts.items() if k in allowed}
+                if fields:
+                    self._update(job_id, **fields)
+
+            params = json.loads(params)
+            status = "done"
+            try:
+                with span("job", kind=kind), profiled(f"job-{kind}-{job_id}", profile_wanted(params.get("profile"))):
+                    result = self.handlers[kind](params, progress)
+                self._update(job_id, status="done", result=json.dumps(result))
+            except Exception as e:
+                traceback.print_exc()
+                status = "failed"
+                self._update(job_id, status="failed", error=str(e))
+            JOBS.inc(kind=kind, status=status)
+            registry.flush()
+            self._prune_events()
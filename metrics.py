@@ -0,0 +1,280 @@
+import atexit
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import CACHE_DIR
+
+# --- Config ---
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(CACHE_DIR, "metrics"))  # one snapshot per process
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 1.0))  # seconds between snapshots
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(CACHE_DIR, "profiles"))
+# "" = off, "1" = profile every request and job, "param" = only those asked for with ?profile=1
+PROFILE_REQUESTS = os.environ.get("PROFILE_REQUESTS", "")
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.kind = "counter"
+        self.values = {}  # label key -> total
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self.values.items()]
+
+
+class Histogram:
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.kind = "histogram"
+        self.buckets = tuple(buckets)
+        self.values = {}  # label key -> [count per bucket..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), list(state)] for key, state in self.values.items()]
+
+
+class Registry:
+    """
+    Counters and latency histograms of this process, rendered in the
+    Prometheus text format.
+
+    Every process (each gunicorn worker) writes a snapshot to METRICS_DIR at
+    most once per METRICS_FLUSH_INTERVAL; render() adds up the snapshots of
+    all live processes, so a scrape that lands on any worker sees the whole
+    server. Once a process has flushed, a background thread keeps flushing
+    every METRICS_FLUSH_INTERVAL and a last flush runs at exit, so counters
+    recorded after the last request or job are not lost.
+    """
+
+    def __init__(self, directory=METRICS_DIR):
+        self.directory = directory
+        self.metrics = {}
+        self._last_flush = 0.0
+        self._written = None  # last snapshot written, to skip rewriting an unchanged one
+        self._timer_pid = None
+        self._lock = threading.Lock()
+
+    def counter(self, name, help):
+        return self.metrics.setdefault(name, Counter(name, help))
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(name, help, buckets))
+
+    def snapshot(self):
+        return {
+            name: {"kind": m.kind, "help": m.help, "buckets": getattr(m, "buckets", None), "values": m.snapshot()}
+            for name, m in self.metrics.items()
+        }
+
+    def flush(self, force=False):
+        """Write this process's snapshot for the other workers' /metrics (throttled)."""
+        now = time.monotonic()
+        self._start_timer()
+        with self._lock:
+            if not force and now - self._last_flush < METRICS_FLUSH_INTERVAL:
+                return
+            self._last_flush = now
+            data = json.dumps(self.snapshot())
+            if data == self._written:
+                return
+            self._written = data
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+    def _start_timer(self):
+        """Start this process's periodic flush thread (once per process, fork-safe)."""
+        if self._timer_pid == os.getpid():
+            return
+        with self._lock:
+            if self._timer_pid == os.getpid():
+                return
+            self._timer_pid = os.getpid()
+            self._written = None  # a forked child has its own (not yet written) snapshot file
+        threading.Thread(target=self._flush_periodically, name="metrics-flush", daemon=True).start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            self.flush(force=True)
+
+    def _snapshots(self):
+        snapshots = [self.snapshot()]
+        if not os.path.isdir(self.directory):
+            return snapshots
+        for name in os.listdir(self.directory):
+            pid, ext = os.path.splitext(name)
+            if ext != ".json" or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            path = os.path.join(self.directory, name)
+            if not pid_alive(int(pid)):
+                try:
+                    os.remove(path)  # its counters are gone with it; Prometheus sees a reset
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                pass
+        return snapshots
+
+    def render(self):
+        """Prometheus text exposition of every live process's metrics, summed."""
+        merged = {}
+        for snapshot in self._snapshots():
+            for name, metric in snapshot.items():
+                entry = merged.setdefault(name, {**metric, "values": {}})
+                for labels, value in metric["values"]:
+                    key = tuple(tuple(pair) for pair in labels)
+                    if metric["kind"] == "counter":
+                        entry["values"][key] = entry["values"].get(key, 0) + value
+                    else:
+                        old = entry["values"].get(key)
+                        entry["values"][key] = value if old is None else [a + b for a, b in zip(old, value)]
+
+        lines = []
+        for name in sorted(merged):
+            metric = merged[name]
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['kind']}")
+            for key, value in sorted(metric["values"].items()):
+                if metric["kind"] == "counter":
+                    lines.append(f"{name}{_labels(key)} {value}")
+                    continue
+                for bound, count in zip(metric["buckets"], value):
+                    lines.append(f"{name}_bucket{_labels(key + (('le', repr(float(bound))),))} {count}")
+                lines.append(f"{name}_bucket{_labels(key + (('le', '+Inf'),))} {value[-2]}")
+                lines.append(f"{name}_count{_labels(key)} {value[-2]}")
+                lines.append(f"{name}_sum{_labels(key)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key):
+    if not key:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in key)
+    return "{" + ",".join(escaped) + "}"
+
+
+def pid_alive(pid):
+    """Whether a process with this pid is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = Registry()
+atexit.register(registry.flush, force=True)
+
+# --- Metrics ---
+REQUEST_SECONDS = registry.histogram("prism_request_seconds", "HTTP request latency by endpoint.")
+SPAN_SECONDS = registry.histogram("prism_span_seconds", "Time spent in each pipeline stage.")
+FILES_EXTRACTED = registry.counter("prism_files_extracted_total", "Files parsed for text, by format.")
+BYTES_EXTRACTED = registry.counter("prism_bytes_extracted_total", "Bytes of files parsed for text, by format.")
+FILES_UPLOADED = registry.counter("prism_files_uploaded_total", "Files saved from uploads.")
+BYTES_UPLOADED = registry.counter("prism_bytes_uploaded_total", "Bytes saved from uploads.")
+CACHE_LOOKUPS = registry.counter("prism_cache_lookups_total", "Cache lookups by cache and result (hit/miss).")
+SCORED_PAIRS = registry.counter("prism_scored_pairs_total", "JD x resume similarities computed, by method.")
+JOBS = registry.counter("prism_jobs_total", "Background jobs finished, by kind and status.")
+
+
+@contextmanager
+def span(name, **labels):
+    """Time the block into prism_span_seconds{span=name, ...}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        SPAN_SECONDS.observe(time.perf_counter() - start, span=name, **labels)
+
+
+def record_extraction(path, seconds):
+    """Count one parsed file and its extraction time under its format (file suffix)."""
+    fmt = os.path.splitext(path)[1].lstrip(".").lower()
+    SPAN_SECONDS.observe(seconds, span="extract", format=fmt)
+    FILES_EXTRACTED.inc(format=fmt)
+    try:
+        BYTES_EXTRACTED.inc(os.path.getsize(path), format=fmt)
+    except OSError:
+        pass
+
+
+def profile_wanted(requested=False):
+    """Whether to profile a request/job, given whether it asked for it (?profile=1)."""
+    return PROFILE_REQUESTS == "1" or (PROFILE_REQUESTS == "param" and bool(requested))
+
+
+class Profile:
+    """cProfile of one request or job, dumped to PROFILE_DIR as <time>-<name>-<pid>.prof (view with pstats/snakeviz)."""
+
+    def __init__(self, name):
+        self.name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+        return self
+
+    def stop(self):
+        self._profile.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.name}-{os.getpid()}.prof")
+        self._profile.dump_stats(path)
+        return path
+
+
+@contextmanager
+def profiled(name, enabled):
+    """Profile the block into PROFILE_DIR if enabled."""
+    if not enabled:
+        yield
+        return
+    profile = Profile(name).start()
+    try:
+        yield
+    finally:
+        log.info("profile written to %s", profile.stop())
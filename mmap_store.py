@@ -0,0 +1,57 @@
+import fcntl
+import os
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def new_generation(version):
+    """Name for a fresh set of array files (unique even if two processes save the same version)."""
+    return f"{version}-{uuid.uuid4().hex[:8]}"
+
+
+def write_array(path, array):
+    """Write array as raw bytes (no header); read it back with map_array and the same dtype."""
+    tmp = path + ".tmp"
+    np.ascontiguousarray(array).tofile(tmp)
+    os.replace(tmp, path)
+
+
+def map_array(path, dtype):
+    """Read-only memory map of a raw array file (an empty array for an empty file).
+
+    Every process mapping the same file shares one copy in the page cache.
+    """
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+@contextmanager
+def locked(directory, shared=False):
+    """Hold the directory's lock file: exclusive to write a generation, shared to read one.
+
+    Writers hold it from the first array file until old generations are
+    dropped, so one process never deletes another's half-written generation
+    and a reader never sees meta.json point at files that are gone.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, ".lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def drop_generations(directory, keep):
+    """Delete "<name>.<generation>.<ext>" files of every generation but keep (call under locked()).
+
+    Processes that still map an old generation keep reading it: the data
+    stays valid until they let go of the mapping.
+    """
+    for name in os.listdir(directory):
+        parts = name.split(".")
+        if len(parts) == 3 and parts[2] != "tmp" and parts[1] != keep:
+            os.remove(os.path.join(directory, name))
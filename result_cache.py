@@ -0,0 +1,163 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import CACHE_DIR
+from metrics import CACHE_LOOKUPS
+
+RESULT_CACHE_PATH = os.path.join(CACHE_DIR, "result_cache.db")
+RESULT_CACHE_MEMORY_BYTES = int(os.environ.get("RESULT_CACHE_MEMORY_BYTES", 64 * 1024 * 1024))
+RESULT_CACHE_DISK_BYTES = int(os.environ.get("RESULT_CACHE_DISK_BYTES", 512 * 1024 * 1024))
+
+
+def text_digest(text):
+    return hashlib.sha256((text or "").encode("utf-8", errors="ignore")).hexdigest()
+
+
+def result_key(jd_text, corpus_fingerprint, config):
+    """Cache key for scoring jd_text against a corpus state with a given scoring config."""
+    return f"{text_digest(jd_text)}:{corpus_fingerprint}:{config}"
+
+
+class ResultCache:
+    """
+    Two-level LRU cache of screening results.
+
+    Values are pickled once; the most recently used ones are kept in memory
+    up to max_memory_bytes and every value is also written to SQLite, whose
+    least recently used rows are dropped past max_disk_bytes. Keys embed the
+    corpus fingerprint, so a changed resume folder simply stops matching old
+    entries, which then age out.
+    """
+
+    def __init__(self, path=RESULT_CACHE_PATH, max_memory_bytes=RESULT_CACHE_MEMORY_BYTES,
+                 max_disk_bytes=RESULT_CACHE_DISK_BYTES):
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value BLOB,
+                nbytes INTEGER,
+                last_used REAL
+            );
+            CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+            """)
+            self._conn = conn
+        return self._conn
+
+    def get(self, key):
+        """Cached value for key, or None."""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                CACHE_LOOKUPS.inc(cache="result", result="memory_hit")
+            else:
+                conn = self._db()
+                row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    CACHE_LOOKUPS.inc(cache="result", result="miss")
+                    return None
+                blob = row[0]
+                conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                self.disk_hits += 1
+                CACHE_LOOKUPS.inc(cache="result", result="disk_hit")
+                self._remember(key, blob)
+        return pickle.loads(blob)
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            if len(blob) > self.max_disk_bytes:
+                return
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, nbytes, last_used) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._evict_disk(conn)
+            conn.commit()
+
+    def _remember(self, key, blob):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        if len(blob) > self.max_memory_bytes:
+            return
+        self._memory[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM results").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        doomed = []
+        for key, nbytes in conn.execute("SELECT key, nbytes FROM results ORDER BY last_used"):
+            if total <= self.max_disk_bytes:
+                break
+            doomed.append((key,))
+            total -= nbytes
+        conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def stats(self):
+        with self._lock:
+            entries, nbytes = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM results"
+            ).fetchone()
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": entries,
+                "disk_bytes": nbytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            conn = self._db()
+            conn.execute("DELETE FROM results")
+            conn.commit()
+
+
+_cache = None
+
+
+def get_result_cache():
+    """Process-wide ResultCache."""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
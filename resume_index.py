@@ -0,0 +1,410 @@
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from bm25 import BM25
+from impact_index import ImpactIndex
+from metrics import span
+from mmap_store import drop_generations, locked, map_array, new_generation, write_array
+from semantic import SemanticIndex
+from watcher import file_fingerprint  # noqa: F401 (re-exported)
+
+
+class ResumeIndex:
+    """
+    Persistent TF-IDF index over a resume corpus.
+
+    Stores the vocabulary, document frequencies and raw term counts (CSR), so
+    resumes can be added or removed one at a time. Weighting follows sklearn's
+    TfidfVectorizer defaults (smooth idf, l2 norm): row norms are recomputed
+    lazily after a change, and scoring a query is a single sparse
+    matrix-vector product over the counts. Saved indexes are memory-mapped
+    on load (see save()).
+    """
+
+    def __init__(self, path, stop_words="english"):
+        self.path = path
+        self.analyzer = TfidfVectorizer(stop_words=stop_words).build_analyzer()
+        self.vocabulary = {}
+        self.df = np.zeros(0, dtype=np.int64)
+        self.keys = []
+        self.fingerprints = {}
+        self.counts = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self.version = 0
+        self.generation = None
+        self._rows = {}
+        self._norms = None
+        self._impacts = None
+        self._semantic = None
+        self._fingerprint = None
+        self._meta_stat = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    # --- persistence ---
+    #
+    # Each save() writes a new generation of flat arrays ("<name>.<generation>.bin")
+    # and only then points meta.json at it, so a reader sees either the old
+    # or the new index, never a mix. The arrays are memory-mapped read-only:
+    # every gunicorn worker shares one page-cache copy of the matrix.
+
+    _ARRAYS = ("data", "indices", "indptr", "df", "norms")
+
+    def _meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    def load(self):
+        if not os.path.exists(self._meta_path()):
+            return self
+        # Under the shared lock no save() can drop the generation between
+        # reading meta.json and mapping its files; a missing file is an error.
+        with locked(self.path, shared=True):
+            stat = os.stat(self._meta_path())
+            with open(self._meta_path(), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if "generation" not in meta:
+                return self  # pre-mmap layout; rebuilt on the next sync
+            generation = meta["generation"]
+            arrays = {
+                name: map_array(os.path.join(self.path, f"{name}.{generation}.bin"), meta["dtypes"][name])
+                for name in self._ARRAYS
+            }
+            with open(os.path.join(self.path, f"vocab.{generation}.txt"), "r", encoding="utf-8") as f:
+                terms = f.read().split("\n") if meta["n_terms"] else []
+        with self._lock:
+            self.vocabulary = {term: col for col, term in enumerate(terms)}
+            self.keys = meta["keys"]
+            self.fingerprints = meta["fingerprints"]
+            self.version = meta["version"]
+            self.generation = generation
+            self.df = arrays["df"]
+            self.counts = sparse.csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]),
+                shape=(len(self.keys), len(terms)),
+                copy=False,
+            )
+            self._rows = {k: i for i, k in enumerate(self.keys)}
+            self._norms = arrays["norms"]
+            self._impacts = None
+            self._semantic = None
+            self._fingerprint = None
+            self._meta_stat = (stat.st_ino, stat.st_mtime_ns)
+        return self
+
+    def refresh(self):
+        """Reload if another process saved a newer generation; returns True if it did.
+
+        Unsaved changes in this process are dropped, so call it before
+        updating, not between an update and save().
+        """
+        try:
+            stat = os.stat(self._meta_path())
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            if (stat.st_ino, stat.st_mtime_ns) == self._meta_stat:
+                return False
+            self.load()
+            return True
+
+    def save(self):
+        with self._lock, locked(self.path):
+            generation = new_generation(self.version)
+            counts = self.counts
+            index_dtype = np.int32 if counts.nnz < 2 ** 31 and counts.shape[1] < 2 ** 31 else np.int64
+            arrays = {
+                "data": counts.data.astype(np.float64, copy=False),
+                "indices": counts.indices.astype(index_dtype, copy=False),
+                "indptr": counts.indptr.astype(index_dtype, copy=False),
+                "df": self.df.astype(np.int64, copy=False),
+                "norms": self.norms(),
+            }
+            for name, array in arrays.items():
+                write_array(os.path.join(self.path, f"{name}.{generation}.bin"), array)
+            terms = sorted(self.vocabulary, key=self.vocabulary.get)
+            with open(os.path.join(self.path, f"vocab.{generation}.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(terms))
+            meta_tmp = os.path.join(self.path, "meta.json.tmp")
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self.version,
+                    "generation": generation,
+                    "dtypes": {name: array.dtype.str for name, array in arrays.items()},
+                    "n_terms": len(terms),
+                    "keys": self.keys,
+                    "fingerprints": self.fingerprints,
+                }, f)
+            os.replace(meta_tmp, self._meta_path())
+            drop_generations(self.path, generation)
+            legacy = os.path.join(self.path, "counts.npz")
+            if os.path.exists(legacy):
+                os.remove(legacy)
+        # Serve from the files just written, so this process shares them too
+        return self.load()
+
+    # --- updates ---
+
+    def _count_row(self, text):
+        counts = Counter(self.analyzer(text or ""))
+        cols = []
+        for term in counts:
+            col = self.vocabulary.get(term)
+            if col is None:
+                col = self.vocabulary[term] = len(self.vocabulary)
+            cols.append(col)
+        vals = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return np.asarray(cols, dtype=np.int32), vals
+
+    def add_many(self, docs):
+        """Add or replace documents from (key, text, fingerprint) triples."""
+        docs = list(docs)
+        if not docs:
+            return
+        with self._lock, span("vectorize"):
+            self.remove_many([key for key, _, _ in docs if key in self._rows])
+            indptr = [0]
+            indices = []
+            data = []
+            for key, text, fingerprint in docs:
+                cols, vals = self._count_row(text)
+                indices.append(cols)
+                data.append(vals)
+                indptr.append(indptr[-1] + len(cols))
+                self._rows[key] = len(self.keys)
+                self.keys.append(key)
+                self.fingerprints[key] = fingerprint
+            n_terms = len(self.vocabulary)
+            new_rows = sparse.csr_matrix(
+                (np.concatenate(data), np.concatenate(indices), np.asarray(indptr)),
+                shape=(len(docs), n_terms),
+            )
+            counts = self.counts
+            counts.resize((counts.shape[0], n_terms))
+            self.counts = sparse.vstack([counts, new_rows], format="csr")
+            df = np.zeros(n_terms, dtype=np.int64)
+            df[: len(self.df)] = self.df
+            df += np.bincount(new_rows.indices, minlength=n_terms)
+            self.df = df
+            self._changed()
+
+    def add(self, key, text, fingerprint=None):
+        self.add_many([(key, text, fingerprint)])
+
+    def remove_many(self, keys):
+        with self._lock:
+            drop = {self._rows[k] for k in keys if k in self._rows}
+            if not drop:
+                return
+            mask = np.ones(len(self.keys), dtype=bool)
+            mask[list(drop)] = False
+            removed = self.counts[~mask]
+            self.df = self.df - np.bincount(removed.indices, minlength=len(self.df))
+            self.counts = self.counts[mask]
+            for row in drop:
+                self.fingerprints.pop(self.keys[row], None)
+            self.keys = [k for i, k in enumerate(self.keys) if mask[i]]
+            self._rows = {k: i for i, k in enumerate(self.keys)}
+            self._changed()
+
+    def remove(self, key):
+        self.remove_many([key])
+
+    def stale(self, fingerprints):
+        """Keys of fingerprints that are not indexed or have changed."""
+        return [k for k, fp in fingerprints.items() if self.fingerprints.get(k) != fp]
+
+    def update(self, fingerprints, loader):
+        """
+        Index every key whose fingerprint is new or changed; returns the count.
+
+        loader receives the list of stale keys and returns their texts in the
+        same order, so extraction can be batched (see extract_pool). A None
+        text means the file could not be read: it is left out (any older
+        version dropped) and its fingerprint not recorded, so the next update
+        tries it again.
+        """
+        with self._lock:
+            stale = self.stale(fingerprints)
+            if not stale:
+                return 0
+            texts = loader(stale)
+            failed = [k for k, t in zip(stale, texts) if t is None]
+            dropped = [k for k in failed if k in self._rows]
+            self.remove_many(dropped)
+            self.add_many((k, t, fingerprints[k]) for k, t in zip(stale, texts) if t is not None)
+        return len(stale) - len(failed) + len(dropped)
+
+    def sync(self, fingerprints, loader):
+        """Make the index match fingerprints exactly; returns True if anything changed."""
+        with self._lock:
+            gone = [k for k in self.keys if k not in fingerprints]
+            self.remove_many(gone)
+            added = self.update(fingerprints, loader)
+        return bool(gone or added)
+
+    def _changed(self):
+        self._norms = None
+        self._impacts = None
+        self._semantic = None
+        self._fingerprint = None
+        self.version += 1
+
+    def fingerprint(self):
+        """Hash of every (key, file fingerprint) pair; changes whenever the corpus does."""
+        with self._lock:
+            if self._fingerprint is None:
+                items = json.dumps(sorted(self.fingerprints.items()), separators=(",", ":"))
+                self._fingerprint = hashlib.sha256(items.encode("utf-8")).hexdigest()[:16]
+            return self._fingerprint
+
+    # --- scoring ---
+
+    def idf(self):
+        n = len(self.keys)
+        return np.log((1 + n) / (1 + self.df)) + 1
+
+    def norms(self):
+        """l2 norm of each resume's TF-IDF row (1.0 for empty rows), rows in self.keys order.
+
+        Scoring divides by these instead of materialising a weighted copy of
+        the counts, so the only large matrix is the shared memory-mapped one.
+        """
+        with self._lock:
+            if self._norms is None:
+                norms = np.sqrt(self.counts.multiply(self.counts) @ (self.idf() ** 2))
+                norms[norms == 0] = 1.0
+                self._norms = norms
+            return self._norms
+
+    def term_counts(self, text):
+        """Counter of the analyzed terms of text; every query method accepts one in place of the text."""
+        return Counter(self.analyzer(text or ""))
+
+    def _query_counts(self, query):
+        return query if isinstance(query, dict) else self.term_counts(query)
+
+    def vectorize(self, text):
+        """TF-IDF vector of a query over the index vocabulary (l2-normalised).
+
+        Terms the corpus has never seen still count toward the norm, as they
+        would if the query were fitted together with the corpus.
+        """
+        return self.vectorize_many([text]).toarray().ravel()
+
+    def vectorize_many(self, texts):
+        """Sparse matrix of l2-normalised query vectors, one row per text."""
+        n = len(self.keys)
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts = self._query_counts(text)
+            cols, vals, norm_sq = [], [], 0.0
+            for term, tf in counts.items():
+                col = self.vocabulary.get(term)
+                df = self.df[col] if col is not None else 0
+                w = tf * (np.log((1 + n) / (1 + df)) + 1)
+                norm_sq += w * w
+                if col is not None:
+                    cols.append(col)
+                    vals.append(w)
+            norm = np.sqrt(norm_sq) if norm_sq else 1.0
+            indices.extend(cols)
+            data.extend(v / norm for v in vals)
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(indptr) - 1, len(self.vocabulary)),
+        )
+
+    def scores(self, text, keys=None):
+        """Cosine similarity of text against every indexed resume (or just keys)."""
+        with self._lock:
+            query = self.vectorize(text) * self.idf()
+            if keys is None:
+                return (self.counts @ query) / self.norms()
+            rows = [self._rows[k] for k in keys]
+            return (self.counts[rows] @ query) / self.norms()[rows]
+
+    def score_matrix(self, texts):
+        """Cosine similarities of N query texts against all M resumes, as a dense N x M array."""
+        with self._lock:
+            queries = self.vectorize_many(texts).multiply(self.idf()).tocsr()
+            return (self.counts @ queries.T).toarray().T / self.norms()
+
+    def query_terms(self, text):
+        """Dict of vocabulary column -> count for the known terms of a query."""
+        terms = self._query_counts(text)
+        return {self.vocabulary[t]: n for t, n in terms.items() if t in self.vocabulary}
+
+    def bm25_scores(self, text, keys=None):
+        """BM25 score of every indexed resume (or just keys); only the query terms' postings are read."""
+        with self._lock:
+            scores = self.impacts().scores(self.query_terms(text))
+            if keys is not None:
+                scores = scores[[self._rows[k] for k in keys]]
+            return scores
+
+
+    def impacts(self):
+        """On-disk impact index for pruned BM25 top-k, rebuilt only when the corpus has changed."""
+        with self._lock:
+            corpus = self.fingerprint()
+            if self._impacts is None or self._impacts.corpus != corpus:
+                path = os.path.join(self.path, "impacts")
+                impacts = ImpactIndex.load(path)
+                if impacts is None or impacts.corpus != corpus or impacts.n_docs != len(self.keys):
+                    impacts = ImpactIndex.build(BM25(self.counts), path, corpus)
+                self._impacts = impacts
+            return self._impacts
+
+    def bm25_top_k(self, text, k, offset=0):
+        """
+        (keys, scores) of the offset-th .. (offset+k-1)-th best BM25 matches.
+
+        Unlike bm25_scores() this never scores the whole corpus: documents
+        that cannot reach the top offset+k are skipped (see ImpactIndex).
+        """
+        with self._lock:
+            rows, scores = self.impacts().top_k(self.query_terms(text), k, offset)
+            return [self.keys[i] for i in rows], scores
+
+    def semantic(self):
+        """LSA embeddings + IVF index (see SemanticIndex), rebuilt only when the corpus has changed."""
+        with self._lock:
+            corpus = self.fingerprint()
+            if self._semantic is None or self._semantic.corpus != corpus:
+                path = os.path.join(self.path, "semantic")
+                semantic = SemanticIndex.load(path)
+                if semantic is None or semantic.corpus != corpus or len(semantic) != len(self.keys):
+                    weights = sparse.diags(1.0 / self.norms()) @ self.counts.multiply(self.idf()).tocsr()
+                    semantic = SemanticIndex.build(weights, path, corpus)
+                self._semantic = semantic
+            return self._semantic
+
+    def semantic_scores(self, text, keys=None):
+        """Exact cosine similarity in LSA space of text against every indexed resume (or just keys)."""
+        with self._lock:
+            semantic = self.semantic()
+            scores = semantic.scores(semantic.embed(self.vectorize_many([text])))
+            if keys is not None:
+                scores = scores[[self._rows[k] for k in keys]]
+            return scores
+
+    def semantic_top_k(self, text, k, offset=0):
+        """(keys, scores) of the approximately offset-th .. (offset+k-1)-th closest resumes in LSA space (IVF search)."""
+        with self._lock:
+            semantic = self.semantic()
+            rows, scores = semantic.top_k(semantic.embed(self.vectorize_many([text])), k, offset)
+            return [self.keys[i] for i in rows], scores
@@ -0,0 +1,93 @@
+import numpy as np
+from scipy import sparse
+
+
+class CountMatrix:
+    """
+    Term counts for a whole corpus as one CSR matrix.
+
+    Tokens are mapped to integer column ids once, and row norms are computed
+    up front, so cosine-scoring a query against every document is a single
+    sparse matrix-vector product rather than a Python loop over Counters.
+    """
+
+    def __init__(self, matrix, vocabulary):
+        self.matrix = matrix.tocsr()
+        self.vocabulary = vocabulary
+        self.norms = np.sqrt(np.asarray(self.matrix.multiply(self.matrix).sum(axis=1)).ravel())
+
+    @classmethod
+    def from_counters(cls, counters, vocabulary=None):
+        """Build from one Counter (token -> count) per document."""
+        vocabulary = {} if vocabulary is None else vocabulary
+        indptr = [0]
+        indices = []
+        data = []
+        for counts in counters:
+            for token, count in counts.items():
+                col = vocabulary.get(token)
+                if col is None:
+                    col = vocabulary[token] = len(vocabulary)
+                indices.append(col)
+                data.append(count)
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(indptr) - 1, len(vocabulary)),
+        )
+        return cls(matrix, vocabulary)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def query_vector(self, counts):
+        """Dense count vector of a query over the vocabulary, plus its full norm.
+
+        The norm includes tokens the corpus has never seen, matching
+        search.calculate_cosine_similarity.
+        """
+        vec = np.zeros(len(self.vocabulary))
+        norm_sq = 0.0
+        for token, count in counts.items():
+            norm_sq += count * count
+            col = self.vocabulary.get(token)
+            if col is not None:
+                vec[col] = count
+        return vec, np.sqrt(norm_sq)
+
+    def cosine(self, counts):
+        """Cosine similarity of a query Counter against every row (0.0 for empty rows)."""
+        vec, q_norm = self.query_vector(counts)
+        scores = np.zeros(len(self))
+        if not q_norm or not len(self):
+            return scores
+        dots = self.matrix @ vec
+        nonzero = self.norms > 0
+        scores[nonzero] = dots[nonzero] / (self.norms[nonzero] * q_norm)
+        return scores
+
+
+def top_k(scores, k=None, offset=0):
+    """
+    Indices of the offset-th .. (offset+k-1)-th highest scores, best first.
+
+    Uses a partition so only the offset+k leading entries are ever sorted;
+    k=None returns everything from offset on. Ties keep index order, also
+    across the cut: of several entries tied at the boundary score, the
+    lowest indices make the page.
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    end = n if k is None else min(n, offset + k)
+    if offset >= end:
+        return np.zeros(0, dtype=np.intp)
+    if end < n:
+        neg = -scores
+        boundary = np.partition(neg, end - 1)[end - 1]
+        above = np.flatnonzero(neg < boundary)
+        tied = np.flatnonzero(neg == boundary)[: end - len(above)]
+        head = np.concatenate([above, tied])
+    else:
+        head = np.arange(n)
+    order = head[np.lexsort((head, -scores[head]))]
+    return order[offset:end]
@@ -8,12 +8,25 @@ except ImportError:
     import typing
     typing.Deque = Deque
 import glob
+import hashlib
 import os
+import sys
+import threading
 import warnings
-import PyPDF2
-import docx2txt
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+
+from catalog import DUPLICATE, EMPTY, INDEXED, PENDING, get_catalog
+from config import CACHE_DIR, RANKING_METHODS, WATCH_LOCK
+from dedup import Deduplicator
+from extract_pool import extract_many
+from jd_cache import JDCache
+from metrics import SCORED_PAIRS, span
+from resume_index import ResumeIndex, file_fingerprint
+from result_cache import get_result_cache, result_key
+from scoring import top_k
+from skill_match import get_matcher
+from text_cache import cached_text, get_cache
+from watcher import DirectoryWatcher, watched_elsewhere
 
 
 warnings.filterwarnings("ignore")
@@ -33,26 +46,8 @@ def getfilepath(loc):
 
 
 def read_resume(filepath):
-    """Read PDF or DOCX safely"""
-    ext = filepath.lower().split(".")[-1]
-    text = ""
-    if ext == "pdf":
-        try:
-            with open(filepath, "rb") as pdf_file:
-                reader = PyPDF2.PdfReader(pdf_file)
-                for page in reader.pages:
-                    text += page.extract_text() or ""
-        except Exception as e:
-            text = f"[Error reading PDF: {e}]"
-    elif ext == "docx":
-        try:
-            text = docx2txt.process(filepath)
-        except Exception as e:
-            text = f"[Error reading DOCX: {e}]"
-    elif ext == "txt":
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
-    return text.replace("\n", " ")
+    """Read PDF or DOCX safely, reusing cached text for unchanged files"""
+    return cached_text(filepath)
 
 
 def summarize_text(text, max_sentences=5):
@@ -61,46 +56,404 @@ def summarize_text(text, max_sentences=5):
     return ". ".join(sentences[:max_sentences])
 
 
-def res(jobfile):
-    """Main resume screening function"""
-    resumes_dir = "./Original_Resumes"
-    job_dir = "./Job_Description"
+_index = None
+
+
+def get_index():
+    """Resume index of summarized resume text, memory-mapped from disk and shared by every worker process."""
+    global _index
+    if _index is None:
+        _index = ResumeIndex(os.path.join(CACHE_DIR, "screen_index")).load()
+    else:
+        _index.refresh()  # another worker may have saved a newer generation
+    return _index
+
+
+_dedup = None
+
+
+def get_dedup():
+    """Duplicate grouping of the resume folder, loaded from disk once per process."""
+    global _dedup
+    if _dedup is None:
+        _dedup = Deduplicator(os.path.join(CACHE_DIR, "dedup.db"))
+    return _dedup
+
+
+def _indexed_texts(filepaths, progress=None):
+    texts = extract_many(filepaths, progress=progress)
+    return [summarize_text(text) if text is not None else None for text in texts]
+
+
+RESUMES_DIR = "./Original_Resumes"
+JOB_DIR = "./Job_Description"
+
+METHODS = RANKING_METHODS
+
+# Part of every result-cache key (with the method); bump it when the scoring pipeline changes.
+SCORING_CONFIG = "summary-5:english"
+
+
+RESUME_SUFFIXES = (".pdf", ".docx", ".txt")
+
+
+def _scan_resumes():
+    """Fingerprints of every resume under RESUMES_DIR (a full directory scan)."""
+    resume_files = glob.glob(os.path.join(RESUMES_DIR, "**/*.*"), recursive=True)
+    return {
+        filepath: file_fingerprint(filepath)
+        for filepath in resume_files
+        if filepath.lower().endswith(RESUME_SUFFIXES)
+    }
+
+
+_ingest_lock = threading.RLock()
+
+
+def _catalog_resumes(index, dedup, unique):
+    """Record each resume's outcome in the catalog (rows that were pending or whose status moved)."""
+    catalog = get_catalog()
+    tokens = dict(zip(index.keys, np.asarray(index.counts.sum(axis=1)).ravel().astype(int).tolist()))
+    rows = []
+    for path, current in catalog.statuses("resume").items():
+        if path in unique:
+            if path not in tokens:
+                continue  # could not be read: stays pending and is retried on the next ingest
+            token_count = tokens[path]
+            status = INDEXED if token_count else EMPTY
+        else:
+            token_count, status = None, DUPLICATE
+        if current == PENDING or current != status:
+            digest = dedup.docs[path][1] if path in dedup.docs else None
+            rows.append((path, digest, status, token_count, index.version))
+    catalog.record(rows)
+
+
+def _ingest(fingerprints, report):
+    """Bring dedup groups, the index and the catalog in line with fingerprints (only new/changed/deleted files cost anything)."""
+    total = len(fingerprints)
+    report(files_total=total)
+    get_catalog().sync("resume", fingerprints)
+
+    def load(stale):
+        fresh = total - len(stale)
+        return extract_many(stale, progress=lambda n: report(files_extracted=fresh + n))
+
+    # --- ingest: group exact and near-duplicate copies, index one file per candidate ---
+    dedup = get_dedup()
+    dedup.update(fingerprints, load)
+    unique = {key: fingerprints[key] for key in dedup.unique(fingerprints)}
+
+    # --- bring the index up to date (texts come from the text cache by now) ---
+    with _ingest_lock:
+        index = get_index()
+        if index.sync(unique, _indexed_texts):
+            index.save()
+        _catalog_resumes(index, dedup, unique)
+    report(files_extracted=total)
+    return index
+
+
+_watcher = None
+_watch_ready = threading.Event()  # set after the watcher's first pass, whether or not it worked
+_watch_ok = False  # whether its latest pass brought the index up to date
+
+
+def _on_resumes_changed(fingerprints):
+    global _watch_ok
+    _watch_ok = False
+    try:
+        _ingest(fingerprints, lambda **counts: None)
+        _watch_ok = True
+    finally:
+        _watch_ready.set()
+
+
+def watch_resumes():
+    """
+    Keep the index in sync with RESUMES_DIR from a background thread.
+
+    A DirectoryWatcher (inotify, or polling where that is unavailable)
+    reports new, changed and deleted resumes, which are extracted and
+    indexed as they arrive; from then on requests skip the directory scan
+    and extraction entirely.
+    """
+    global _watcher
+    with _ingest_lock:
+        if _watcher is None:
+            _watcher = DirectoryWatcher(RESUMES_DIR, _on_resumes_changed, suffixes=RESUME_SUFFIXES).start()
+    return _watcher
+
+
+def _resumes_watched():
+    """Whether a watcher, in this process or another, keeps the index current."""
+    if _watcher is not None:
+        _watch_ready.wait()  # the initial scan is still being indexed
+        return _watch_ok
+    return watched_elsewhere(WATCH_LOCK)
+
+
+def _sync_index(report):
+    """The index, up to date with the resume folder (kept current by the watcher if one is running)."""
+    if _resumes_watched():
+        with _ingest_lock:
+            index = get_index()
+        # Another process's watcher may not have saved its first pass yet
+        if len(index) or _watcher is not None:
+            report(files_total=len(index), files_extracted=len(index))
+            return index
+    return _ingest(_scan_resumes(), report)
 
-    resume_files = glob.glob(os.path.join(resumes_dir, "**/*.*"), recursive=True)
-    resume_texts = []
-    resume_names = []
 
-    for filepath in resume_files:
-        if filepath.lower().endswith((".pdf", ".docx", ".txt")):
-            resume_names.append(os.path.basename(filepath))
-            resume_texts.append(read_resume(filepath))
+def _preprocess_job(path):
+    """(summary, term counts of the summary, skill hits and term counts of the full text) of a JD file."""
+    text = read_resume(path)
+    summary = summarize_text(text)
+    index = get_index()
+    return summary, index.term_counts(summary), get_matcher().counts(text), index.term_counts(text)
 
-    # --- read job description ---
-    job_path = os.path.join(job_dir, jobfile)
+
+_jd_cache = None
+
+
+def get_jd_cache():
+    """Preprocessed job descriptions, computed once per file version and shared across requests."""
+    global _jd_cache
+    if _jd_cache is None:
+        skills = hashlib.sha256("\n".join(get_matcher().skills).encode("utf-8")).hexdigest()[:12]
+        _jd_cache = JDCache(_preprocess_job, f"{SCORING_CONFIG}:skills-{skills}")
+    return _jd_cache
+
+
+def job_description(path):
+    """The preprocessed JD at path (any location, e.g. one uploaded through /process)."""
+    return get_jd_cache().get(path)
+
+
+def _scan_jobs():
+    return {path: file_fingerprint(path) for path in glob.glob(os.path.join(JOB_DIR, "*.txt"))}
+
+
+_job_watcher = None
+_jobs_ready = threading.Event()  # set after the JD watcher's first pass, whether or not it worked
+_jobs_ok = False
+
+
+def _sync_jobs(fingerprints):
+    """Preprocess new/changed JDs and record them in the catalog."""
+    catalog = get_catalog()
+    cache = get_jd_cache()
+    catalog.sync("jd", fingerprints)
+    cache.sync(fingerprints)
+    pending = catalog.paths("jd", status=PENDING)
+    if pending:
+        jobs = {job.path: job for job in cache.listing()}
+        rows = []
+        for path in pending:
+            job = jobs.get(path)
+            if job is None:
+                continue  # could not be read; stays pending until it changes again
+            try:
+                digest = get_cache().digest(path)
+            except OSError:
+                continue
+            token_count = sum(job.terms.values())
+            rows.append((path, digest, INDEXED if token_count else EMPTY, token_count, None))
+        catalog.record(rows)
+
+
+def _on_jobs_changed(fingerprints):
+    global _jobs_ok
+    _jobs_ok = False
+    try:
+        # Only JDs directly in the folder are listed, as with the old glob
+        _sync_jobs({p: fp for p, fp in fingerprints.items() if os.path.dirname(p) == JOB_DIR})
+        _jobs_ok = True
+    finally:
+        _jobs_ready.set()
+
+
+def watch_jobs():
+    """Preprocess JDs in the background as they appear in or change under JOB_DIR."""
+    global _job_watcher
+    with _ingest_lock:
+        if _job_watcher is None:
+            _job_watcher = DirectoryWatcher(JOB_DIR, _on_jobs_changed, suffixes=(".txt",)).start()
+    return _job_watcher
+
+
+def job_descriptions():
+    """Every JD in the folder, preprocessed (no rescan while a JD watcher is running)."""
+    if _job_watcher is not None:
+        _jobs_ready.wait()
+        watched = _jobs_ok
+    else:
+        watched = watched_elsewhere(WATCH_LOCK)
+    if not watched:
+        _sync_jobs(_scan_jobs())
+    return get_jd_cache().listing()
+
+
+def job_key(jobfile):
+    """The JD cache key of a file in JOB_DIR, whichever way its path was spelled."""
+    return os.path.join(JOB_DIR, os.path.basename(jobfile))
+
+
+def _read_job(jobfile):
+    job_path = job_key(jobfile)
     if not os.path.exists(job_path):
         raise FileNotFoundError(f"Job description file not found: {job_path}")
+    return job_description(job_path)
+
+
+def _score(index, jobs, method="tfidf"):
+    """
+    Similarity rows (one per JobDescription) against every indexed resume.
+
+    Rows for a JD already scored against this exact corpus state come from
+    the result cache; the rest are computed (TF-IDF: one matrix product;
+    BM25: postings of the JD terms only; semantic: one product with the
+    LSA embeddings) and cached. BM25 rows are scaled so the best resume
+    scores 1.0; negative semantic similarities count as 0. Returns
+    (scores, keys) with columns in keys order.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown ranking method: {method}")
+    cache = get_result_cache()
+    corpus = index.fingerprint()
+    config = f"{method}:{SCORING_CONFIG}"
+    keys = list(index.keys)
+    rows = [None] * len(jobs)
+    todo = []
+    for i, job in enumerate(jobs):
+        hit = cache.get(result_key(job.summary, corpus, config))
+        if hit is None:
+            todo.append(i)
+            continue
+        cached_scores, cached_keys = hit
+        if cached_keys != keys:
+            pos = {key: j for j, key in enumerate(cached_keys)}
+            cached_scores = cached_scores[[pos[key] for key in keys]]
+        rows[i] = cached_scores
+
+    if todo:
+        with span("similarity", method=method):
+            if method == "bm25":
+                fresh = []
+                for i in todo:
+                    row = index.bm25_scores(jobs[i].terms).astype(np.float64)
+                    fresh.append(row / row.max() if len(row) and row.max() > 0 else row)
+            elif method == "semantic":
+                fresh = [np.maximum(index.semantic_scores(jobs[i].terms), 0).astype(np.float64) for i in todo]
+            else:
+                fresh = index.score_matrix([jobs[i].terms for i in todo])
+        SCORED_PAIRS.inc(len(todo) * len(keys), method=method)
+        for i, row in zip(todo, fresh):
+            rows[i] = row
+            cache.put(result_key(jobs[i].summary, corpus, config), (row, keys))
+
+    scores = np.vstack(rows) if rows else np.zeros((0, len(keys)))
+    return scores, keys
+
+
+def _rank(similarities, resume_names, k=None, offset=0):
+    """ResultElements for ranks offset+1 .. offset+k only (partial selection, not a full sort)."""
+    with span("sort"):
+        return [
+            ResultElement(rank=rank, filename=resume_names[i], score=round(similarities[i] * 100, 2))
+            for rank, i in enumerate(top_k(similarities, k, offset), offset + 1)
+        ]
 
-    with open(job_path, "r", encoding="utf-8", errors="ignore") as f:
-        job_text = f.read()
 
-    job_summary = summarize_text(job_text)
-    corpus = [job_summary] + [summarize_text(r) for r in resume_texts]
+def _rank_pruned(index, job, k, offset=0):
+    """Like _rank() for BM25, but only the top offset+k resumes are ever fully scored."""
+    with span("similarity", method="bm25_pruned"):
+        keys, scores = index.bm25_top_k(job.terms, offset + k)
+    best = float(scores[0]) if len(scores) and scores[0] > 0 else 1.0
+    return [
+        ResultElement(rank=rank, filename=os.path.basename(key), score=round(float(score) / best * 100, 2))
+        for rank, (key, score) in enumerate(zip(keys[offset:], scores[offset:]), offset + 1)
+    ]
 
-    # --- TF-IDF similarity ---
-    vectorizer = TfidfVectorizer(stop_words="english")
-    tfidf = vectorizer.fit_transform(corpus)
-    similarities = cosine_similarity(tfidf[0:1], tfidf[1:]).flatten()
 
-    ranked = sorted(zip(similarities, resume_names), key=lambda x: x[0], reverse=True)
+def _rank_semantic(index, job, k, offset=0):
+    """Like _rank() for semantic similarity, from an approximate (IVF) nearest-neighbour search."""
+    with span("similarity", method="semantic_ann"):
+        keys, scores = index.semantic_top_k(job.terms, k, offset)
+    return [
+        ResultElement(rank=rank, filename=os.path.basename(key), score=round(max(float(score), 0.0) * 100, 2))
+        for rank, (key, score) in enumerate(zip(keys, scores), offset + 1)
+    ]
 
-    flask_return = []
-    for idx, (score, name) in enumerate(ranked, 1):
-        print(f"Rank {idx}: {name} — Score {round(score,3)}")
-        flask_return.append(ResultElement(rank=idx, filename=name, score=round(score * 100, 2)))
 
+def res(jobfile, progress=None, k=None, offset=0, method="tfidf"):
+    """
+    Main resume screening function
+
+    method is "tfidf" (cosine), "bm25" or "semantic". k/offset select one page of the ranking (e.g. k=50, offset=100
+    for ranks 101-150); by default every resume is returned. A BM25 page is
+    served by the pruned top-k evaluator and a semantic page by the ANN
+    index, rather than a full scoring pass.
+    progress, if given, is called with files_total / files_extracted /
+    files_scored keyword counts as the run advances (see jobs.JobQueue).
+    """
+    report = progress or (lambda **counts: None)
+    index = _sync_index(report)
+
+    # --- job description (preprocessed once per file version) ---
+    job = _read_job(jobfile)
+
+    with _ingest_lock:  # the watcher must not change the index mid-score
+        if method == "bm25" and k is not None:
+            # --- one page of BM25: pruned top-k over the impact index ---
+            flask_return = _rank_pruned(index, job, k, offset)
+            report(files_scored=len(index))
+        elif method == "semantic" and k is not None:
+            # --- one page of semantic matches: IVF search over the embeddings ---
+            flask_return = _rank_semantic(index, job, k, offset)
+            report(files_scored=len(index))
+        else:
+            # --- similarity against the stored index (or the cached ranking) ---
+            scores, keys = _score(index, [job], method)
+            similarities = scores[0]
+            resume_names = [os.path.basename(key) for key in keys]
+            report(files_scored=len(resume_names))
+
+            flask_return = _rank(similarities, resume_names, k, offset)
+    for r in flask_return:
+        print(f"Rank {r.rank}: {r.filename} — Score {r.score / 100:.3f}")
 
     return flask_return
 
 
+def res_many(jobfiles=None, progress=None, method="tfidf"):
+    """
+    Screen the resume pool against several job descriptions at once.
+
+    jobfiles defaults to every .txt in Job_Description. The corpus is synced
+    and vectorized once and all JDs are scored in one sparse matrix product
+    (or one postings walk each, for method="bm25"; one dense product each
+    for method="semantic").
+    Returns (scores, resume_names, rankings): an N x M array of cosine
+    similarities (JD x resume), the M resume names, and a dict mapping each
+    jobfile to its ranked ResultElements.
+    """
+    report = progress or (lambda **counts: None)
+    if jobfiles is None:
+        jobfiles = [job.name for job in job_descriptions()]
+    index = _sync_index(report)
+
+    jobs = [_read_job(jobfile) for jobfile in jobfiles]
+    with _ingest_lock:
+        scores, keys = _score(index, jobs, method)
+    resume_names = [os.path.basename(key) for key in keys]
+    report(files_scored=len(resume_names))
+
+    rankings = {jobfile: _rank(row, resume_names) for jobfile, row in zip(jobfiles, scores)}
+    return scores, resume_names, rankings
+
+
 if __name__ == "__main__":
-    print("Run via Flask — not standalone.")
+    # Headless screening (see cli.py for the options)
+    from cli import main
+    sys.exit(main())
@@ -1,9 +1,13 @@
 import glob
 import os
 import warnings
-import PyPDF2
 from collections import Counter
 from math import sqrt
+
+from catalog import get_catalog
+from scoring import CountMatrix, top_k
+from text_cache import cached_text
+from watcher import find_watcher
 # The following imports and associated logic have been removed or replaced 
 # to eliminate dependencies that cause ModuleNotFound errors in this environment.
 # Removed: textract, gensim, sklearn, nltk, inflect, autocorrect
@@ -73,6 +77,17 @@ def calculate_cosine_similarity(vec1_counts, vec2_counts):
     # Cosine Similarity Formula
     return dot_product / (magnitude1 * magnitude2)
 
+_count_matrix = (None, None)
+
+def get_count_matrix(texts):
+    """CountMatrix of the tokenized texts, rebuilt only when the texts change."""
+    global _count_matrix
+    key = tuple((len(text), hash(text)) for text in texts)
+    if _count_matrix[0] != key:
+        counters = (tokenize_and_count(text, STOP_WORDS) for text in texts)
+        _count_matrix = (key, CountMatrix.from_counters(counters))
+    return _count_matrix[1]
+
 # --- End Custom Logic ---
 
 def getfilepath(loc):
@@ -82,10 +97,14 @@ def getfilepath(loc):
     return temp
 
 
-def res(jobfile):
+
+
+def res(jobfile, k=None, offset=0):
     """
     Core function to screen resumes against a job description using
     custom Count Vectorization and Cosine Similarity.
+
+    k/offset return one page of the ranking instead of every match.
     
     NOTE: Only PDF files are supported due to lack of dependencies for .doc/.docx formats.
     """
@@ -101,8 +120,15 @@ def res(jobfile):
         print("Error: Could not find 'Original_Resumes' directory.")
         return []
 
-    for file in glob.glob('**/*.pdf', recursive=True):
-        LIST_OF_FILES_PDF.append(file)
+    watcher = find_watcher('.')
+    if watcher is not None:
+        # The background watcher keeps the documents catalog current; one indexed lookup, no directory scan.
+        # Until its first pass has synced the catalog the lookup would come back empty, so wait for it.
+        watcher.ready.wait()
+        LIST_OF_FILES_PDF = [os.path.relpath(p, watcher.root) for p in get_catalog().paths('resume', fmt='pdf')]
+    else:
+        for file in glob.glob('**/*.pdf', recursive=True):
+            LIST_OF_FILES_PDF.append(file)
         
     LIST_OF_FILES = LIST_OF_FILES_PDF 
     
@@ -116,20 +142,8 @@ def res(jobfile):
         
         try:
             print("Processing PDF", nooo, ":", i)
-            page_content_combined = ''
-            with open(i,'rb') as pdf_file:
-                # Use PyPDF2.PdfReader (updated from deprecated PdfFileReader)
-                read_pdf = PyPDF2.PdfReader(pdf_file)
-                # Note: PyPDF2.PdfReader uses len(reader.pages) instead of getNumPages()
-                number_of_pages = len(read_pdf.pages)
-                
-                for page in read_pdf.pages:
-                    page_content = page.extract_text()
-                    if page_content:
-                        page_content_combined += page_content.replace('\n', ' ')
-                
-                Resumes.append(page_content_combined)
-                
+            Resumes.append(cached_text(i))
+
         except Exception as e: 
             print(f"Error reading PDF {i}: {e}. Skipping this file.")
             Resumes.append("") # Add empty string to maintain list length
@@ -156,48 +170,34 @@ def res(jobfile):
         print("Error: Job Description has no meaningful content for comparison.")
         return []
     
-    # Resume Vectors
-    resume_vectors_counts = []
-    for resume_text in Resumes:
-        # Generate count vector for the resume text
-        resume_vectors_counts.append(tokenize_and_count(resume_text, STOP_WORDS))
+    # Resume Vectors (token ids, CSR matrix and row norms; reused while the texts are unchanged)
+    corpus = get_count_matrix(Resumes)
 
+    # 5. Calculate Scores (Cosine Similarity), the whole corpus in one sparse product
+    Ordered_list_Resume_Score = corpus.cosine(jd_vector_counts).tolist()
 
-    # 5. Calculate Scores (Cosine Similarity)
-    for idx, resume_vector in enumerate(resume_vectors_counts):
-        try:
-            score = calculate_cosine_similarity(jd_vector_counts, resume_vector)
-            Ordered_list_Resume_Score.append(score)
-            
-        except Exception as e:
-            # Append a very low score for failed calculations (pushes to the end)
-            Ordered_list_Resume_Score.append(-1.0) 
-            print(f"Error during Cosine Similarity calculation for resume {Ordered_list_Resume[idx]}: {e}")
 
+    # 6. Select and Return Results
+    # Only resumes with a similarity score are ranked; of those, only the requested
+    # page is selected (partial selection, highest score first) and materialized.
+    matched = [idx for idx, score in enumerate(Ordered_list_Resume_Score) if score > 0.0]
+    matched_scores = [Ordered_list_Resume_Score[idx] for idx in matched]
 
-    # 6. Sort and Return Results
-    # We sort in DESCENDING order of score, as higher cosine similarity means a better match.
-    
-    zipped_lists = sorted(
-        zip(Ordered_list_Resume_Score, Ordered_list_Resume), 
-        key=lambda x: x[0], 
-        reverse=True # Highest score first
-    )
-    
     flask_return = []
-    rank_counter = 1
-    for score, filename in zipped_lists:
-        if score > 0.0: # Only include resumes with a similarity score
-            name = getfilepath(filename)
-            # Convert score (0.0 to 1.0) to a percentage (0.0% to 100.0%)
-            score_percent = round(score * 100, 2)
-            res = ResultElement(rank_counter, name, score_percent) 
-            flask_return.append(res)
-            print(f"Rank {rank_counter} :\t {res.filename} (Score: {res.score}%)")
-            rank_counter += 1
-        
+    for rank_counter, pos in enumerate(top_k(matched_scores, k, offset), offset + 1):
+        idx = matched[pos]
+        name = getfilepath(Ordered_list_Resume[idx])
+        # Convert score (0.0 to 1.0) to a percentage (0.0% to 100.0%)
+        score_percent = round(Ordered_list_Resume_Score[idx] * 100, 2)
+        res = ResultElement(rank_counter, name, score_percent)
+        flask_return.append(res)
+        print(f"Rank {rank_counter} :\t {res.filename} (Score: {res.score}%)")
+
     return flask_return
 
 
 if __name__ == '__main__':
-    pass 
+    # Headless screening (see cli.py for the options)
+    import sys
+    from cli import main
+    sys.exit(main()) 
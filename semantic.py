@@ -0,0 +1,167 @@
+import json
+import os
+
+import numpy as np
+
+from mmap_store import drop_generations, locked, map_array, write_array
+from scoring import top_k
+
+# --- Config ---
+SEMANTIC_DIMS = int(os.environ.get("SEMANTIC_DIMS", 128))  # LSA components
+SEMANTIC_NPROBE = int(os.environ.get("SEMANTIC_NPROBE", 16))  # IVF lists scanned per query
+RERANK_FACTOR = 4  # int8 candidates re-scored in float32 per requested result
+
+_ARRAYS = {
+    "term_vectors": np.float32,  # vocabulary x dims: each term's LSA direction
+    "vectors": np.float32,  # documents x dims, l2-normalised
+    "codes": np.int8,  # the same vectors int8-quantised, in inverted-list order
+    "scales": np.float32,  # per-code dequantisation scale
+    "centroids": np.float32,  # lists x dims
+    "list_offsets": np.int64,  # list -> its range in codes/list_docs
+    "list_docs": np.int64,  # position in list order -> document row
+}
+
+
+class SemanticIndex:
+    """
+    LSA embeddings of the corpus with an IVF (inverted file) ANN index.
+
+    Documents are embedded by a truncated SVD of the l2-normalised TF-IDF
+    matrix, so resumes that use different words for the same skills still
+    land close together; a query is embedded by summing the LSA directions
+    of its own terms. For approximate search the embeddings are clustered
+    into about sqrt(N) lists by k-means and stored int8-quantised in list
+    order: a query scans only the nprobe lists with the nearest centroids,
+    then re-scores the best candidates with the float32 vectors. Arrays are
+    memory-mapped and named after the corpus fingerprint, like ImpactIndex.
+    """
+
+    def __init__(self, path, corpus, dims, arrays):
+        self.path = path
+        self.corpus = corpus
+        self.dims = dims
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    # --- persistence ---
+
+    @classmethod
+    def build(cls, weights, path, corpus, dims=SEMANTIC_DIMS, seed=0):
+        """Fit LSA + IVF on a documents x terms TF-IDF matrix, write it to path and load it."""
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+
+        n_docs, n_terms = weights.shape
+        dims = max(0, min(dims, n_docs - 1, n_terms - 1))
+        if dims:
+            svd = TruncatedSVD(n_components=dims, random_state=seed)
+            vectors = svd.fit_transform(weights).astype(np.float32)
+            term_vectors = svd.components_.T.astype(np.float32)
+        else:
+            vectors = np.zeros((n_docs, 0), dtype=np.float32)
+            term_vectors = np.zeros((n_terms, 0), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        vectors /= np.where(norms > 0, norms, 1.0)[:, None]
+
+        # --- IVF: k-means lists, members stored contiguously ---
+        n_lists = max(1, int(np.sqrt(n_docs)))
+        if dims and n_docs > n_lists:
+            kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=seed, n_init=3, batch_size=4096)
+            assignment = kmeans.fit_predict(vectors)
+            centroids = kmeans.cluster_centers_.astype(np.float32)
+        else:
+            assignment = np.zeros(n_docs, dtype=np.int64)
+            centroids = vectors.mean(axis=0, keepdims=True) if n_docs else np.zeros((1, dims), dtype=np.float32)
+            n_lists = 1
+        list_docs = np.argsort(assignment, kind="stable").astype(np.int64)
+        list_offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=n_lists)))).astype(np.int64)
+
+        # --- int8 codes with one scale per vector ---
+        ordered = vectors[list_docs]
+        peak = np.abs(ordered).max(axis=1) if dims else np.zeros(n_docs, dtype=np.float32)
+        scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+        codes = np.round(ordered / scales[:, None]).astype(np.int8)
+
+        arrays = {
+            "term_vectors": term_vectors,
+            "vectors": vectors,
+            "codes": codes,
+            "scales": scales,
+            "centroids": centroids.astype(np.float32),
+            "list_offsets": list_offsets,
+            "list_docs": list_docs,
+        }
+        with locked(path):
+            for name, array in arrays.items():
+                write_array(os.path.join(path, f"{name}.{corpus}.bin"), array.astype(_ARRAYS[name], copy=False))
+            meta_tmp = os.path.join(path, "meta.json.tmp")
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump({"corpus": corpus, "dims": dims, "n_docs": n_docs, "n_terms": n_terms}, f)
+            os.replace(meta_tmp, os.path.join(path, "meta.json"))
+            drop_generations(path, corpus)
+            return cls._open(path)
+
+    @classmethod
+    def load(cls, path):
+        """The index stored at path, or None if there is none yet."""
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return None
+        with locked(path, shared=True):
+            return cls._open(path)
+
+    @classmethod
+    def _open(cls, path):
+        """Map the generation meta.json points at (hold locked(path) around it)."""
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        corpus, dims = meta["corpus"], meta["dims"]
+        arrays = {
+            name: map_array(os.path.join(path, f"{name}.{corpus}.bin"), dtype)
+            for name, dtype in _ARRAYS.items()
+        }
+        rows = {
+            "term_vectors": meta["n_terms"],
+            "vectors": meta["n_docs"],
+            "codes": meta["n_docs"],
+            "centroids": len(arrays["list_offsets"]) - 1,
+        }
+        for name, n in rows.items():
+            arrays[name] = arrays[name].reshape(n, dims)
+        return cls(path, corpus, dims, arrays)
+
+    # --- queries ---
+
+    def embed(self, query):
+        """l2-normalised embedding of a 1 x vocabulary sparse TF-IDF query vector."""
+        query = query.tocsr()
+        known = query.indices < len(self.term_vectors)
+        embedding = query.data[known].astype(np.float32) @ self.term_vectors[query.indices[known]]
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    def scores(self, embedding):
+        """Exact cosine similarity of an embedding against every document."""
+        return self.vectors @ embedding
+
+    def top_k(self, embedding, k, offset=0, nprobe=SEMANTIC_NPROBE):
+        """
+        (document rows, cosine scores) of the approximately offset-th ..
+        (offset+k-1)-th closest documents, scanning only the nprobe nearest
+        lists.
+        """
+        depth = offset + k
+        n_lists = len(self.centroids)
+        probe = top_k(self.centroids @ embedding, min(nprobe, n_lists))
+        starts, ends = self.list_offsets[probe], self.list_offsets[probe + 1]
+        lengths = ends - starts
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(int(lengths.sum()))
+        # Coarse pass over the int8 codes, then re-score the best in float32
+        approx = (self.codes[positions].astype(np.float32) @ embedding) * self.scales[positions]
+        shortlist = positions[top_k(approx, depth * RERANK_FACTOR)]
+        rows = self.list_docs[shortlist]
+        exact = self.vectors[rows] @ embedding
+        order = top_k(exact, k, offset)
+        return rows[order], exact[order]
@@ -0,0 +1,145 @@
+import os
+from collections import Counter, deque
+
+from config import BASE_DIR
+
+SKILLS_PATH = os.environ.get("SKILLS_PATH", os.path.join(BASE_DIR, "skills.txt"))
+
+# Characters kept when folding text; everything else becomes a word break.
+# '+', '#' and '.' inside a word keep skills like "c++", "c#" and "asp.net" intact.
+_KEEP = set("+#")
+
+
+def fold(text):
+    """
+    Case/punctuation-fold text for matching.
+
+    Returns (folded, offsets): folded is lowercase with runs of punctuation
+    and whitespace collapsed to a single space, and offsets[i] is the index
+    in text of folded[i], so matches can be mapped back to the original.
+    """
+    folded = []
+    offsets = []
+    n = len(text)
+    for i, ch in enumerate(text):
+        ch = ch.lower()
+        keep = ch.isalnum() or ch in _KEEP
+        if not keep and ch == "." and folded and folded[-1] != " " and i + 1 < n and text[i + 1].isalnum():
+            keep = True
+        if keep:
+            folded.append(ch)
+            offsets.append(i)
+        elif folded and folded[-1] != " ":
+            folded.append(" ")
+            offsets.append(i)
+    if folded and folded[-1] == " ":
+        folded.pop()
+        offsets.pop()
+    return "".join(folded), offsets
+
+
+def load_skills(path):
+    """Read a skills list: one skill per line (or comma separated); '#' starts a comment line."""
+    skills = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.lstrip().startswith("#"):
+                continue
+            skills.extend(s.strip() for s in line.split(","))
+    return [s for s in skills if s]
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skills list.
+
+    Built once, it finds every skill (including multi-word ones such as
+    "machine learning") in a single linear pass over a resume. Matching is
+    case and punctuation insensitive and only whole words/phrases count, so
+    "java" does not fire inside "javascript".
+    """
+
+    def __init__(self, skills):
+        self.skills = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        seen = {}
+        for skill in skills:
+            key = fold(skill)[0]
+            if not key or key in seen:
+                continue
+            seen[key] = len(self.skills)
+            self.skills.append(skill)
+            self._insert(key, seen[key])
+        self._build_links()
+
+    def _insert(self, key, skill_id):
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((skill_id, len(key)))
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if self._goto[f].get(ch) != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self.skills)
+
+    def iter_matches(self, text):
+        """Yield (skill, start, end) for every whole-word hit, offsets into text."""
+        folded, offsets = fold(text)
+        n = len(folded)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            if i + 1 < n and folded[i + 1] != " ":
+                continue
+            for skill_id, length in out[node]:
+                start = i - length + 1
+                if start > 0 and folded[start - 1] != " ":
+                    continue
+                yield self.skills[skill_id], offsets[start], offsets[i] + 1
+
+    def find(self, text):
+        """Dict of skill -> list of (start, end) offsets, for skills that occur."""
+        hits = {}
+        for skill, start, end in self.iter_matches(text):
+            hits.setdefault(skill, []).append((start, end))
+        return hits
+
+    def counts(self, text):
+        """Counter of skill -> number of occurrences."""
+        return Counter(skill for skill, _, _ in self.iter_matches(text))
+
+
+_matcher = None
+
+
+def get_matcher():
+    """SkillMatcher over SKILLS_PATH, built once per process."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_skills(SKILLS_PATH))
+    return _matcher
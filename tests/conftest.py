@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+
+# Point every cache and database at a scratch directory before any module
+# reads config.py, so the suite never touches .cache/ or users.db.
+_scratch = tempfile.mkdtemp(prefix="prism-tests-")
+os.environ.setdefault("PRISM_CACHE_DIR", os.path.join(_scratch, "cache"))
+os.environ.setdefault("PRISM_DB_PATH", os.path.join(_scratch, "users.db"))
+os.environ.setdefault("WATCH_RESUMES", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """
+    A fresh app working directory (Original_Resumes/, Job_Description/)
+    with its own screening index, dedup state, JD cache and catalog.
+    """
+    import catalog
+    import screen
+    from jd_cache import JDCache
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Original_Resumes").mkdir()
+    (tmp_path / "Job_Description").mkdir()
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(screen, "CACHE_DIR", str(cache))
+    for name in ("_index", "_dedup", "_jd_cache"):
+        monkeypatch.setattr(screen, name, None)
+    monkeypatch.setattr(screen, "JDCache",
+                        lambda preprocess, config: JDCache(preprocess, config, path=str(cache / "jd_cache.db")))
+    monkeypatch.setattr(catalog, "_catalog", catalog.Catalog(str(tmp_path / "catalog.db")))
+    return tmp_path
+
+
+def write_docs(directory, docs):
+    """Write {name: text} as files under directory; returns their paths."""
+    paths = []
+    for name, text in docs.items():
+        path = directory / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    return paths
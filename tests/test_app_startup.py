@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each check runs in a fresh interpreter: this process has long since
+# imported the scoring stack through other tests.
+CHECK = """
+import json, sys
+import app
+heavy = [m for m in ("screen", "search", "resume_index", "sklearn", "scipy", "PyPDF2", "docx2txt") if m in sys.modules]
+before = app.app.test_client().get("/healthz").get_json()
+app.preload()
+after = app.app.test_client().get("/healthz").get_json()
+print(json.dumps({"heavy": heavy, "before": before, "after": after}))
+"""
+
+
+def run(code, tmp_path, **env):
+    proc = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                          env={**os.environ, "PYTHONPATH": ROOT, **env}, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_healthz_answers_without_the_scoring_stack(tmp_path):
+    result = run(CHECK, tmp_path, PRELOAD_SCORING="0")
+    assert result["heavy"] == []
+    assert result["before"] == {"status": "ok", "scoring_loaded": False}
+    assert result["after"]["scoring_loaded"] is True
+
+
+def test_preload_scoring_loads_it_at_import(tmp_path):
+    result = run(CHECK, tmp_path, PRELOAD_SCORING="1")
+    assert "screen" in result["heavy"]
+    assert result["before"]["scoring_loaded"] is True
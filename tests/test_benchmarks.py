@@ -0,0 +1,53 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "benchmarks", "pipeline.py")
+
+# benchmarks/ is a directory of scripts, not a package
+_spec = importlib.util.spec_from_file_location("pipeline_benchmark", SCRIPT)
+pipeline = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pipeline)
+
+
+def test_synthetic_corpus_has_every_format_and_extracts(tmp_path):
+    from text_cache import extract_document
+    pipeline.make_corpus(str(tmp_path), 12, {"pdf": 1, "docx": 1, "txt": 1}, n_jobs=2, words_per_resume=60)
+    resumes = sorted(os.listdir(tmp_path / "Original_Resumes"))
+    assert len(resumes) == 12
+    assert {name.rsplit(".", 1)[1] for name in resumes} == {"pdf", "docx", "txt"}
+    assert sorted(os.listdir(tmp_path / "Job_Description")) == ["job_0.txt", "job_1.txt"]
+    for name in resumes:
+        assert len(extract_document(str(tmp_path / "Original_Resumes" / name)).split()) >= 30
+
+
+def test_parse_mix():
+    assert pipeline.parse_mix("pdf=0.5,txt") == {"pdf": 0.5, "txt": 1.0}
+    with pytest.raises(Exception):
+        pipeline.parse_mix("odt=1")
+
+
+def test_summary_percentiles():
+    summary = pipeline._summary([0.001 * n for n in range(1, 21)], docs=40)
+    assert (summary["samples"], summary["p50_ms"], summary["p95_ms"], summary["docs"]) == (20, 10.5, 19.0, 40)
+    assert summary["throughput_docs_s"] == round(40 / 0.21, 1)
+
+
+def test_small_run_reports_every_stage(tmp_path):
+    out = str(tmp_path / "results.json")
+    proc = subprocess.run([sys.executable, SCRIPT, "--sizes", "12", "--repeat", "1", "--out", out],
+                          cwd=tmp_path, capture_output=True, text=True, timeout=300)
+    assert proc.returncode == 0, proc.stderr
+    with open(out, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    stages = results["sizes"]["12"]
+    for name in ("tokenize.tokenize_and_count", "vectorize.tfidf_fit_transform", "rank.top_k_50"):
+        assert name in stages
+    assert any(name.startswith("screen.res") for name in stages)
+    assert any(name.startswith("app.process") for name in stages)
+    assert all(stage["p50_ms"] >= 0 and stage["peak_rss_mb"] > 0 for stage in stages.values())
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+from scipy import sparse
+
+from bm25 import BM25
+from resume_index import ResumeIndex
+
+
+def okapi(counts, query, k1, b):
+    """Textbook Okapi BM25 (Lucene idf) over a dense documents x terms array."""
+    n_docs = counts.shape[0]
+    lengths = counts.sum(axis=1)
+    avgdl = lengths.mean()
+    scores = np.zeros(n_docs)
+    for term, qtf in query.items():
+        df = np.count_nonzero(counts[:, term])
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        tf = counts[:, term]
+        scores += qtf * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths / avgdl))
+    return scores
+
+
+def test_matches_the_textbook_formula():
+    rng = np.random.default_rng(5)
+    counts = rng.poisson(0.4, size=(60, 25)).astype(float)
+    query = {1: 1, 4: 2, 7: 1, 24: 1}
+    for k1, b in ((1.5, 0.75), (1.2, 0.0), (2.0, 1.0)):
+        bm25 = BM25(sparse.csr_matrix(counts), k1=k1, b=b)
+        assert np.allclose(bm25.scores(query), okapi(counts, query, k1, b), rtol=1e-5)
+
+
+def test_unknown_terms_and_empty_corpus():
+    bm25 = BM25(sparse.csr_matrix(np.ones((3, 2))))
+    assert not bm25.scores({5: 1}).any()
+    assert len(BM25(sparse.csr_matrix((0, 4))).scores({0: 1})) == 0
+
+
+def test_index_ranks_by_bm25(tmp_path):
+    index = ResumeIndex(str(tmp_path / "index"))
+    index.add_many([
+        ("a", "python python python developer", None),
+        ("b", "python developer with java spring hibernate maven gradle experience", None),
+        ("c", "java developer", None),
+    ])
+    scores = index.bm25_scores("python")
+    assert scores[0] > scores[1] > scores[2] == 0
+    assert np.allclose(index.bm25_scores("python", keys=["b", "a"]), scores[[1, 0]])
@@ -0,0 +1,127 @@
+import importlib.util
+import os
+import sqlite3
+import threading
+
+import app
+import screen
+import search
+import watcher
+from catalog import DUPLICATE, EMPTY, INDEXED, PENDING, Catalog
+from conftest import write_docs
+
+
+def test_sync_tracks_new_changed_and_deleted_files(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+    assert catalog.sync("resume", {"a.pdf": [1, 10], "b.docx": [2, 20]}) == ["a.pdf", "b.docx"]
+    catalog.record([("a.pdf", "hash-a", INDEXED, 12, 3), ("b.docx", "hash-b", INDEXED, 7, 3)])
+    assert catalog.sync("resume", {"a.pdf": [1, 10], "b.docx": [2, 21], "c.txt": [3, 30]}) == ["b.docx", "c.txt"]
+    assert catalog.statuses("resume") == {"a.pdf": INDEXED, "b.docx": PENDING, "c.txt": PENDING}
+    assert catalog.sync("resume", {"c.txt": [3, 30]}) == []
+    assert catalog.fingerprints("resume") == {"c.txt": [3, 30]}
+    assert catalog.statuses("jd") == {}
+
+
+def test_listings_and_counts(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+    catalog.sync("resume", {f"r{n}.{'pdf' if n % 2 else 'txt'}": [n, n] for n in range(6)})
+    catalog.sync("jd", {"jd.txt": [1, 1]})
+    catalog.record([("r1.pdf", "h", INDEXED, 5, 1), ("r2.txt", "h", EMPTY, 0, 1)])
+    assert catalog.paths("resume", fmt="pdf") == ["r1.pdf", "r3.pdf", "r5.pdf"]
+    assert catalog.paths("resume", fmt="pdf", status=PENDING) == ["r3.pdf", "r5.pdf"]
+    page = catalog.listing(kind="resume", limit=2, offset=1)
+    assert [row["path"] for row in page] == ["r1.pdf", "r2.txt"]
+    assert (page[0]["content_hash"], page[0]["token_count"], page[0]["index_version"]) == ("h", 5, 1)
+    assert catalog.counts() == {"resume": {PENDING: 4, INDEXED: 1, EMPTY: 1}, "jd": {PENDING: 1}}
+    assert catalog.counts("jd") == {PENDING: 1}
+
+
+def test_lookups_use_the_indexes(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    Catalog(path)
+    conn = sqlite3.connect(path)
+    for sql in ("SELECT path FROM documents WHERE kind = 'resume' AND format = 'pdf' ORDER BY path",
+                "SELECT path FROM documents WHERE kind = 'resume' AND status = 'pending' ORDER BY path"):
+        plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+        assert "USING" in plan and "INDEX" in plan and "TEMP B-TREE" not in plan
+    conn.close()
+
+
+def test_screening_records_every_outcome(workspace):
+    write_docs(workspace / "Original_Resumes", {
+        "alice.txt": "Python developer. Flask, SQL and REST APIs.",
+        "copy.txt": "Python developer. Flask, SQL and REST APIs.",
+        "blank.txt": "",
+        "bob.txt": "Java engineer. Spring Boot and SQL.",
+    })
+    write_docs(workspace / "Job_Description", {"backend.txt": "Python developer with Flask and SQL."})
+    screen.res("backend.txt")
+    statuses = {os.path.basename(path): status for path, status in screen.get_catalog().statuses("resume").items()}
+    assert statuses["bob.txt"] == INDEXED
+    assert statuses["blank.txt"] == EMPTY
+    assert sorted([statuses["alice.txt"], statuses["copy.txt"]]) == [DUPLICATE, INDEXED]
+    screen.job_descriptions()
+    assert list(screen.get_catalog().statuses("jd").values()) == [INDEXED]
+
+
+def test_init_db_creates_every_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "DB_PATH", str(tmp_path / "users.db"))
+    app.init_db()
+    conn = sqlite3.connect(str(tmp_path / "users.db"))
+    tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    assert {"users", "otps", "documents"} <= tables
+
+
+def test_search_waits_for_the_watchers_first_pass(workspace):
+    spec = importlib.util.spec_from_file_location("pipeline_benchmark", os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "pipeline.py"))
+    pipeline = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pipeline)
+    pipeline.write_pdf(str(workspace / "Original_Resumes" / "alice.pdf"), "Python developer with Flask and SQL.")
+    write_docs(workspace / "Job_Description", {"backend.txt": "Python developer with Flask and SQL."})
+
+    release = threading.Event()
+
+    def on_change(files):
+        release.wait(10)  # the first pass is slow: the catalog is still empty
+        screen.get_catalog().sync("resume", files)
+
+    resumes = watcher.DirectoryWatcher(str(workspace / "Original_Resumes"), on_change, suffixes=(".pdf",)).start()
+    try:
+        results = []
+        thread = threading.Thread(target=lambda: results.extend(search.res("backend.txt")))
+        thread.start()
+        thread.join(0.3)
+        assert thread.is_alive()
+        release.set()
+        thread.join(10)
+        assert [r.filename for r in results] == ["alice.pdf"]
+    finally:
+        release.set()
+        resumes.stop()
+
+
+def test_home_lists_jds_from_the_catalog_while_watched(workspace, monkeypatch):
+    jobs_dir = str(workspace / "Job_Description")
+    monkeypatch.setattr(app, "JOB_FOLDER", jobs_dir)
+    write_docs(workspace / "Job_Description", {"backend.txt": "Python", "data.txt": "Pandas"})
+
+    def names():
+        return [os.path.basename(path) for path in app.job_paths()]
+
+    assert names() == ["backend.txt", "data.txt"]  # no watcher: the folder is scanned
+
+    fake = type("Watcher", (), {"ready": threading.Event()})()
+    monkeypatch.setitem(watcher._running, os.path.abspath(jobs_dir), fake)
+    screen.get_catalog().sync("jd", {os.path.join(jobs_dir, "catalogued.txt"): [1, 1]})
+    assert names() == ["backend.txt", "data.txt"]  # first pass still running
+    fake.ready.set()
+    assert names() == ["catalogued.txt"]  # one catalog lookup, no scan
+
+    # Another process owns the watchers: its catalog rows, unless it has recorded none yet
+    monkeypatch.delitem(watcher._running, os.path.abspath(jobs_dir))
+    monkeypatch.setattr(watcher, "watched_elsewhere", lambda path: True)
+    assert names() == ["catalogued.txt"]
+    screen.get_catalog().sync("jd", {})
+    assert names() == ["backend.txt", "data.txt"]
@@ -0,0 +1,109 @@
+import csv
+import json
+import os
+
+import pytest
+
+import cli
+from conftest import write_docs
+
+RESUMES = {
+    "alice.txt": "Python developer. Flask, SQL and REST APIs.",
+    "bob.txt": "Java engineer. Spring Boot and SQL.",
+    "carol.txt": "Data scientist. Python, numpy, pandas, machine learning.",
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    (tmp_path / "resumes").mkdir()
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    write_docs(tmp_path / "resumes", RESUMES)
+    jobs = write_docs(tmp_path / "a", {"backend.txt": "Python developer with Flask and SQL.",
+                                       "data.txt": "Data scientist for machine learning in Python."})
+    # Same basename as a/backend.txt, different directory and content
+    jobs += write_docs(tmp_path / "b", {"backend.txt": "Java engineer with Spring Boot."})
+    return tmp_path, jobs
+
+
+def run(tmp_path, *args):
+    return cli.main([*args, "--resumes", str(tmp_path / "resumes"), "--workers", "1",
+                     "--index", str(tmp_path / "index")])
+
+
+def read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("method", ["tfidf", "bm25", "semantic"])
+def test_ranks_every_resume_per_job(corpus, method):
+    tmp_path, jobs = corpus
+    out = str(tmp_path / "ranking.jsonl")
+    assert run(tmp_path, *jobs, "--method", method, "--out", out) == 0
+    rows = read_jsonl(out)
+    assert len(rows) == len(jobs) * len(RESUMES)
+    assert [row["rank"] for row in rows[:3]] == [1, 2, 3]
+    assert not os.path.exists(out + ".checkpoint.json")
+    if method != "semantic":  # LSA on three resumes is too coarse to rank by
+        assert rows[0]["resume"] == "alice.txt"
+        assert rows[-3]["resume"] == "bob.txt"
+
+
+def test_csv_and_top_k(corpus):
+    tmp_path, jobs = corpus
+    out = str(tmp_path / "ranking.csv")
+    run(tmp_path, jobs[0], "--top-k", "2", "--out", out)
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["job", "rank", "resume", "score"]
+    assert [row[:2] for row in rows[1:]] == [["backend.txt", "1"], ["backend.txt", "2"]]
+    assert rows[1][2] == "alice.txt"
+
+
+def test_resume_continues_an_interrupted_run(corpus, monkeypatch):
+    tmp_path, jobs = corpus
+    out = str(tmp_path / "ranking.jsonl")
+    score_jobs = cli.score_jobs
+
+    def interrupted(index, todo, *args):
+        for n, item in enumerate(score_jobs(index, todo, *args)):
+            if n == 2:
+                raise KeyboardInterrupt
+            yield item
+
+    monkeypatch.setattr(cli, "score_jobs", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, *jobs, "--out", out)
+    with open(out + ".checkpoint.json", "r", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["done"] == [os.path.abspath(p) for p in jobs[:2]]
+
+    monkeypatch.setattr(cli, "score_jobs", score_jobs)
+    run(tmp_path, *jobs, "--out", out, "--resume")
+    rows = read_jsonl(out)
+    assert len(rows) == len(jobs) * len(RESUMES)
+    # Both backend.txt JDs are written once each, the one in b/ ranking bob first
+    backend = [row for row in rows if row["job"] == "backend.txt" and row["rank"] == 1]
+    assert [row["resume"] for row in backend] == ["alice.txt", "bob.txt"]
+
+
+def test_resume_refuses_a_checkpoint_of_another_run(corpus):
+    tmp_path, jobs = corpus
+    out = str(tmp_path / "ranking.jsonl")
+    cli.save_checkpoint(out + ".checkpoint.json", {"settings": {"checkpoint": 1}, "done": [], "offset": 0})
+    with pytest.raises(SystemExit):
+        run(tmp_path, *jobs, "--out", out, "--resume")
+
+
+def test_index_is_reused_between_runs(corpus, monkeypatch):
+    tmp_path, jobs = corpus
+    run(tmp_path, jobs[0], "--out", str(tmp_path / "first.jsonl"))
+    extracted = []
+    import extract_pool
+    extract_many = extract_pool.extract_many
+    monkeypatch.setattr(extract_pool, "extract_many", lambda keys, **kw: extracted.extend(keys) or extract_many(keys, **kw))
+    write_docs(tmp_path / "resumes", {"dave.txt": "Graphic designer."})
+    run(tmp_path, jobs[0], "--out", str(tmp_path / "second.jsonl"))
+    assert [os.path.basename(p) for p in extracted] == ["dave.txt"]
@@ -0,0 +1,87 @@
+import gc
+import multiprocessing
+import sqlite3
+import threading
+
+import pytest
+
+from db import Database, get_database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "app.db"))
+    database.execute("CREATE TABLE items (name TEXT UNIQUE)")
+    yield database
+    database.close()
+
+
+def test_one_connection_per_thread(db):
+    main = db.connection()
+    assert db.connection() is main
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main
+    assert db.query_one("PRAGMA journal_mode") == ("wal",)
+
+
+def test_connection_closes_when_its_thread_exits(db):
+    opened = []
+    thread = threading.Thread(target=lambda: opened.append(db.connection()))
+    thread.start()
+    thread.join()
+    del thread
+    gc.collect()
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+def test_transaction_commits_or_rolls_back(db):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO items VALUES ('a')")
+        conn.execute("INSERT INTO items VALUES ('b')")
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO items VALUES ('c')")
+            conn.execute("INSERT INTO items VALUES ('a')")
+    with pytest.raises(sqlite3.IntegrityError):
+        db.executemany("INSERT INTO items VALUES (?)", [("d",), ("b",)])
+    assert db.query("SELECT name FROM items ORDER BY name") == [("a",), ("b",)]
+    assert not db.connection().in_transaction
+
+
+def test_writes_are_visible_to_other_connections(db):
+    db.execute("INSERT INTO items VALUES ('a')")
+    other = sqlite3.connect(db.path)
+    assert other.execute("SELECT COUNT(*) FROM items").fetchone() == (1,)
+    other.close()
+
+
+def _child_connection(db, queue):
+    queue.put(id(db.connection()) != queue.get() and db.query_one("SELECT COUNT(*) FROM items")[0])
+
+
+def test_forked_process_opens_its_own_connection(db):
+    db.execute("INSERT INTO items VALUES ('a')")
+    queue = multiprocessing.get_context("fork").Queue()
+    queue.put(id(db.connection()))
+    process = multiprocessing.get_context("fork").Process(target=_child_connection, args=(db, queue))
+    process.start()
+    process.join(30)
+    assert queue.get(timeout=5) == 1
+
+
+def test_close_and_reopen(db):
+    conn = db.connection()
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert db.query("SELECT COUNT(*) FROM items") == [(0,)]
+
+
+def test_one_database_per_path(tmp_path):
+    path = str(tmp_path / "shared.db")
+    assert get_database(path) is get_database(path)
+    assert get_database(path) is not get_database(str(tmp_path / "other.db"))
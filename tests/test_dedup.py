@@ -0,0 +1,84 @@
+import random
+
+from conftest import write_docs
+from dedup import Deduplicator, minhash, similarity
+
+WORDS = ("python java sql flask spring docker kubernetes aws react node data model team lead "
+         "design build ship scale test deploy monitor mentor review plan").split()
+
+
+def resume(seed, n=120):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def loader(paths):
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def fingerprints(paths):
+    return {path: [i, 0] for i, path in enumerate(paths)}
+
+
+def test_minhash_estimates_jaccard_similarity():
+    text = resume(1)
+    assert similarity(minhash(text), minhash(text)) == 1.0
+    assert similarity(minhash(text), minhash(resume(2))) < 0.5
+
+
+def test_exact_and_near_copies_collapse_to_one_candidate(tmp_path):
+    base = resume(1)
+    near = base.replace("python", "golang", 1)
+    paths = write_docs(tmp_path, {
+        "a.txt": base, "a_copy.txt": base, "a_edited.txt": near, "b.txt": resume(2),
+    })
+    dedup = Deduplicator(str(tmp_path / "dedup.db"))
+    assert dedup.update(fingerprints(paths), loader)
+    assert sorted(dedup.unique(paths)) == sorted([paths[0], paths[3]])
+    assert sorted(dedup.duplicates()[paths[0]]) == sorted(paths[1:3])
+
+
+def test_state_persists_and_only_new_files_are_read(tmp_path):
+    paths = write_docs(tmp_path, {"a.txt": resume(1), "b.txt": resume(2)})
+    Deduplicator(str(tmp_path / "dedup.db")).update(fingerprints(paths), loader)
+    dedup = Deduplicator(str(tmp_path / "dedup.db"))
+    paths += write_docs(tmp_path, {"c.txt": resume(3)})
+    read = []
+    dedup.update(fingerprints(paths), lambda keys: read.extend(keys) or loader(keys))
+    assert read == [paths[2]]
+    assert not dedup.update(fingerprints(paths), loader)
+
+
+def test_removing_the_canonical_copy_promotes_another(tmp_path):
+    text = resume(1)
+    paths = write_docs(tmp_path, {"a.txt": text, "b.txt": text})
+    dedup = Deduplicator(str(tmp_path / "dedup.db"))
+    dedup.update(fingerprints(paths), loader)
+    assert dedup.unique(paths) == [paths[0]]
+    dedup.update({paths[1]: [1, 0]}, loader)
+    assert dedup.unique([paths[1]]) == [paths[1]]
+
+
+def test_unreadable_files_are_retried(tmp_path):
+    paths = write_docs(tmp_path, {"a.txt": resume(1)})
+    dedup = Deduplicator(str(tmp_path / "dedup.db"))
+    dedup.update(fingerprints(paths), lambda keys: [None for _ in keys])
+    assert paths[0] not in dedup.docs
+    assert dedup.update(fingerprints(paths), loader)
+    assert paths[0] in dedup.docs
+
+
+def test_files_removed_since_the_scan_are_skipped(tmp_path):
+    paths = write_docs(tmp_path, {"a.txt": resume(1), "b.txt": resume(2)})
+    listed = fingerprints(paths)
+    dedup = Deduplicator(str(tmp_path / "dedup.db"))
+    (tmp_path / "b.txt").unlink()
+    dedup.update(listed, loader)
+    assert list(dedup.docs) == [paths[0]]
+    write_docs(tmp_path, {"b.txt": resume(2)})
+    assert dedup.update(listed, loader)
+    assert sorted(dedup.docs) == sorted(paths)
@@ -0,0 +1,60 @@
+import time
+
+import extract_pool
+from extract_pool import extract_many
+from text_cache import TextCache, extract_document
+
+
+def make_files(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"r{i}.txt"
+        path.write_text(f"resume number {i}")
+        paths.append(str(path))
+    return paths
+
+
+def slow_extract(path):
+    if "hang" in path:
+        time.sleep(60)
+    return extract_document(path)
+
+
+def test_texts_come_back_in_order(tmp_path):
+    paths = make_files(tmp_path, 12)
+    cache = TextCache(str(tmp_path / "text.db"))
+    texts = extract_many(paths, workers=3, min_batch=1, cache=cache)
+    assert texts == [f"resume number {i}" for i in range(12)]
+
+
+def test_second_pass_is_served_from_the_cache(tmp_path):
+    paths = make_files(tmp_path, 4)
+    cache = TextCache(str(tmp_path / "text.db"))
+    extract_many(paths, workers=1, cache=cache)
+    seen = []
+    extract_many(paths, workers=1, cache=cache, progress=seen.append)
+    assert cache.hits == 4
+    assert seen == [4]
+
+
+def test_unreadable_files_yield_none(tmp_path):
+    paths = make_files(tmp_path, 2) + [str(tmp_path / "missing.txt")]
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+    paths.append(str(tmp_path / "broken.pdf"))
+    texts = extract_many(paths, workers=2, min_batch=1, cache=TextCache(str(tmp_path / "text.db")))
+    assert texts[:2] == ["resume number 0", "resume number 1"]
+    assert texts[2:] == [None, None]
+
+
+def test_hung_files_time_out_without_stalling_the_rest(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract_pool, "extract_document", slow_extract)
+    paths = make_files(tmp_path, 6)
+    for i in range(3):
+        hung = tmp_path / f"hang{i}.txt"
+        hung.write_text(f"stuck {i}")
+        paths.append(str(hung))
+    start = time.monotonic()
+    texts = extract_many(paths, workers=3, timeout=1, min_batch=1, cache=TextCache(str(tmp_path / "text.db")))
+    assert time.monotonic() - start < 10  # the timeouts run side by side, not one after another
+    assert texts[:6] == [f"resume number {i}" for i in range(6)]
+    assert texts[6:] == [None, None, None]
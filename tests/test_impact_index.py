@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+import impact_index
+from bm25 import BM25
+from impact_index import ImpactIndex, _varbyte_decode, _varbyte_encode
+from scoring import top_k
+
+
+def test_varbyte_round_trip():
+    values = np.array([0, 1, 127, 128, 300, 2 ** 21, 2 ** 35 + 7], dtype=np.int64)
+    encoded, starts = _varbyte_encode(values)
+    assert _varbyte_decode(encoded).tolist() == values.tolist()
+    assert starts.tolist() == [0, 1, 2, 3, 5, 7, 11]
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(impact_index, "BLOCK_SIZE", 8)  # many blocks per term, so pruning has work to do
+
+
+def random_corpus(rng, n_docs, n_terms, density):
+    counts = sparse.random(n_docs, n_terms, density=density, format="csr", random_state=rng.integers(1 << 31))
+    counts.data = np.ceil(counts.data * 4)
+    return counts
+
+
+def test_scores_match_bm25(tmp_path, small_blocks):
+    rng = np.random.default_rng(1)
+    bm25 = BM25(random_corpus(rng, 300, 40, 0.1))
+    index = ImpactIndex.build(bm25, str(tmp_path / "impacts"), "c1")
+    query = {0: 1, 3: 2, 17: 1, 39: 1}
+    assert np.allclose(index.scores(query), bm25.scores(query), rtol=1e-5)
+
+
+def test_pruned_top_k_is_exact(tmp_path, small_blocks):
+    rng = np.random.default_rng(2)
+    for trial in range(15):
+        n_docs, n_terms = int(rng.integers(5, 800)), int(rng.integers(3, 60))
+        bm25 = BM25(random_corpus(rng, n_docs, n_terms, float(rng.uniform(0.01, 0.3))))
+        index = ImpactIndex.build(bm25, str(tmp_path / f"impacts{trial}"), f"c{trial}")
+        for _ in range(20):
+            terms = rng.choice(n_terms, size=int(rng.integers(1, min(n_terms, 6) + 1)), replace=False)
+            query = {int(t): int(rng.integers(1, 3)) for t in terms}
+            k, offset = int(rng.integers(1, 30)), int(rng.integers(0, 10))
+            full = index.scores(query)
+            docs, scores = index.top_k(query, k, offset)
+            assert docs.tolist() == top_k(full, k, offset).tolist()
+            assert np.allclose(scores, full[docs])
+
+
+def test_load_serves_the_saved_generation(tmp_path):
+    bm25 = BM25(random_corpus(np.random.default_rng(3), 50, 10, 0.2))
+    path = str(tmp_path / "impacts")
+    assert ImpactIndex.load(path) is None
+    ImpactIndex.build(bm25, path, "old")
+    built = ImpactIndex.build(bm25, path, "new")
+    loaded = ImpactIndex.load(path)
+    assert loaded.corpus == "new"
+    assert np.allclose(loaded.scores({1: 1}), built.scores({1: 1}))
+    assert not [name for name in (tmp_path / "impacts").iterdir() if ".old." in name.name]
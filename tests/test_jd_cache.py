@@ -0,0 +1,81 @@
+import json
+import os
+import sqlite3
+
+import screen
+from jd_cache import JDCache
+
+
+def counting_preprocess(calls):
+    def preprocess(path):
+        calls.append(path)
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return text[:10], {1: len(text)}, {"python": 1}, {2: len(text)}
+    return preprocess
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_preprocesses_once_per_file_version(tmp_path):
+    calls = []
+    cache = JDCache(counting_preprocess(calls), "cfg", path=str(tmp_path / "jd.db"))
+    jd = write(tmp_path / "jd.txt", "python developer", 10 ** 18)
+    job = cache.get(jd)
+    assert (job.name, job.summary, job.terms, job.skills, job.text_terms) == \
+        ("jd.txt", "python dev", {1: 16}, {"python": 1}, {2: 16})
+    assert cache.get(jd) is job
+    write(tmp_path / "jd.txt", "python developer, remote", 2 * 10 ** 18)
+    assert cache.get(jd).terms == {1: 24}
+    assert calls == [jd, jd]
+
+
+def test_entries_survive_a_restart_but_not_a_config_change(tmp_path):
+    calls = []
+    db = str(tmp_path / "jd.db")
+    jd = write(tmp_path / "jd.txt", "python developer", 10 ** 18)
+    JDCache(counting_preprocess(calls), "cfg", path=db).get(jd)
+    assert JDCache(counting_preprocess(calls), "cfg", path=db).get(jd).text_terms == {"2": 16}  # keys come back from JSON
+    JDCache(counting_preprocess(calls), "other", path=db).get(jd)
+    assert len(calls) == 2
+
+
+def test_old_caches_gain_text_terms_and_recompute(tmp_path):
+    db = str(tmp_path / "jd.db")
+    jd = write(tmp_path / "jd.txt", "python developer", 10 ** 18)
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE jds (path TEXT PRIMARY KEY, fingerprint TEXT, config TEXT,"
+                 " summary TEXT, terms TEXT, skills TEXT)")
+    conn.execute("INSERT INTO jds VALUES (?, ?, 'cfg', 'old', '{}', '{}')",
+                 (jd, json.dumps([16, 10 ** 18])))
+    conn.commit()
+    conn.close()
+    calls = []
+    cache = JDCache(counting_preprocess(calls), "cfg", path=db)
+    assert cache.get(jd).text_terms == {2: 16}
+    assert calls == [jd]
+
+
+def test_sync_holds_exactly_the_listed_files(tmp_path):
+    calls = []
+    cache = JDCache(counting_preprocess(calls), "cfg", path=str(tmp_path / "jd.db"))
+    a = write(tmp_path / "a.txt", "a", 10 ** 18)
+    b = write(tmp_path / "b.txt", "bb", 10 ** 18)
+    fingerprints = {a: [1, 10 ** 18], b: [2, 10 ** 18]}
+    assert cache.sync(fingerprints)
+    assert not cache.sync(fingerprints)
+    assert cache.sync({b: [2, 10 ** 18]})
+    assert [job.name for job in cache.listing()] == ["b.txt"]
+    assert cache.sync({b: [2, 10 ** 18], str(tmp_path / "gone.txt"): [1, 1]})  # vanished files are skipped
+    assert [job.name for job in cache.listing()] == ["b.txt"]
+
+
+def test_job_key_is_the_same_however_the_path_is_spelled(workspace):
+    key = screen.job_key("JD.txt")
+    assert key == os.path.join(screen.JOB_DIR, "JD.txt")
+    assert screen.job_key(os.path.join(screen.JOB_DIR, "JD.txt")) == key
+    assert screen.job_key(os.path.join("elsewhere", "uploads", "JD.txt")) == key
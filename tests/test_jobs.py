@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from jobs import JobQueue
+
+
+def wait(queue, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(path=str(tmp_path / "jobs.db"), workers=1)
+
+
+def test_job_runs_and_records_its_result(queue):
+    def handler(params, progress):
+        progress(files_total=2)
+        progress(files_extracted=2, files_scored=2)
+        return {"sum": params["a"] + params["b"]}
+
+    queue.register("add", handler)
+    job = wait(queue, queue.submit("add", {"a": 1, "b": 2}))
+    assert job["status"] == "done"
+    assert job["result"] == {"sum": 3}
+    assert (job["files_total"], job["files_extracted"], job["files_scored"]) == (2, 2, 2)
+
+
+def test_failing_handler_marks_the_job_failed(queue):
+    def handler(params, progress):
+        raise RuntimeError("no resumes")
+
+    queue.register("broken", handler)
+    job = wait(queue, queue.submit("broken", {}))
+    assert job["status"] == "failed"
+    assert job["error"] == "no resumes"
+
+
+def test_unknown_kinds_and_ids(queue):
+    with pytest.raises(ValueError):
+        queue.submit("nope", {})
+    assert queue.get("missing") is None
+
+
+def test_another_process_queue_picks_up_work(tmp_path):
+    producer = JobQueue(path=str(tmp_path / "jobs.db"), workers=0)
+    producer.register("echo", lambda params, progress: params)
+    job_id = producer.submit("echo", {"x": 1})
+    assert producer.get(job_id)["status"] == "queued"
+    consumer = JobQueue(path=str(tmp_path / "jobs.db"), workers=1)
+    consumer.register("echo", lambda params, progress: params)
+    consumer.start()
+    assert wait(producer, job_id)["result"] == {"x": 1}
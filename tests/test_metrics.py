@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import metrics
+from metrics import Registry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return Registry(str(tmp_path / "metrics"))
+
+
+def test_counter_and_histogram_rendering(registry):
+    hits = registry.counter("hits_total", "Hits.")
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    hits.inc(cache="jd", result="hit")
+    hits.inc(2, cache="jd", result="hit")
+    latency.observe(0.05, span="x")
+    latency.observe(0.5, span="x")
+    latency.observe(5.0, span="x")
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP hits_total Hits.", "# TYPE hits_total counter"]
+    assert 'hits_total{cache="jd",result="hit"} 3' in lines
+    assert "# TYPE latency_seconds histogram" in lines
+    for line in ('latency_seconds_bucket{span="x",le="0.1"} 1', 'latency_seconds_bucket{span="x",le="1.0"} 2',
+                 'latency_seconds_bucket{span="x",le="+Inf"} 3', 'latency_seconds_count{span="x"} 3',
+                 'latency_seconds_sum{span="x"} 5.55'):
+        assert line in lines
+
+
+def test_label_values_are_escaped(registry):
+    registry.counter("c_total", "C.").inc(path='C:\\resumes\\"new"')
+    assert 'c_total{path="C:\\\\resumes\\\\\\"new\\""} 1' in registry.render()
+
+
+def test_render_adds_up_live_processes_and_drops_dead_ones(registry):
+    registry.counter("hits_total", "Hits.").inc(5)
+    other = Registry(registry.directory)
+    other.counter("hits_total", "Hits.").inc(2)
+    os.makedirs(registry.directory)
+    live = os.path.join(registry.directory, f"{os.getppid()}.json")
+    with open(live, "w", encoding="utf-8") as f:
+        json.dump(other.snapshot(), f)
+    dead_pid = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              capture_output=True, text=True).stdout.strip()
+    dead = os.path.join(registry.directory, f"{dead_pid}.json")
+    with open(dead, "w", encoding="utf-8") as f:
+        json.dump(other.snapshot(), f)
+    assert "hits_total 7" in registry.render().splitlines()
+    assert not os.path.exists(dead)
+    assert os.path.exists(live)
+
+
+def test_flush_is_throttled_and_skips_unchanged_snapshots(registry, monkeypatch):
+    monkeypatch.setattr(registry, "_start_timer", lambda: None)
+    hits = registry.counter("hits_total", "Hits.")
+    path = os.path.join(registry.directory, f"{os.getpid()}.json")
+    registry.flush()
+    first = os.stat(path).st_mtime_ns
+    hits.inc()
+    registry.flush()  # within METRICS_FLUSH_INTERVAL
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["hits_total"]["values"] == []
+    registry.flush(force=True)
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["hits_total"]["values"] == [[[], 1]]
+    os.utime(path, ns=(first, first))
+    registry.flush(force=True)
+    assert os.stat(path).st_mtime_ns == first  # unchanged: not rewritten
+
+
+def test_timer_flushes_later_counts(registry, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_FLUSH_INTERVAL", 0.05)
+    hits = registry.counter("hits_total", "Hits.")
+    registry.flush(force=True)
+    hits.inc(4)
+    path = os.path.join(registry.directory, f"{os.getpid()}.json")
+    deadline = time.monotonic() + 10
+    while True:
+        with open(path, "r", encoding="utf-8") as f:
+            if json.load(f)["hits_total"]["values"] == [[[], 4]]:
+                break
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_last_counts_are_flushed_at_exit(tmp_path):
+    code = "import metrics; metrics.JOBS.inc(kind='batch', status='done')"
+    env = {**os.environ, "METRICS_DIR": str(tmp_path), "PYTHONPATH": os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    (name,) = os.listdir(tmp_path)
+    with open(tmp_path / name, "r", encoding="utf-8") as f:
+        assert json.load(f)["prism_jobs_total"]["values"] == [[[["kind", "batch"], ["status", "done"]], 1]]
+
+
+def test_span_and_profiled(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "PROFILE_DIR", str(tmp_path))
+    with metrics.span("unit-test", method="x"):
+        pass
+    assert 'prism_span_seconds_count{method="x",span="unit-test"} 1' in metrics.registry.render()
+    with caplog.at_level(logging.INFO, logger="metrics"):
+        with metrics.profiled("job/1", enabled=True):
+            sum(range(1000))
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith(f"-job_1-{os.getpid()}.prof")
+    assert name in caplog.text
+    with metrics.profiled("off", enabled=False):
+        pass
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_metrics_endpoint():
+    import app
+    response = app.app.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert "# TYPE prism_request_seconds histogram" in response.get_data(as_text=True)
@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from mmap_store import drop_generations, locked, map_array, write_array
+from resume_index import ResumeIndex
+
+
+def mapped(array):
+    """True if array is, or is a view of, a memory map (scipy wraps the arrays it is given)."""
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+def test_write_and_map_round_trip(tmp_path):
+    path = str(tmp_path / "a.bin")
+    write_array(path, np.arange(10, dtype=np.int32))
+    mapped = map_array(path, np.int32)
+    assert isinstance(mapped, np.memmap)
+    assert mapped.tolist() == list(range(10))
+    write_array(path, np.zeros(0, dtype=np.int32))
+    assert len(map_array(path, np.int32)) == 0
+
+
+def test_drop_generations_keeps_one(tmp_path):
+    for name in ("data.g1.bin", "data.g2.bin", "vocab.g1.txt", "meta.json", "data.g1.tmp"):
+        (tmp_path / name).write_text("")
+    drop_generations(str(tmp_path), "g2")
+    assert sorted(os.listdir(tmp_path)) == ["data.g1.tmp", "data.g2.bin", "meta.json"]
+
+
+def test_saved_index_is_memory_mapped(tmp_path):
+    index = ResumeIndex(str(tmp_path / "index"))
+    index.add("a.pdf", "python flask sql", [1, 0])
+    index.save()
+    loaded = ResumeIndex(index.path).load()
+    assert mapped(loaded.counts.data) and mapped(loaded.counts.indices)
+    assert not loaded.counts.data.flags.writeable
+    index.add("b.pdf", "java spring", [2, 0])
+    index.save()
+    generations = {name.split(".")[1] for name in os.listdir(index.path) if name.endswith(".bin")}
+    assert generations == {index.generation}
+
+
+def test_load_raises_when_a_generation_file_is_missing(tmp_path):
+    index = ResumeIndex(str(tmp_path / "index"))
+    index.add("a.pdf", "python flask sql", [1, 0])
+    index.save()
+    os.remove(os.path.join(index.path, f"data.{index.generation}.bin"))
+    with pytest.raises(FileNotFoundError):
+        ResumeIndex(index.path).load()
+
+
+def _hold(directory, shared, entered, release):
+    with locked(directory, shared=shared):
+        entered.set()
+        release.wait(10)
+
+
+
+
+@pytest.mark.parametrize("held_shared, shared, blocks", [
+    (True, True, False),
+    (True, False, True),
+    (False, True, True),
+])
+def test_lock_modes(tmp_path, held_shared, shared, blocks):
+    directory = str(tmp_path / "index")
+    entered, release = multiprocessing.Event(), multiprocessing.Event()
+    holder = multiprocessing.Process(target=_hold, args=(directory, held_shared, entered, release))
+    holder.start()
+    try:
+        assert entered.wait(10)
+        second = multiprocessing.Event()
+        other = multiprocessing.Process(target=_hold, args=(directory, shared, second, multiprocessing.Event()))
+        other.start()
+        assert second.wait(1) is not blocks
+        release.set()
+        assert second.wait(10)
+        other.kill()
+        other.join()
+    finally:
+        release.set()
+        holder.join(10)
+
+
+def _save_and_load(path, worker, rounds):
+    for n in range(rounds):
+        index = ResumeIndex(path).load()
+        index.add(f"{worker}-{n}.pdf", f"python worker{worker} round{n}", [n, worker])
+        index.save()
+        ResumeIndex(path).load().scores("python")
+
+
+def test_concurrent_saves_and_loads(tmp_path):
+    path = str(tmp_path / "index")
+    workers = [multiprocessing.Process(target=_save_and_load, args=(path, w, 5)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+    assert [process.exitcode for process in workers] == [0] * 4
+    index = ResumeIndex(path).load()
+    assert len(index) >= 5
+    assert np.all(index.scores("python") > 0)
@@ -0,0 +1,47 @@
+import numpy as np
+
+import screen
+from conftest import write_docs
+from result_cache import ResultCache, result_key
+
+
+def test_values_survive_a_restart(tmp_path):
+    path = str(tmp_path / "results.db")
+    ResultCache(path).put("k", (np.arange(3.0), ["a", "b", "c"]))
+    cache = ResultCache(path)
+    scores, keys = cache.get("k")
+    assert scores.tolist() == [0.0, 1.0, 2.0] and keys == ["a", "b", "c"]
+    assert cache.disk_hits == 1
+    cache.get("k")
+    assert cache.memory_hits == 1
+
+
+def test_memory_and_disk_budgets_evict_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.db"), max_memory_bytes=200, max_disk_bytes=200)
+    cache.put("old", b"x" * 100)
+    cache.put("new", b"y" * 100)
+    assert cache.stats()["memory_entries"] == 1
+    assert cache.stats()["disk_entries"] == 1
+    assert cache.get("old") is None
+    assert cache.get("new") == b"y" * 100
+
+
+def test_keys_change_with_the_corpus_and_config():
+    key = result_key("jd text", "corpus-1", "tfidf")
+    assert key == result_key("jd text", "corpus-1", "tfidf")
+    assert key != result_key("jd text", "corpus-2", "tfidf")
+    assert key != result_key("jd text", "corpus-1", "bm25")
+    assert key != result_key("other jd", "corpus-1", "tfidf")
+
+
+def test_screening_reuses_results_until_the_resumes_change(workspace, monkeypatch):
+    cache = ResultCache(str(workspace / "results.db"))
+    monkeypatch.setattr(screen, "get_result_cache", lambda: cache)
+    write_docs(workspace / "Original_Resumes", {"a.txt": "python flask developer", "b.txt": "java developer"})
+    write_docs(workspace / "Job_Description", {"jd.txt": "python developer"})
+    first = [(r.filename, r.score) for r in screen.res("jd.txt")]
+    assert [(r.filename, r.score) for r in screen.res("jd.txt")] == first
+    assert (cache.misses, cache.memory_hits) == (1, 1)
+    write_docs(workspace / "Original_Resumes", {"c.txt": "python python developer"})
+    assert screen.res("jd.txt")[0].filename == "c.txt"
+    assert cache.misses == 2
@@ -0,0 +1,84 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from resume_index import ResumeIndex
+
+DOCS = {
+    "a.pdf": "python developer with flask and sql experience",
+    "b.pdf": "java spring developer, some sql",
+    "c.pdf": "data scientist: python, numpy, pandas and machine learning",
+    "d.pdf": "frontend engineer, javascript and css",
+}
+
+
+def build(tmp_path, docs=DOCS):
+    index = ResumeIndex(str(tmp_path / "index"))
+    index.add_many((key, text, [len(text), 0]) for key, text in docs.items())
+    return index
+
+
+def sklearn_scores(docs, query):
+    vectorizer = TfidfVectorizer(stop_words="english")
+    matrix = vectorizer.fit_transform(list(docs.values()))
+    return (matrix @ vectorizer.transform([query]).T).toarray().ravel()
+
+
+def test_scores_match_a_refitted_vectorizer(tmp_path):
+    index = build(tmp_path)
+    query = "python developer sql"
+    assert np.allclose(index.scores(query), sklearn_scores(DOCS, query))
+
+
+def test_incremental_updates_match_a_full_rebuild(tmp_path):
+    index = build(tmp_path)
+    index.remove("b.pdf")
+    index.add("e.pdf", "python backend developer", [1, 1])
+    index.add("a.pdf", "rust systems programmer", [2, 2])  # replaced in place
+    docs = {k: v for k, v in DOCS.items() if k not in ("a.pdf", "b.pdf")}
+    docs.update({"e.pdf": "python backend developer", "a.pdf": "rust systems programmer"})
+    query = "python developer"
+    expected = dict(zip(docs, sklearn_scores(docs, query)))
+    assert np.allclose(index.scores(query), [expected[k] for k in index.keys])
+
+
+def test_update_only_indexes_stale_keys(tmp_path):
+    index = build(tmp_path)
+    fingerprints = dict(index.fingerprints)
+    fingerprints["e.pdf"] = [9, 9]
+    loaded = []
+
+    def loader(keys):
+        loaded.extend(keys)
+        return ["new resume text" for _ in keys]
+
+    assert index.update(fingerprints, loader) == 1
+    assert loaded == ["e.pdf"]
+    assert index.update(fingerprints, loader) == 0
+
+
+def test_unreadable_documents_are_retried(tmp_path):
+    index = build(tmp_path)
+    fingerprints = dict(index.fingerprints, **{"e.pdf": [9, 9]})
+    assert index.update(fingerprints, lambda keys: [None for _ in keys]) == 0
+    assert "e.pdf" not in index
+    assert index.stale(fingerprints) == ["e.pdf"]
+
+
+def test_sync_drops_documents_that_are_gone(tmp_path):
+    index = build(tmp_path)
+    keep = {k: fp for k, fp in index.fingerprints.items() if k != "d.pdf"}
+    assert index.sync(keep, lambda keys: [])
+    assert sorted(index.keys) == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = build(tmp_path)
+    index.save()
+    loaded = ResumeIndex(index.path).load()
+    assert loaded.keys == index.keys
+    assert loaded.fingerprints == index.fingerprints
+    assert np.allclose(loaded.scores("python sql"), index.scores("python sql"))
+
+
+def test_load_without_a_saved_index_is_empty(tmp_path):
+    assert len(ResumeIndex(str(tmp_path / "none")).load()) == 0
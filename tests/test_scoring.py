@@ -0,0 +1,31 @@
+import numpy as np
+
+from scoring import top_k
+
+
+def reference(scores, k, offset):
+    order = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+    return order[offset:] if k is None else order[offset:offset + k]
+
+
+def test_matches_a_stable_full_sort():
+    rng = np.random.default_rng(3)
+    for _ in range(300):
+        scores = rng.integers(0, 5, size=int(rng.integers(0, 40))).astype(float)  # plenty of ties
+        k = None if rng.random() < 0.2 else int(rng.integers(0, 15))
+        offset = int(rng.integers(0, 10))
+        assert top_k(scores, k, offset).tolist() == reference(scores.tolist(), k, offset)
+
+
+def test_ties_at_the_cut_keep_index_order():
+    assert top_k([1.0, 2.0, 1.0, 1.0, 2.0], 3).tolist() == [1, 4, 0]
+
+
+def test_pages_tile_the_full_ranking():
+    scores = np.random.default_rng(0).random(103)
+    pages = [top_k(scores, 10, offset) for offset in range(0, 110, 10)]
+    assert np.concatenate(pages).tolist() == top_k(scores).tolist()
+
+
+def test_offset_past_the_end_is_empty():
+    assert len(top_k([3.0, 1.0], 5, offset=2)) == 0
@@ -0,0 +1,51 @@
+import numpy as np
+
+import screen
+from conftest import write_docs
+
+RESUMES = {
+    "alice.txt": "Python developer. Flask, SQL and REST APIs. Five years of backend work.",
+    "bob.txt": "Java engineer. Spring Boot and SQL. Some Kubernetes.",
+    "carol.txt": "Data scientist. Python, numpy, pandas, machine learning.",
+    "dave.txt": "Graphic designer. Photoshop and illustration.",
+}
+JOBS = {
+    "backend.txt": "We need a Python developer who knows Flask and SQL.",
+    "data.txt": "Hiring a data scientist for machine learning in Python.",
+}
+
+
+def setup(workspace):
+    write_docs(workspace / "Original_Resumes", RESUMES)
+    write_docs(workspace / "Job_Description", JOBS)
+
+
+def test_batch_scores_match_single_screenings(workspace):
+    setup(workspace)
+    scores, names, rankings = screen.res_many()
+    assert sorted(rankings) == sorted(JOBS)
+    assert scores.shape == (len(JOBS), len(RESUMES))
+    for jobfile, ranked in rankings.items():
+        single = screen.res(jobfile)
+        assert [(r.filename, r.score) for r in ranked] == [(r.filename, r.score) for r in single]
+
+
+def test_best_match_ranks_first(workspace):
+    setup(workspace)
+    assert screen.res("backend.txt")[0].filename == "alice.txt"
+    assert screen.res("data.txt")[0].filename == "carol.txt"
+
+
+def test_batch_of_selected_jobs(workspace):
+    setup(workspace)
+    scores, names, rankings = screen.res_many(["data.txt"])
+    assert list(rankings) == ["data.txt"]
+    assert names[int(np.argmax(scores[0]))] == "carol.txt"
+
+
+def test_a_page_is_a_slice_of_the_full_ranking(workspace):
+    setup(workspace)
+    for method in ("tfidf", "bm25"):
+        full = [(r.rank, r.filename, r.score) for r in screen.res("backend.txt", method=method)]
+        page = [(r.rank, r.filename, r.score) for r in screen.res("backend.txt", k=2, offset=1, method=method)]
+        assert page == full[1:3]
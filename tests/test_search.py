@@ -0,0 +1,31 @@
+import numpy as np
+
+import search
+from scoring import CountMatrix
+from search import STOP_WORDS, calculate_cosine_similarity, tokenize_and_count
+
+TEXTS = [
+    "Python developer with Flask and SQL",
+    "Java developer, Spring and SQL, SQL again",
+    "",
+    "machine learning in python with numpy",
+]
+
+
+def test_matrix_cosine_matches_the_counter_loop():
+    counters = [tokenize_and_count(text, STOP_WORDS) for text in TEXTS]
+    matrix = CountMatrix.from_counters(counters)
+    query = tokenize_and_count("Senior python developer, SQL, kubernetes", STOP_WORDS)
+    expected = [calculate_cosine_similarity(query, counts) for counts in counters]
+    assert np.allclose(matrix.cosine(query), expected)
+
+
+def test_empty_query_scores_zero():
+    matrix = CountMatrix.from_counters(tokenize_and_count(text, STOP_WORDS) for text in TEXTS)
+    assert not matrix.cosine({}).any()
+
+
+def test_count_matrix_is_reused_while_texts_are_unchanged():
+    first = search.get_count_matrix(TEXTS)
+    assert search.get_count_matrix(list(TEXTS)) is first
+    assert search.get_count_matrix(TEXTS + ["one more resume"]) is not first
@@ -0,0 +1,77 @@
+import numpy as np
+from scipy import sparse
+
+from resume_index import ResumeIndex
+from scoring import top_k
+from semantic import SemanticIndex
+
+
+def clustered(rng, n_docs=600, n_terms=300, n_topics=12):
+    """l2-normalised docs x terms weights where each doc draws most of its terms from one topic."""
+    topics = rng.integers(n_topics, size=n_docs)
+    rows, cols = [], []
+    for doc, topic in enumerate(topics):
+        own = rng.integers(topic * n_terms // n_topics, (topic + 1) * n_terms // n_topics, size=12)
+        cols.extend(np.concatenate([own, rng.integers(n_terms, size=3)]))
+        rows.extend([doc] * 15)
+    weights = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_docs, n_terms))
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    return sparse.diags(1.0 / norms) @ weights
+
+
+def test_build_and_load(tmp_path):
+    weights = clustered(np.random.default_rng(0))
+    path = str(tmp_path / "semantic")
+    assert SemanticIndex.load(path) is None
+    built = SemanticIndex.build(weights, path, "c1", dims=32)
+    loaded = SemanticIndex.load(path)
+    assert (loaded.corpus, loaded.dims, len(loaded)) == ("c1", 32, 600)
+    assert np.allclose(np.linalg.norm(loaded.vectors, axis=1), 1, atol=1e-5)
+    assert np.array_equal(loaded.vectors, built.vectors)
+    assert sorted(loaded.list_docs.tolist()) == list(range(600))
+
+
+def test_ivf_search_recalls_the_exact_top_k(tmp_path):
+    rng = np.random.default_rng(1)
+    weights = clustered(rng)
+    index = SemanticIndex.build(weights, str(tmp_path / "semantic"), "c1", dims=32)
+    hits = total = 0
+    for doc in rng.integers(600, size=30):
+        embedding = index.embed(weights[doc])
+        exact = index.scores(embedding)
+        rows, scores = index.top_k(embedding, 10, nprobe=len(index.centroids))
+        assert np.allclose(scores, exact[rows], atol=1e-6)
+        assert np.all(np.diff(scores) <= 1e-6)
+        assert set(rows.tolist()) == set(top_k(exact, 10).tolist())  # every list probed: only int8 rounding differs
+        rows, _ = index.top_k(embedding, 10, nprobe=4)
+        hits += len(set(rows.tolist()) & set(top_k(exact, 10).tolist()))
+        total += 10
+    assert hits / total >= 0.8
+
+
+def test_tiny_corpus_has_no_dimensions(tmp_path):
+    weights = sparse.csr_matrix(np.array([[1.0, 0.0]]))
+    index = SemanticIndex.build(weights, str(tmp_path / "semantic"), "c1")
+    assert index.dims == 0
+    rows, scores = index.top_k(index.embed(weights[0]), 5)
+    assert rows.tolist() == [0] and scores.tolist() == [0.0]
+
+
+def test_resume_index_rebuilds_only_when_the_corpus_changes(tmp_path):
+    index = ResumeIndex(str(tmp_path / "index"))
+    index.add_many([
+        ("a.pdf", "python flask django web backend", [1, 0]),
+        ("b.pdf", "python pandas numpy machine learning", [2, 0]),
+        ("c.pdf", "java spring hibernate backend", [3, 0]),
+        ("d.pdf", "pandas numpy statistics data analysis", [4, 0]),
+    ])
+    semantic = index.semantic()
+    assert index.semantic() is semantic
+    scores = index.semantic_scores("numpy statistics")
+    assert scores.shape == (4,)
+    keys, top = index.semantic_top_k("numpy statistics", 2)
+    assert keys[0] == "d.pdf"
+    assert np.allclose(top, sorted(scores, reverse=True)[:2], atol=1e-6)
+    index.add("e.pdf", "rust systems programming", [5, 0])
+    assert index.semantic() is not semantic
+    assert len(index.semantic()) == 5
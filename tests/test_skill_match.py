@@ -0,0 +1,52 @@
+import random
+import re
+
+from skill_match import SkillMatcher, fold, load_skills
+
+SKILLS = ["Python", "Java", "JavaScript", "machine learning", "learning", "C++", "C#", "ASP.NET", "SQL"]
+
+
+def naive_counts(skills, text):
+    """Whole-word occurrences of each skill, by regex over the folded text."""
+    folded = " " + fold(text)[0] + " "
+    counts = {}
+    for skill in skills:
+        key = fold(skill)[0]
+        n = len(re.findall(f"(?= {re.escape(key)} )", folded))
+        if n:
+            counts[skill] = n
+    return counts
+
+
+def test_whole_words_only():
+    matcher = SkillMatcher(SKILLS)
+    assert matcher.counts("JavaScript and TypeScript") == {"JavaScript": 1}
+    assert matcher.counts("Java, java; JAVA!") == {"Java": 3}
+
+
+def test_overlapping_and_symbol_skills():
+    matcher = SkillMatcher(SKILLS)
+    counts = matcher.counts("Machine-learning in C++ and C#, deployed with ASP.NET.")
+    assert counts == {"machine learning": 1, "learning": 1, "C++": 1, "C#": 1, "ASP.NET": 1}
+
+
+def test_offsets_point_into_the_original_text():
+    text = "Skills:  Machine   Learning, SQL"
+    hits = SkillMatcher(SKILLS).find(text)
+    assert [text[s:e] for s, e in hits["machine learning"]] == ["Machine   Learning"]
+    assert [text[s:e] for s, e in hits["SQL"]] == ["SQL"]
+
+
+def test_matches_a_naive_search_on_random_text():
+    rng = random.Random(7)
+    words = ["python", "java", "javascript", "machine", "learning", "c++", "sql", "the", "and", "data"]
+    matcher = SkillMatcher(SKILLS)
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+        assert dict(matcher.counts(text)) == naive_counts(matcher.skills, text)
+
+
+def test_skills_file_format(tmp_path):
+    path = tmp_path / "skills.txt"
+    path.write_text("# languages\nPython, Java\n\nSQL\n", encoding="utf-8")
+    assert load_skills(str(path)) == ["Python", "Java", "SQL"]
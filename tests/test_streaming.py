@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import app
+import jobs
+from conftest import write_docs
+from jobs import JobQueue
+from resume_index import ResumeIndex
+
+
+def parse_sse(body):
+    """[(id or None, event, data), ...] of a text/event-stream body, skipping comments."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith(":"))
+        if fields:
+            events.append((int(fields["id"]) if "id" in fields else None, fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    queue = JobQueue(path=str(tmp_path / "jobs.db"), workers=1)
+    monkeypatch.setattr(app, "job_queue", queue)
+    monkeypatch.setattr(app, "SSE_POLL_INTERVAL", 0.01)
+    return queue
+
+
+def test_stream_sends_partial_results_then_done(queue):
+    release = threading.Event()
+
+    def handler(params, progress):
+        progress(files_total=3)
+        progress(files_scored=2, scores=[["a.pdf", 0.5], ["b.pdf", 0.9]], top=[["b.pdf", 0.9], ["a.pdf", 0.5]])
+        release.wait(10)
+        progress(files_scored=3, scores=[["c.pdf", 0.7]], top=[["b.pdf", 0.9], ["c.pdf", 0.7]])
+        return {"results": []}
+
+    queue.register("slow", handler)
+    job_id = queue.submit("slow", {})
+    client = app.app.test_client()
+    response = client.get(f"/jobs/{job_id}/stream", buffered=False)
+    assert response.mimetype == "text/event-stream"
+    chunks = response.iter_encoded()
+    first = ""
+    while "event: top" not in first:  # the first partial results arrive while the job is still running
+        first += next(chunks).decode()
+    release.set()
+    events = parse_sse(first + b"".join(chunks).decode())
+    kinds = [event for _, event, _ in events if event != "progress"]
+    assert kinds == ["scores", "top", "scores", "top", "done"]
+    assert events[-1][2] == {"url": f"/jobs/{job_id}"}
+    assert [event for _, event, _ in events if event == "progress"]
+    assert [data for _, event, data in events if event == "scores"] == [[["a.pdf", 0.5], ["b.pdf", 0.9]],
+                                                                         [["c.pdf", 0.7]]]
+
+    # Reconnecting with Last-Event-ID replays only what came after it
+    first_top = [event_id for event_id, event, _ in events if event == "top"][0]
+    resumed = parse_sse(client.get(f"/jobs/{job_id}/stream", headers={"Last-Event-ID": str(first_top)}).get_data(as_text=True))
+    assert [event for _, event, _ in resumed if event != "progress"] == ["scores", "top", "done"]
+
+
+def test_stream_reports_failure(queue):
+    def handler(params, progress):
+        raise RuntimeError("no resumes")
+
+    queue.register("broken", handler)
+    events = parse_sse(app.app.test_client().get(f"/jobs/{queue.submit('broken', {})}/stream").get_data(as_text=True))
+    assert events[-1][1:] == ("failed", {"error": "no resumes"})
+    assert app.app.test_client().get("/jobs/unknown/stream").status_code == 404
+
+
+def test_finished_jobs_events_are_pruned(queue, monkeypatch):
+    queue.register("quick", lambda params, progress: progress(scores=[["a.pdf", 1.0]]) or {})
+    job_id = queue.submit("quick", {})
+    deadline = time.monotonic() + 10
+    while queue.get(job_id)["status"] != "done":
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    assert len(queue.events(job_id)) == 1
+    queue.publish("still-running", "scores", [])
+    monkeypatch.setattr(jobs, "JOB_EVENTS_TTL", -1)
+    queue._prune_events()
+    assert queue.events(job_id) == []
+    assert len(queue.events("still-running")) == 1  # not a finished job
+
+
+def test_process_job_publishes_each_chunk(workspace, monkeypatch):
+    write_docs(workspace / "Job_Description", {"backend.txt": "Python developer with Flask and SQL."})
+    (workspace / "uploads").mkdir()
+    uploads = write_docs(workspace / "uploads", {
+        f"r{n}.txt": "Python Flask SQL developer." if n == 3 else f"Java engineer number {n}." for n in range(5)
+    })
+    monkeypatch.setattr(app, "_upload_index", ResumeIndex(str(workspace / "upload_index")))
+    monkeypatch.setattr(app, "STREAM_CHUNK", 2)
+    calls = []
+    result = app.run_process_job({
+        "resume_paths": uploads,
+        "resume_names": [os.path.basename(p) for p in uploads],
+        "jd_path": str(workspace / "Job_Description" / "backend.txt"),
+        "jd_filename": "backend.txt",
+    }, lambda **counts: calls.append(counts))
+    chunks = [call["scores"] for call in calls if "scores" in call]
+    assert [[name for name, _ in chunk] for chunk in chunks] == [["r0.txt", "r1.txt"], ["r2.txt", "r3.txt"], ["r4.txt"]]
+    tops = [call["top"] for call in calls if "top" in call]
+    assert tops[0][0][0] in ("r0.txt", "r1.txt")
+    assert tops[-1][0][0] == "r3.txt"
+    assert result["results"][0][0] == "r3.txt"
+    assert calls[-1] == {"files_scored": 5}
@@ -0,0 +1,61 @@
+import os
+
+from text_cache import TEXT_FORMAT, TextCache, extract_document
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_extract_document_flattens_newlines(tmp_path):
+    path = write(tmp_path / "a.txt", b"python developer\r\nflask\nsql")
+    assert extract_document(path) == "python developer flask sql"
+
+
+def test_same_content_is_one_entry_whatever_the_name(tmp_path):
+    cache = TextCache(str(tmp_path / "text.db"))
+    first = write(tmp_path / "a.txt", b"python developer")
+    copy = write(tmp_path / "renamed.txt", b"python developer")
+    assert cache.get_text(first) == "python developer"
+    assert cache.get_text(copy) == "python developer"
+    assert cache.stats()["entries"] == 1
+    assert cache.hits == 1
+
+
+def test_changed_file_is_extracted_again(tmp_path):
+    cache = TextCache(str(tmp_path / "text.db"))
+    path = write(tmp_path / "a.txt", b"old text")
+    assert cache.get_text(path) == "old text"
+    write(path, b"new text, longer")
+    os.utime(path, ns=(1, 1))
+    assert cache.get_text(path) == "new text, longer"
+
+
+def test_failures_are_not_cached(tmp_path):
+    cache = TextCache(str(tmp_path / "text.db"))
+    path = write(tmp_path / "broken.pdf", b"not a pdf")
+    assert cache.get_text(path) == ""
+    assert cache.lookup(cache.digest(path)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_missing_file_reads_as_empty(tmp_path):
+    cache = TextCache(str(tmp_path / "text.db"))
+    assert cache.get_text(str(tmp_path / "gone.txt")) == ""
+
+
+def test_entries_are_tagged_with_the_text_format(tmp_path):
+    cache = TextCache(str(tmp_path / "text.db"))
+    cache.store("digest", "text")
+    assert cache.lookup("digest") == "text"
+    assert cache.lookup("digest", kind=TEXT_FORMAT + "-old") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TextCache(str(tmp_path / "text.db"), max_bytes=10)
+    cache.store("a", "x" * 6)
+    cache.store("b", "y" * 6)
+    assert cache.lookup("a") is None
+    assert cache.lookup("b") == "y" * 6
@@ -0,0 +1,52 @@
+import pytest
+
+for module in ("nltk", "contractions", "inflect", "bs4"):
+    pytest.importorskip(module)
+
+import text_process  # noqa: E402
+
+
+@pytest.fixture
+def normalizer():
+    try:
+        return text_process.Normalizer(cache_size=16)
+    except LookupError:
+        pytest.skip("nltk corpora are not downloaded")
+
+
+WORDS = ["The", "Engineers", "were", "building", "3", "APIs,", "Café", "and", "running", "tests!", "--"]
+
+
+def staged(words):
+    """The original one-list-per-stage pipeline."""
+    for stage in (text_process.remove_non_ascii, text_process.to_lowercase, text_process.remove_punctuation,
+                  text_process.replace_numbers, text_process.remove_stopwords, text_process.stem_words,
+                  text_process.lemmatize_verbs):
+        words = stage(words)
+    return words
+
+
+def test_fused_pass_matches_the_stages(normalizer):
+    assert normalizer.normalize(WORDS) == staged(WORDS)
+    assert text_process.normalize(WORDS) == staged(WORDS)
+
+
+def test_stop_words_and_punctuation_are_dropped(normalizer):
+    assert normalizer.normalize(["the", "and", "--", "!"]) == []
+    assert isinstance(normalizer.stop_words, frozenset)
+
+
+def test_roots_are_memoized(normalizer):
+    normalizer.normalize(["running", "running", "running"])
+    info = normalizer.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+    normalizer.normalize([f"word{n}" for n in range(100)])
+    assert normalizer.cache_info().currsize == 16
+
+
+def test_normalize_many_yields_one_list_per_text(normalizer):
+    texts = ["Engineers build APIs.", "", "Running 3 tests"]
+    results = list(normalizer.normalize_many(texts))
+    assert len(results) == 3
+    assert results[0] == normalizer.normalize_text(texts[0])
+    assert results[1] == []
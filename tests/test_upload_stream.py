@@ -0,0 +1,82 @@
+import io
+import os
+
+import pytest
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from upload_stream import Prefetcher, iter_uploads
+
+BOUNDARY = "xyzBOUNDARY"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def body(*parts):
+    """Encode (field, filename or None, bytes) parts as a multipart/form-data body."""
+    out = io.BytesIO()
+    for field, filename, data in parts:
+        out.write(f"--{BOUNDARY}\r\n".encode())
+        disposition = f'form-data; name="{field}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        out.write(f"Content-Disposition: {disposition}\r\n\r\n".encode())
+        out.write(data + b"\r\n")
+    out.write(f"--{BOUNDARY}--\r\n".encode())
+    return io.BytesIO(out.getvalue())
+
+
+def to_dir(tmp_path):
+    return lambda field, filename: str(tmp_path / filename) if field == "resumes" else None
+
+
+def test_files_are_spooled_to_disk_as_they_arrive(tmp_path):
+    stream = body(("method", None, b"bm25"), ("resumes", "a.txt", b"A" * 5000), ("resumes", "b.txt", b"bee"))
+    events = list(iter_uploads(stream, CONTENT_TYPE, to_dir(tmp_path), chunk_size=1024))
+    assert events == [
+        ("field", "method", "bm25"),
+        ("file", "resumes", "a.txt", str(tmp_path / "a.txt")),
+        ("file", "resumes", "b.txt", str(tmp_path / "b.txt")),
+    ]
+    assert (tmp_path / "a.txt").read_bytes() == b"A" * 5000
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+
+def test_parts_without_a_destination_are_discarded(tmp_path):
+    stream = body(("other", "x.txt", b"ignored"), ("resumes", "a.txt", b"kept"))
+    events = list(iter_uploads(stream, CONTENT_TYPE, to_dir(tmp_path)))
+    assert [e[2] for e in events] == ["a.txt"]
+    assert os.listdir(tmp_path) == ["a.txt"]
+
+
+def test_oversized_file_is_rejected_and_its_partial_removed(tmp_path):
+    stream = body(("resumes", "ok.txt", b"small"), ("resumes", "big.txt", b"B" * 10000))
+    seen = []
+    with pytest.raises(RequestEntityTooLarge):
+        for event in iter_uploads(stream, CONTENT_TYPE, to_dir(tmp_path), max_file_bytes=4096, chunk_size=1024):
+            seen.append(event[2])
+    assert seen == ["ok.txt"]
+    assert os.listdir(tmp_path) == ["ok.txt"]
+
+
+def test_oversized_request_is_rejected(tmp_path):
+    stream = body(*[("resumes", f"r{i}.txt", b"R" * 1000) for i in range(10)])
+    with pytest.raises(RequestEntityTooLarge):
+        list(iter_uploads(stream, CONTENT_TYPE, to_dir(tmp_path), max_request_bytes=4096, chunk_size=1024))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_truncated_or_non_multipart_bodies_are_errors(tmp_path):
+    truncated = io.BytesIO(body(("resumes", "a.txt", b"data")).getvalue()[:-20])
+    with pytest.raises(ValueError):
+        list(iter_uploads(truncated, CONTENT_TYPE, to_dir(tmp_path)))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+    with pytest.raises(ValueError):
+        list(iter_uploads(io.BytesIO(b"{}"), "application/json", to_dir(tmp_path)))
+
+
+def test_prefetcher_wait_blocks_until_extraction_is_done(tmp_path):
+    done = []
+    prefetcher = Prefetcher(lambda path: done.append(path))
+    prefetcher.submit("a")
+    prefetcher.submit("b")
+    prefetcher.wait(["a", "b"])
+    assert sorted(done) == ["a", "b"]
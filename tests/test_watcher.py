@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import screen
+import watcher
+from watcher import DirectoryWatcher, claim_watch, watched_elsewhere
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def eventually(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "poll"])
+def watch(request, tmp_path):
+    """Start a watcher on tmp_path/docs; yields (watcher, list of snapshots passed to on_change)."""
+    root = tmp_path / "docs"
+    root.mkdir()
+    (root / "a.pdf").write_text("a")
+    seen = []
+    w = DirectoryWatcher(str(root), seen.append, suffixes=(".pdf",), debounce=0.05,
+                         poll_interval=0.05, use_inotify=request.param).start()
+    try:
+        eventually(lambda: seen)
+        yield w, seen
+    finally:
+        w.stop()
+
+
+def test_detects_added_changed_and_deleted_files(watch):
+    w, seen = watch
+    root = w.root
+    assert w.mode in ("inotify", "poll")
+    assert list(seen[0]) == [os.path.join(root, "a.pdf")]
+    os.makedirs(os.path.join(root, "sub"))
+    with open(os.path.join(root, "sub", "b.pdf"), "w") as f:
+        f.write("b")
+    with open(os.path.join(root, "ignored.txt"), "w") as f:
+        f.write("x")
+    with open(os.path.join(root, ".hidden.pdf"), "w") as f:
+        f.write("x")
+    eventually(lambda: os.path.join(root, "sub", "b.pdf") in seen[-1])
+    assert sorted(seen[-1]) == [os.path.join(root, "a.pdf"), os.path.join(root, "sub", "b.pdf")]
+    with open(os.path.join(root, "a.pdf"), "w") as f:
+        f.write("longer")
+    eventually(lambda: seen[-1].get(os.path.join(root, "a.pdf"), [0])[0] == 6)
+    os.remove(os.path.join(root, "a.pdf"))
+    eventually(lambda: os.path.join(root, "a.pdf") not in seen[-1])
+    assert w.snapshot() == seen[-1]
+
+
+def test_inotify_is_used_where_available(tmp_path):
+    try:
+        watcher._Inotify().close()
+    except OSError:
+        pytest.skip("inotify is not available")
+    w = DirectoryWatcher(str(tmp_path), lambda files: None).start()
+    try:
+        eventually(lambda: w.mode is not None)
+        assert w.mode == "inotify"
+    finally:
+        w.stop()
+
+
+OTHER = """
+import sys
+from watcher import claim_watch, watched_elsewhere
+print(claim_watch(sys.argv[1]), watched_elsewhere(sys.argv[1]))
+"""
+
+
+def other_process(path):
+    proc = subprocess.run([sys.executable, "-c", OTHER, path], capture_output=True, text=True,
+                          env={**os.environ, "PYTHONPATH": ROOT}, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.split()
+
+
+def test_one_process_owns_the_watchers(tmp_path, monkeypatch):
+    monkeypatch.setattr(watcher, "_claims", {})
+    path = str(tmp_path / "watchers.lock")
+    assert not watched_elsewhere(path)
+    assert other_process(path) == ["True", "False"]  # its lock went with it
+    assert not watched_elsewhere(path)  # the pid it left behind is gone
+    assert claim_watch(path)
+    assert claim_watch(path)
+    assert not watched_elsewhere(path)
+    assert other_process(path) == ["False", "True"]
+    watcher._claims.pop(path).close()
+    assert other_process(path) == ["True", "False"]
+
+
+def test_failed_watcher_pass_falls_back_to_a_scan(workspace, monkeypatch):
+    scans = []
+    monkeypatch.setattr(screen, "_ingest", lambda fingerprints, report: scans.append(fingerprints) or "scanned")
+    monkeypatch.setattr(screen, "_watcher", object())
+    monkeypatch.setattr(screen, "_watch_ready", threading.Event())
+    screen._watch_ready.set()
+
+    monkeypatch.setattr(screen, "_watch_ok", False)
+    assert screen._sync_index(lambda **counts: None) == "scanned"
+    monkeypatch.setattr(screen, "_watch_ok", True)
+    assert screen._sync_index(lambda **counts: None) is screen.get_index()
+    assert len(scans) == 1
+
+
+def test_other_process_watcher_is_trusted_once_it_has_saved(workspace, monkeypatch):
+    monkeypatch.setattr(screen, "_ingest", lambda fingerprints, report: "scanned")
+    monkeypatch.setattr(screen, "watched_elsewhere", lambda path: True)
+    assert screen._sync_index(lambda **counts: None) == "scanned"  # nothing saved yet
+    screen.get_index().add("a.pdf", "python", [1, 0])
+    assert screen._sync_index(lambda **counts: None) is screen.get_index()
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from config import CACHE_DIR
+from metrics import CACHE_LOOKUPS, record_extraction
+
+TEXT_CACHE_PATH = os.path.join(CACHE_DIR, "text_cache.db")
+TEXT_CACHE_MAX_BYTES = int(os.environ.get("TEXT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# What extract_document() returns; stored with every entry, so bump it when
+# the extraction output changes and old entries are simply never hit again.
+TEXT_FORMAT = "flat-1"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ExtractionError(Exception):
+    """A document whose text could not be read; never cached, so it is retried next time."""
+
+
+def extract_document(path):
+    """
+    Plain text of a PDF, DOCX or text file, in TEXT_FORMAT: PDF pages are
+    joined by a space and newlines are flattened to spaces.
+
+    Every caller (screening, uploads, search) extracts through this one
+    function, so a file's text is parsed and cached once for all of them.
+    Raises ExtractionError if the file cannot be parsed. A PDF without a
+    text layer legitimately yields "".
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == ".pdf":
+            import PyPDF2
+            with open(path, "rb") as f:
+                reader = PyPDF2.PdfReader(f)
+                text = " ".join(page.extract_text() or "" for page in reader.pages)
+        elif ext == ".docx":
+            import docx2txt
+            text = docx2txt.process(path) or ""
+        else:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                text = f.read()
+    except Exception as e:
+        raise ExtractionError(f"{type(e).__name__}: {e}") from e
+    return text.replace("\r", " ").replace("\n", " ")
+
+
+class TextCache:
+    """
+    On-disk cache of extracted document text, keyed by file content hash.
+
+    A (size, mtime) check against the last seen stat of a path avoids
+    re-hashing unchanged files; text is stored once per (digest, TEXT_FORMAT)
+    so renamed or copied files are still hits. Only successful extractions
+    are stored. Least recently used entries are evicted once the stored text
+    exceeds max_bytes.
+    """
+
+    def __init__(self, path=TEXT_CACHE_PATH, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime_ns INTEGER,
+                digest TEXT
+            );
+            CREATE TABLE IF NOT EXISTS texts (
+                digest TEXT,
+                kind TEXT,
+                text TEXT,
+                nbytes INTEGER,
+                last_used REAL,
+                PRIMARY KEY (digest, kind)
+            );
+            CREATE INDEX IF NOT EXISTS texts_last_used ON texts (last_used);
+            """)
+            self._conn = conn
+        return self._conn
+
+    def digest(self, path):
+        """Content hash of path, re-hashing only if its size or mtime changed."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self._lock:
+            row = self._db().execute(
+                "SELECT size, mtime_ns, digest FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+        digest = file_digest(path)
+        with self._lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (path, st.st_size, st.st_mtime_ns, digest),
+            )
+            conn.commit()
+        return digest
+
+    def lookup(self, digest, kind=TEXT_FORMAT):
+        """Cached text for (digest, kind), or None. Counts a hit or a miss."""
+        with self._lock:
+            conn = self._db()
+            row = conn.execute(
+                "SELECT text FROM texts WHERE digest = ? AND kind = ?", (digest, kind)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(cache="text", result="miss")
+                return None
+            self.hits += 1
+            CACHE_LOOKUPS.inc(cache="text", result="hit")
+            conn.execute(
+                "UPDATE texts SET last_used = ? WHERE digest = ? AND kind = ?",
+                (time.time(), digest, kind),
+            )
+            conn.commit()
+        return row[0]
+
+    def store(self, digest, text, kind=TEXT_FORMAT):
+        """Save extracted text and evict old entries if over budget."""
+        text = text or ""
+        nbytes = len(text.encode("utf-8", errors="ignore"))
+        with self._lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO texts (digest, kind, text, nbytes, last_used) VALUES (?, ?, ?, ?, ?)",
+                (digest, kind, text, nbytes, time.time()),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM texts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for digest, kind, nbytes in conn.execute(
+            "SELECT digest, kind, nbytes FROM texts ORDER BY last_used"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((digest, kind))
+            total -= nbytes
+        conn.executemany("DELETE FROM texts WHERE digest = ? AND kind = ?", doomed)
+
+    def get_text(self, path):
+        """extract_document(path), served from the cache when the content was seen before; "" if unreadable."""
+        try:
+            digest = self.digest(path)
+        except OSError as e:
+            print(f"Error extracting {path}: {e}")
+            return ""
+        text = self.lookup(digest)
+        if text is None:
+            start = time.perf_counter()
+            try:
+                text = extract_document(path)
+            except ExtractionError as e:
+                print(f"Error extracting {path}: {e}")
+                return ""
+            record_extraction(path, time.perf_counter() - start)
+            self.store(digest, text)
+        return text
+
+    def stats(self):
+        with self._lock:
+            entries, nbytes = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM texts"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": nbytes}
+
+    def clear(self):
+        with self._lock:
+            conn = self._db()
+            conn.execute("DELETE FROM texts")
+            conn.execute("DELETE FROM files")
+            conn.commit()
+        self.hits = self.misses = 0
+
+
+_cache = None
+
+
+def get_cache():
+    """Process-wide TextCache shared by screen, search and app."""
+    global _cache
+    if _cache is None:
+        _cache = TextCache()
+    return _cache
+
+
+def cached_text(path):
+    return get_cache().get_text(path)
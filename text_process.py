@@ -1,5 +1,5 @@
-
 import re, string, unicodedata
+from functools import lru_cache
 import nltk
 import contractions
 import inflect
@@ -8,6 +8,76 @@ from nltk import word_tokenize, sent_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import LancasterStemmer, WordNetLemmatizer
 
+# --- Config ---
+TOKEN_CACHE_SIZE = 100000  # distinct words whose stem/lemma is remembered
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+class Normalizer:
+    """
+    Reusable word normalizer: ASCII-fold, lowercase, strip punctuation,
+    spell out numbers, drop stop words, stem, then lemmatize as a verb.
+
+    The stop word list, inflect engine, stemmer and lemmatizer are loaded
+    once per instance, stop words are a frozenset, and the (expensive)
+    number/stem/lemma step is memoized per distinct word in a bounded LRU
+    cache. All stages run in a single pass over the tokens.
+    """
+
+    def __init__(self, language='english', cache_size=TOKEN_CACHE_SIZE):
+        self.stop_words = frozenset(stopwords.words(language))
+        self.inflect = inflect.engine()
+        self.stemmer = LancasterStemmer()
+        self.lemmatizer = WordNetLemmatizer()
+        self._root = lru_cache(maxsize=cache_size)(self._root_uncached)
+
+    def _root_uncached(self, word):
+        """Stem and verb lemma of a cleaned word, or None if it is a stop word."""
+        if word.isdigit():
+            word = self.inflect.number_to_words(word)
+        if word in self.stop_words:
+            return None
+        return self.lemmatizer.lemmatize(self.stemmer.stem(word), pos='v')
+
+    def iter_normalize(self, words):
+        """Generator over the normalized form of each token, skipping tokens that normalize away."""
+        for word in words:
+            word = unicodedata.normalize('NFKD', word).encode('ascii', 'ignore').decode('utf-8', 'ignore')
+            word = _PUNCTUATION.sub('', word.lower())
+            if word:
+                root = self._root(word)
+                if root is not None:
+                    yield root
+
+    def normalize(self, words):
+        """Normalized list of tokenized words."""
+        return list(self.iter_normalize(words))
+
+    def normalize_text(self, text):
+        """Tokenize and normalize raw text."""
+        return self.normalize(word_tokenize(text))
+
+    def normalize_many(self, texts):
+        """Generator of normalized token lists, one per raw text; the token cache is shared across all of them."""
+        for text in texts:
+            yield self.normalize_text(text)
+
+    def cache_info(self):
+        return self._root.cache_info()
+
+
+_normalizer = None
+
+
+def get_normalizer():
+    """Process-wide Normalizer, created on first use."""
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = Normalizer()
+    return _normalizer
+
+
 def remove_non_ascii(words):
     """Remove non-ASCII characters from list of tokenized words"""
     new_words = []
@@ -28,14 +98,14 @@ def remove_punctuation(words):
     """Remove punctuation from list of tokenized words"""
     new_words = []
     for word in words:
-        new_word = re.sub(r'[^\w\s]', '', word)
+        new_word = _PUNCTUATION.sub('', word)
         if new_word != '':
             new_words.append(new_word)
     return new_words
 
 def replace_numbers(words):
     """Replace all interger occurrences in list of tokenized words with textual representation"""
-    p = inflect.engine()
+    p = get_normalizer().inflect
     new_words = []
     for word in words:
         if word.isdigit():
@@ -47,16 +117,12 @@ def replace_numbers(words):
 
 def remove_stopwords(words):
     """Remove stop words from list of tokenized words"""
-    new_words = []
-    for word in words:
-        # print(word)
-        if word not in stopwords.words('english'):
-            new_words.append(word)
-    return new_words
+    stop_words = get_normalizer().stop_words
+    return [word for word in words if word not in stop_words]
 
 def stem_words(words):
     """Stem words in list of tokenized words"""
-    stemmer = LancasterStemmer()
+    stemmer = get_normalizer().stemmer
     stems = []
     for word in words:
         stem = stemmer.stem(word)
@@ -65,7 +131,7 @@ def stem_words(words):
 
 def lemmatize_verbs(words):
     """Lemmatize verbs in list of tokenized words"""
-    lemmatizer = WordNetLemmatizer()
+    lemmatizer = get_normalizer().lemmatizer
     lemmas = []
     for word in words:
         lemma = lemmatizer.lemmatize(word, pos='v')
@@ -73,23 +139,20 @@ def lemmatize_verbs(words):
     return lemmas
 
 def normalize(words):
-    words = remove_non_ascii(words)
-    words = to_lowercase(words)
-    words = remove_punctuation(words)
-    words = replace_numbers(words)
-    words = remove_stopwords(words)
-    words = stem_words(words)
-    words = lemmatize_verbs(words)
-    return words
-
+    """Run every stage above over tokenized words (one fused pass via the shared Normalizer)."""
+    return get_normalizer().normalize(words)
 
-words = str("jabscjbjb ")
+def normalize_many(texts):
+    """Normalize many raw texts with the shared Normalizer; yields one token list per text."""
+    return get_normalizer().normalize_many(texts)
 
-words = nltk.word_tokenize(words)
 
+if __name__ == "__main__":
+    words = str("jabscjbjb ")
 
+    words = nltk.word_tokenize(words)
 
-words = normalize(words)
-print(words)
-words = ' '.join(map(str, words))
-print(words)
\ No newline at end of file
+    words = normalize(words)
+    print(words)
+    words = ' '.join(map(str, words))
+    print(words)
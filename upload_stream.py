@@ -0,0 +1,118 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import NEED_DATA, Data, Epilogue, Field, File, MultipartDecoder
+
+# --- Config ---
+UPLOAD_MAX_FILE_BYTES = int(os.environ.get("UPLOAD_MAX_FILE_BYTES", 20 * 1024 * 1024))
+UPLOAD_MAX_REQUEST_BYTES = int(os.environ.get("UPLOAD_MAX_REQUEST_BYTES", 1024 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+FIELD_MAX_BYTES = 1024 * 1024  # plain (non-file) form fields are kept in memory
+
+
+def iter_uploads(stream, content_type, destination, max_file_bytes=UPLOAD_MAX_FILE_BYTES,
+                 max_request_bytes=UPLOAD_MAX_REQUEST_BYTES, chunk_size=UPLOAD_CHUNK_BYTES):
+    """
+    Parse a multipart/form-data body incrementally, spooling files to disk.
+
+    destination(field, filename) returns the path to save a file part to
+    (or None to discard it). Each file is written to "<path>.part" chunk by
+    chunk and renamed into place once complete, at which point
+    ("file", field, filename, path) is yielded, so callers can start work on
+    it while the rest of the body is still arriving. Plain fields yield
+    ("field", name, value). Peak memory is a few chunks regardless of how
+    many files are sent. Raises RequestEntityTooLarge if one file exceeds
+    max_file_bytes or the body exceeds max_request_bytes.
+    """
+    mimetype, options = parse_options_header(content_type)
+    boundary = options.get("boundary")
+    if mimetype != "multipart/form-data" or not boundary:
+        raise ValueError("Expected a multipart/form-data body")
+
+    decoder = MultipartDecoder(boundary.encode("latin-1"), max_form_memory_size=FIELD_MAX_BYTES)
+    received = 0
+    eof = False
+    part = None  # [kind, name, filename, path, handle, size] of the part being read
+    try:
+        while True:
+            event = decoder.next_event()
+            if event is NEED_DATA:
+                if eof:
+                    raise ValueError("Incomplete multipart body")
+                chunk = stream.read(chunk_size)
+                received += len(chunk)
+                if received > max_request_bytes:
+                    raise RequestEntityTooLarge(f"Upload exceeds {max_request_bytes} bytes")
+                eof = not chunk
+                decoder.receive_data(chunk or None)
+            elif isinstance(event, File):
+                path = destination(event.name, event.filename)
+                handle = open(path + ".part", "wb") if path else None
+                part = ["file", event.name, event.filename, path, handle, 0]
+            elif isinstance(event, Field):
+                part = ["field", event.name, None, None, bytearray(), 0]
+            elif isinstance(event, Data):
+                kind, name, filename, path, handle, size = part
+                size += len(event.data)
+                part[5] = size
+                if kind == "file":
+                    if size > max_file_bytes:
+                        raise RequestEntityTooLarge(f"{filename} exceeds {max_file_bytes} bytes")
+                    if handle is not None:
+                        handle.write(event.data)
+                else:
+                    handle.extend(event.data)
+                if event.more_data:
+                    continue
+                part = None
+                if kind == "field":
+                    yield "field", name, handle.decode("utf-8", errors="replace")
+                elif handle is not None:
+                    handle.close()
+                    os.replace(path + ".part", path)
+                    yield "file", name, filename, path
+            elif isinstance(event, Epilogue):
+                return
+    finally:
+        if part is not None and part[0] == "file" and part[4] is not None:
+            part[4].close()
+            os.remove(part[3] + ".part")
+
+
+class Prefetcher:
+    """
+    Runs an extractor on uploaded files in the background as they land.
+
+    Extraction goes through the text cache, so a later extract_many() over
+    the same files is served from it; wait(paths) blocks until any prefetch
+    still running for those paths is done, so work is never duplicated.
+    """
+
+    def __init__(self, extractor, workers=2):
+        self.extractor = extractor
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, path):
+        future = self._pool.submit(self.extractor, path)
+        with self._lock:
+            self._pending[path] = future
+        future.add_done_callback(lambda f: self._forget(path, f))
+
+    def _forget(self, path, future):
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+
+    def wait(self, paths):
+        with self._lock:
+            futures = [self._pending[p] for p in paths if p in self._pending]
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                pass  # extract_many() retries and reports the failure
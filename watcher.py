@@ -0,0 +1,304 @@
+import ctypes
+import ctypes.util
+import fcntl
+import os
+import select
+import struct
+import threading
+import time
+import traceback
+
+# --- Config ---
+WATCH_DEBOUNCE = float(os.environ.get("WATCH_DEBOUNCE", 1.0))  # seconds of quiet before a burst is handled
+WATCH_POLL_INTERVAL = float(os.environ.get("WATCH_POLL_INTERVAL", 5.0))  # rescan period without inotify
+
+# --- inotify (Linux), via ctypes ---
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of NUL-padded name
+
+
+def file_fingerprint(path):
+    """Cheap change marker for a file: [size, mtime_ns]."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+_running = {}  # absolute root -> started DirectoryWatcher
+_claims = {}  # watcher lock path -> open file holding it for the life of this process
+
+
+def find_watcher(root):
+    """The DirectoryWatcher started on root in this process, or None."""
+    return _running.get(os.path.abspath(root))
+
+
+def claim_watch(path):
+    """
+    Try to become the one process that runs the watchers; True if this
+    process holds the lock at path (now or already).
+
+    The lock is held until the process exits, so a replacement worker can
+    take over from an owner that died. The owner's pid is written into the
+    file for watched_elsewhere().
+    """
+    if path in _claims:
+        return True
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    f = open(path, "a+")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return False
+    f.truncate(0)
+    f.write(str(os.getpid()))
+    f.flush()
+    _claims[path] = f
+    return True
+
+
+def watched_elsewhere(path):
+    """True if another live process holds the watcher lock at path."""
+    if path in _claims:
+        return False
+    try:
+        with open(path, "r") as f:
+            pid = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return False
+    if not pid or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class _Inotify:
+    """Minimal inotify wrapper: one non-blocking fd, one watch per directory."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._libc = libc
+        self.fd = fd
+        self.dirs = {}  # watch descriptor -> directory
+
+    def add(self, directory):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), directory)
+        self.dirs[wd] = directory
+
+    def read(self):
+        """Pending events as (mask, path) pairs; path is None for queue overflow."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        pos = 0
+        while pos + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            name = data[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0")
+            pos += _EVENT.size + length
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                path = None
+            else:
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            events.append((mask, path))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """
+    Keeps self.files (path -> [size, mtime_ns]) in step with a directory tree
+    and calls on_change(files) from a background thread.
+
+    With inotify (Linux) every directory gets a watch and only the paths
+    named in events are re-examined; a burst of events (a folder copied in,
+    say) is handled once it has been quiet for `debounce` seconds.
+    Elsewhere, or once inotify runs out of watches, the tree is rescanned
+    every poll_interval seconds instead. on_change is also called once with
+    the initial scan. Hidden files and directories are ignored, as glob()
+    does; suffixes, if given, restricts which files count.
+    """
+
+    def __init__(self, root, on_change, suffixes=None, debounce=WATCH_DEBOUNCE,
+                 poll_interval=WATCH_POLL_INTERVAL, use_inotify=True):
+        self.root = root
+        self.on_change = on_change
+        self.suffixes = tuple(s.lower() for s in suffixes) if suffixes else None
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.files = {}
+        self.mode = None  # "inotify" or "poll" once running
+        self.ready = threading.Event()  # set once on_change has handled the initial scan (even if it raised)
+        self._dirs = set()
+        self._inotify = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="resume-watcher", daemon=True)
+            self._thread.start()
+            _running[os.path.abspath(self.root)] = self
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            _running.pop(os.path.abspath(self.root), None)
+
+    def snapshot(self):
+        return dict(self.files)
+
+    # --- scanning ---
+
+    def _wanted(self, path):
+        name = os.path.basename(path)
+        return not name.startswith(".") and (self.suffixes is None or name.lower().endswith(self.suffixes))
+
+    def _watch_dir(self, directory):
+        self._dirs.add(directory)
+        if self._inotify is None:
+            return
+        try:
+            self._inotify.add(directory)
+        except OSError as e:
+            print(f"watcher: cannot watch {directory} ({e}); falling back to polling")
+            self._inotify.close()
+            self._inotify = None
+
+    def _scan(self, top):
+        """Fingerprints of the wanted files under top (a directory), watching each directory on the way."""
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            self._watch_dir(dirpath)
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if self._wanted(path):
+                    try:
+                        found[path] = file_fingerprint(path)
+                    except OSError:
+                        pass  # vanished mid-scan; its delete event follows
+        return found
+
+    def _apply(self, paths):
+        """Re-examine just these paths (files or whole subtrees); returns True if self.files changed."""
+        changed = False
+        for path in paths:
+            if path in self._dirs or os.path.isdir(path):
+                prefix = path + os.sep
+                old = {p: fp for p, fp in self.files.items() if p.startswith(prefix)}
+                self._dirs = {d for d in self._dirs if d != path and not d.startswith(prefix)}
+                new = self._scan(path) if os.path.isdir(path) else {}
+                if new != old:
+                    for p in old:
+                        del self.files[p]
+                    self.files.update(new)
+                    changed = True
+                continue
+            try:
+                fingerprint = file_fingerprint(path) if self._wanted(path) else None
+            except OSError:
+                fingerprint = None
+            if fingerprint != self.files.get(path):
+                if fingerprint is None:
+                    del self.files[path]
+                else:
+                    self.files[path] = fingerprint
+                changed = True
+        return changed
+
+    # --- loop ---
+
+    def _notify(self):
+        try:
+            self.on_change(dict(self.files))
+        except Exception:
+            traceback.print_exc()
+
+    def _run(self):
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except OSError as e:
+                print(f"watcher: {e}; polling {self.root} every {self.poll_interval}s")
+        self.files = self._scan(self.root)
+        self.mode = "inotify" if self._inotify is not None else "poll"
+        self._notify()
+        self.ready.set()
+        if self._inotify is not None:
+            self._watch()
+        if not self._stop.is_set():
+            self.mode = "poll"
+            self._poll()
+
+    def _watch(self):
+        dirty = set()
+        deadline = None
+        while not self._stop.is_set() and self._inotify is not None:
+            timeout = max(0.0, deadline - time.monotonic()) if deadline is not None else 1.0
+            ready, _, _ = select.select([self._inotify.fd], [], [], timeout)
+            if ready:
+                for mask, path in self._inotify.read():
+                    dirty.add(self.root if mask & IN_Q_OVERFLOW or path is None else path)
+                deadline = time.monotonic() + self.debounce
+            elif deadline is not None and time.monotonic() >= deadline:
+                if self.root in dirty:
+                    dirty = {self.root}  # overflowed, or the root itself changed: rescan everything
+                if self._apply(sorted(dirty)):
+                    self._notify()
+                dirty.clear()
+                deadline = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            files = self._scan(self.root)
+            if files == self.files:
+                continue
+            # Let a burst settle: rescan until two scans agree
+            while not self._stop.wait(self.debounce):
+                again = self._scan(self.root)
+                if again == files:
+                    break
+                files = again
+            self.files = files
+            self._notify()